@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划脚本基准测试
+生成 1 年到数十年的合成计划目录（YYYY/MM/DD.md 和 YYYY/MM-Month/YYYY-MM-DD.md 两种布局），
+测量扫描、生成、占位符替换和 JSON/JS 序列化的耗时，结果保存为 JSON，
+可以与保存的基线比较，超过阈值的变慢视为性能回归
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import importlib.util
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta
+
+from plan_cache import PlanCache
+from nav_builder import build_model, compact_nav_data, nav_js_data, dump_json, render_plans_js
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = "bench-results.json"
+RESULTS_VERSION = 1
+LAYOUTS = ("day", "dated")
+START_YEAR = 2000
+
+# 合成的每日模板，包含 generate-daily-plan.py 支持的全部占位符
+DAILY_TEMPLATE = """---
+layout: post
+title: "[日期] 每日计划"
+date: YYYY-MM-DD HH:mm
+categories: [daily-plan, 2024]
+---
+
+# 📅 YYYY年MM月DD日 星期X
+
+**创建时间：YYYY-MM-DD HH:mm**
+
+"""
+
+
+def load_script(file_name):
+    """导入文件名带连字符的脚本"""
+    spec = importlib.util.spec_from_file_location(
+        file_name[:-3].replace("-", "_"), os.path.join(REPO_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def working_dir(path):
+    """临时切换工作目录（各脚本使用相对于当前目录的 daily-plans）"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def daily_template():
+    """合成模板：占位符头部 + 批量生成脚本的计划正文"""
+    batch = load_script("generate-daily-plans.py")
+    with working_dir(REPO_DIR):
+        body = batch.generate_daily_plan(datetime(START_YEAR, 1, 1))
+    return DAILY_TEMPLATE + body
+
+
+def build_corpus(root, years, layout):
+    """在 root/daily-plans 下生成 years 年的合成计划，返回文件数"""
+    batch = load_script("generate-daily-plans.py")
+    months = load_script("generate-daily-plan.py").DailyPlanGenerator().months_cn
+    base_dir = os.path.join(root, "daily-plans")
+    os.makedirs(os.path.join(base_dir, "templates"), exist_ok=True)
+    with open(os.path.join(base_dir, "templates", "daily-template.md"), "w", encoding="utf-8") as f:
+        f.write(daily_template())
+
+    date = datetime(START_YEAR, 1, 1)
+    end = datetime(START_YEAR + years, 1, 1)
+    count = 0
+    with working_dir(REPO_DIR):
+        while date < end:
+            if layout == "day":
+                path = os.path.join(base_dir, f"{date:%Y}", f"{date:%m}", f"{date:%d}.md")
+            else:
+                path = os.path.join(base_dir, f"{date:%Y}", months[date.month], f"{date:%Y-%m-%d}.md")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(batch.generate_daily_plan(date))
+            date += timedelta(days=1)
+            count += 1
+    return count
+
+
+def measure(func, repeat, setup=None):
+    """执行 repeat 次，返回每次的耗时（秒）"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def record(results, name, times, items):
+    """记录一项结果：最小值、中位数以及每项耗时"""
+    best = min(times)
+    results[name] = {
+        "min": best,
+        "median": statistics.median(times),
+        "runs": len(times),
+        "items": items,
+        "per_item_us": best / items * 1e6 if items else None,
+    }
+    print(f"  {name:<40} {best * 1000:10.2f} ms  ({items} 项)")
+
+
+def bench_corpus(results, years, layout, repeat):
+    """扫描与序列化基准"""
+    generate_nav = load_script("generate-nav.py")
+    generate_nav_data = load_script("generate-nav-data.py")
+
+    root = tempfile.mkdtemp(prefix="plans-bench-")
+    try:
+        files = build_corpus(root, years, layout)
+        suffix = f"{layout}/{years}y"
+        cache_file = os.path.join(root, ".plan-cache.json")
+
+        def drop_cache():
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+
+        def warm_cache():
+            cache = PlanCache(cache_file)
+            build_model("daily-plans", cache)
+            cache.save()
+
+        with working_dir(root):
+            for name, scan in (("scan_daily_plans", generate_nav.scan_daily_plans),
+                               ("scan_plans_directory", generate_nav_data.scan_plans_directory)):
+                times = measure(lambda: scan(PlanCache(cache_file)), repeat, drop_cache)
+                record(results, f"{name}.cold/{suffix}", times, files)
+                times = measure(lambda: scan(PlanCache(cache_file)), repeat, warm_cache)
+                record(results, f"{name}.warm/{suffix}", times, files)
+
+            entries = build_model("daily-plans", PlanCache(cache_file))
+            compact = compact_nav_data(entries)
+            js_data = nav_js_data(entries)
+            record(results, f"serialize.json/{suffix}",
+                   measure(lambda: dump_json(compact), repeat), files)
+            record(results, f"serialize.js/{suffix}",
+                   measure(lambda: render_plans_js(js_data), repeat), files)
+    finally:
+        shutil.rmtree(root)
+
+
+def bench_generators(results, days, repeat):
+    """两种生成实现和占位符替换的基准"""
+    single = load_script("generate-daily-plan.py")
+    batch = load_script("generate-daily-plans.py")
+    dates = [datetime(START_YEAR, 1, 1) + timedelta(days=i) for i in range(days)]
+    template = daily_template()
+
+    root = tempfile.mkdtemp(prefix="plans-bench-")
+    try:
+        os.makedirs(os.path.join(root, "daily-plans", "templates"))
+        with open(os.path.join(root, "daily-plans", "templates", "daily-template.md"),
+                  "w", encoding="utf-8") as f:
+            f.write(template)
+
+        generator = single.DailyPlanGenerator(conflict=single.OVERWRITE)
+        with working_dir(root):
+            def generate_all():
+                with redirect_stdout(io.StringIO()):
+                    for date in dates:
+                        generator.generate_daily_plan(date)
+            record(results, f"generate_daily_plan.single/{days}d",
+                   measure(generate_all, repeat), days)
+
+            record(results, f"replace_placeholders/{days}d",
+                   measure(lambda: [generator.replace_placeholders(template, date)
+                                    for date in dates], repeat), days)
+
+        with working_dir(REPO_DIR):
+            record(results, f"generate_daily_plan.batch/{days}d",
+                   measure(lambda: [batch.generate_daily_plan(date) for date in dates], repeat),
+                   days)
+
+            out_dir = os.path.join(root, "batch")
+            record(results, f"generate_range.serial/{days}d",
+                   measure(lambda: batch.generate_range(dates[0], dates[-1], out_dir,
+                                                        single.OVERWRITE, workers=1),
+                           repeat), days)
+    finally:
+        shutil.rmtree(root)
+
+
+def compare(results, baseline, threshold):
+    """与基线比较，返回变慢超过阈值的项目"""
+    regressions = []
+    print(f"\n与基线比较（阈值 +{threshold:.0%}）:")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"  {name:<40} 基线中没有该项")
+            continue
+        ratio = current["min"] / base["min"] if base["min"] else 1.0
+        mark = "❌" if ratio > 1 + threshold else ("✅" if ratio < 1 - threshold else "  ")
+        print(f"  {mark} {name:<38} {base['min'] * 1000:10.2f} -> {current['min'] * 1000:10.2f} ms"
+              f"  ({ratio:.2f}x)")
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="计划脚本基准测试")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10, 50],
+                        help="合成计划目录的年数，可指定多个")
+    parser.add_argument("--layout", choices=LAYOUTS, action="append",
+                        help="只测试指定布局，可重复指定（默认两种都测）")
+    parser.add_argument("--days", type=int, default=366, help="生成基准中生成的天数")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数，取最小值")
+    parser.add_argument("--output", default=RESULTS_FILE, help="结果 JSON 文件")
+    parser.add_argument("--baseline", help="与该基线结果文件比较")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="比基线慢超过该比例时视为回归（默认 0.25）")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"🏁 生成器基准（{args.days} 天）")
+    bench_generators(results, args.days, args.repeat)
+    for layout in args.layout or LAYOUTS:
+        for years in args.years:
+            print(f"\n🏁 扫描基准（{layout} 布局，{years} 年）")
+            bench_corpus(results, years, layout, args.repeat)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"years": args.years, "layouts": list(args.layout or LAYOUTS),
+                   "days": args.days, "repeat": args.repeat},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 结果已保存到 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} 项性能回归")
+            return 1
+        print("\n✅ 没有性能回归")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
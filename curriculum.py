@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+课程表引擎
+从数据文件加载学习阶段和章节，预先展开为按天索引的表，
+任意日期通过一次下标查找得到当天的学习内容和详细安排
+"""
+
+import os
+import json
+from datetime import datetime
+
+CURRICULUM_FILE = "curriculum.json"
+
+DETAIL_FIELDS = ("chapter", "focus", "tasks", "goal")
+
+_loaded = {}
+
+
+def parse_date(value):
+    """解析 YYYY-MM-DD 字符串，datetime/date 对象原样返回"""
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d")
+    return value
+
+
+class Curriculum:
+    """按天展开的课程表
+
+    窗口包含开始日期和目标日期当天。phases 中 anchor 为 "start" 的阶段从开始日期向后排列，
+    anchor 为 "target" 的阶段从目标日期当天向前排列（列表中越靠后越接近目标日期），
+    两者都没有覆盖到的日期以及窗口之外的日期使用 fallback。
+    目标日期之后不再倒计时，改用 finished 中的文字。
+    """
+
+    def __init__(self, config, start_date=None, target_date=None):
+        self.name = config.get("name", "")
+        self.countdown = config["countdown"]
+        self.finished = config.get("finished", "比赛已结束")
+        self.start_date = parse_date(start_date or config["start_date"])
+        self.target_date = parse_date(target_date or config["target_date"])
+        if self.start_date > self.target_date:
+            raise ValueError(f"开始日期 {self.start_date:%Y-%m-%d} 晚于目标日期 {self.target_date:%Y-%m-%d}")
+
+        self.start_ordinal = self.start_date.toordinal()
+        self.target_ordinal = self.target_date.toordinal()
+        self.fallback = self._unit(config["fallback"])
+        self.table = self._build_table(config["phases"])
+
+    @staticmethod
+    def _unit(unit):
+        """把数据文件中的单元转换为 (summary, details)"""
+        return unit["summary"], {field: unit[field] for field in DETAIL_FIELDS}
+
+    def _build_table(self, phases):
+        """展开为窗口内（含目标日期）每天一项的列表"""
+        size = self.target_ordinal - self.start_ordinal + 1
+        table = [self.fallback] * size
+
+        forward = [unit for phase in phases if phase.get("anchor", "start") == "start"
+                   for unit in phase["units"]]
+        backward = [unit for phase in phases if phase.get("anchor") == "target"
+                    for unit in phase["units"]]
+
+        index = 0
+        for unit in forward:
+            entry = self._unit(unit)
+            for _ in range(unit.get("days", 1)):
+                if index >= size:
+                    break
+                table[index] = entry
+                index += 1
+
+        index = size
+        for unit in reversed(backward):
+            entry = self._unit(unit)
+            for _ in range(unit.get("days", 1)):
+                if index <= 0:
+                    break
+                index -= 1
+                table[index] = entry
+
+        return table
+
+    def resolve(self, date):
+        """返回 (学习内容, 详细安排)"""
+        ordinal = date.toordinal()
+        index = ordinal - self.start_ordinal
+        if 0 <= index < len(self.table):
+            summary, details = self.table[index]
+        else:
+            summary, details = self.fallback
+
+        days_left = self.target_ordinal - ordinal
+        if days_left < 0:
+            return f"{summary}，{self.finished}", details
+        return f"{summary}，{self.countdown.format(days_left=days_left)}", details
+
+    def content(self, date):
+        """获取当天的学习内容"""
+        return self.resolve(date)[0]
+
+    def details(self, date):
+        """获取当天的详细安排"""
+        return self.resolve(date)[1]
+
+
+def load_curriculum(path=CURRICULUM_FILE, start_date=None, target_date=None):
+    """加载课程表，同一文件和日期窗口只解析一次
+
+    start_date、target_date 不为 None 时覆盖数据文件中的日期窗口，
+    不同批次的学员可以共用同一份课程表。
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path), str(start_date), str(target_date))
+    if key not in _loaded:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        _loaded[key] = Curriculum(config, start_date, target_date)
+    return _loaded[key]
@@ -6,14 +6,46 @@
 """
 
 import os
+import re
 import sys
 from datetime import datetime, timedelta
 import calendar
 import shutil
 
+from plan_cache import PlanCache
+from nav_builder import build_model, update_nav, patch_index
+from plan_template import TemplateStore, compile_template
+from plan_trace import phase, log, split_trace_options, run_traced
+from plan_writer import (
+    ASK, SKIP, OVERWRITE, IF_CHANGED, CONFLICT_POLICIES,
+    CREATED, UPDATED, UNCHANGED, WriteSummary, write_plan,
+)
+
+# 每日模板中的占位符
+DAILY_PLACEHOLDERS = (
+    "[日期]",
+    "YYYY年MM月DD日 星期X",
+    "YYYY-MM-DD HH:mm",
+    "YYYY-MM-DD",
+    "2024",
+    "categories: [daily-plan, 2024]",
+)
+
+# 每周模板中的占位符
+WEEKLY_PLACEHOLDERS = (
+    "第X周",
+    "YYYY年MM月DD日 - MM月DD日",
+    "(MM-DD)",
+    "YYYY-MM-DD HH:mm",
+)
+
+# 生成时间戳，重新生成时沿用已有文件中的值，内容未变化的计划不会因此被重写
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}")
+
 class DailyPlanGenerator:
-    def __init__(self):
+    def __init__(self, conflict=ASK):
         self.base_dir = "daily-plans"
+        self.conflict = conflict  # 文件已存在时的处理策略，见 plan_writer
         self.template_dir = os.path.join(self.base_dir, "templates")
         self.daily_template = os.path.join(self.template_dir, "daily-template.md")
         self.weekly_template = os.path.join(self.template_dir, "weekly-template.md")
@@ -30,6 +62,14 @@ class DailyPlanGenerator:
             5: "05-May", 6: "06-June", 7: "07-July", 8: "08-August",
             9: "09-September", 10: "10-October", 11: "11-November", 12: "12-December"
         }
+        
+        # 编译后的模板缓存，模板文件修改后自动重新加载
+        self.templates = TemplateStore()
+        
+        # 计划索引每个进程只扫描一次目录，之后按本进程写入的文件增量更新
+        self._index = None
+        self._index_cache = None
+        self._written = []
 
     def ensure_directories(self, date):
         """确保目标目录存在"""
@@ -41,11 +81,22 @@ class DailyPlanGenerator:
         
         return target_dir
 
-    def generate_daily_plan(self, date=None):
-        """生成每日计划文件"""
+    def generate_daily_plan(self, date=None, conflict=None, summary=None):
+        """生成每日计划文件
+
+        conflict 为文件已存在时的处理策略（默认使用生成器的策略），
+        内容与已有文件完全一致时不会重写。返回文件是否为最新的计划内容。
+        """
         if date is None:
             date = datetime.now()
         
+        # 读取模板（编译结果在多次生成之间复用）
+        if not os.path.exists(self.daily_template):
+            print(f"错误：模板文件不存在 {self.daily_template}")
+            return False
+        
+        template = self.templates.get(self.daily_template, DAILY_PLACEHOLDERS)
+        
         # 确保目录存在
         target_dir = self.ensure_directories(date)
         
@@ -53,49 +104,57 @@ class DailyPlanGenerator:
         filename = f"{date.strftime('%Y-%m-%d')}.md"
         filepath = os.path.join(target_dir, filename)
         
-        # 检查文件是否已存在
-        if os.path.exists(filepath):
-            response = input(f"文件 {filename} 已存在，是否覆盖？(y/N): ")
-            if response.lower() != 'y':
-                print("操作已取消")
-                return False
-        
-        # 读取模板
-        if not os.path.exists(self.daily_template):
-            print(f"错误：模板文件不存在 {self.daily_template}")
-            return False
-        
-        with open(self.daily_template, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
         # 替换模板中的占位符
-        content = self.replace_placeholders(template_content, date)
+        with phase("render"):
+            timestamps = self.timestamps(filepath, template.counts.get("YYYY-MM-DD HH:mm", 0))
+            content = template.render(self.placeholder_values(date, timestamps))
         
-        # 写入文件
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # 按冲突策略写入文件
+        with phase("write"):
+            status = write_plan(filepath, content, conflict or self.conflict)
+        if summary is not None:
+            summary.add(status, filepath)
+        if status in (CREATED, UPDATED):
+            self._written.append(filepath)
         
-        print(f"✅ 成功生成每日计划：{filepath}")
-        return True
+        if status in (CREATED, UPDATED):
+            log(f"✅ 成功生成每日计划：{filepath}")
+        elif status == UNCHANGED:
+            log(f"⏸️ 内容未变化，无需重写：{filepath}")
+        else:
+            log(f"⏭️ 已跳过：{filepath}")
+        return status in (CREATED, UPDATED, UNCHANGED)
 
-    def replace_placeholders(self, content, date):
-        """替换模板中的占位符"""
+    def timestamps(self, filepath, count):
+        """模板中 count 处生成时间的值：已有文件中的时间戳按顺序沿用，不足的部分使用当前时间"""
+        existing = []
+        if count and os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                existing = TIMESTAMP_PATTERN.findall(f.read())[:count]
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        return existing + [now] * (count - len(existing))
+
+    def placeholder_values(self, date, timestamps=None):
+        """每日模板占位符对应的值
+
+        timestamps 为按出现顺序填入的生成时间（见 timestamps），为 None 时全部使用当前时间。
+        """
         weekday = self.weekdays_cn[date.weekday()]
-        month_name = list(self.months_cn.values())[date.month - 1].split('-')[1]
+        month_name = self.months_cn[date.month].split('-')[1]
         
-        replacements = {
+        return {
             "[日期]": f"{date.strftime('%Y年%m月%d日')}",
             "YYYY年MM月DD日 星期X": f"{date.strftime('%Y年%m月%d日')} {weekday}",
-            "YYYY-MM-DD HH:mm": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "YYYY-MM-DD HH:mm": (datetime.now().strftime("%Y-%m-%d %H:%M")
+                                 if timestamps is None else timestamps),
             "YYYY-MM-DD": date.strftime("%Y-%m-%d"),
             "2024": date.strftime("%Y"),
             "categories: [daily-plan, 2024]": f"categories: [daily-plan, {date.year}, {month_name}]"
         }
-        
-        for placeholder, replacement in replacements.items():
-            content = content.replace(placeholder, replacement)
-        
-        return content
+
+    def replace_placeholders(self, content, date):
+        """替换模板中的占位符"""
+        return compile_template(content, DAILY_PLACEHOLDERS).render(self.placeholder_values(date))
 
     def generate_weekly_plan(self, date=None):
         """生成周计划文件"""
@@ -109,6 +168,11 @@ class DailyPlanGenerator:
         # 确保目录存在
         target_dir = self.ensure_directories(monday)
         
+        # 本周已有的每日计划（日期索引中二分查找，不逐个检查文件）
+        planned = {entry.ordinal for entry in self.plan_index().week(monday)}
+        missing = [monday + timedelta(days=i) for i in range(7)
+                   if monday.toordinal() + i not in planned]
+        
         # 生成文件名
         week_num = monday.isocalendar()[1]
         filename = f"{monday.year}-{week_num:02d}-week-summary.md"
@@ -119,72 +183,129 @@ class DailyPlanGenerator:
             print(f"错误：模板文件不存在 {self.weekly_template}")
             return False
         
-        with open(self.weekly_template, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        # 替换占位符
-        content = template_content.replace("第X周", f"第{week_num}周")
-        content = content.replace("YYYY年MM月DD日 - MM月DD日", 
-                                f"{monday.strftime('%Y年%m月%d日')} - {sunday.strftime('%m月%d日')}")
+        template = self.templates.get(self.weekly_template, WEEKLY_PLACEHOLDERS)
         
-        # 替换每日日期
-        for i in range(7):
-            day = monday + timedelta(days=i)
-            content = content.replace(f"(MM-DD)", f"({day.strftime('%m-%d')})", 1)
-        
-        content = content.replace("YYYY-MM-DD HH:mm", datetime.now().strftime("%Y-%m-%d %H:%M"))
+        # 替换占位符，(MM-DD) 按出现顺序依次填入周一到周日
+        with phase("render"):
+            content = template.render({
+                "第X周": f"第{week_num}周",
+                "YYYY年MM月DD日 - MM月DD日": f"{monday.strftime('%Y年%m月%d日')} - {sunday.strftime('%m月%d日')}",
+                "(MM-DD)": [f"({(monday + timedelta(days=i)).strftime('%m-%d')})" for i in range(7)],
+                "YYYY-MM-DD HH:mm": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            })
         
         # 写入文件
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(content)
         
         print(f"✅ 成功生成周计划：{filepath}")
+        print(f"📅 本周已有 {7 - len(missing)}/7 天的每日计划"
+              + (f"，缺少：{'、'.join(day.strftime('%m-%d') for day in missing)}" if missing else ""))
         return True
 
-    def generate_range(self, start_date, end_date):
-        """生成日期范围内的所有每日计划"""
+    def generate_range(self, start_date, end_date, conflict=None):
+        """生成日期范围内的所有每日计划，返回写入统计"""
         current = start_date
-        success_count = 0
+        summary = WriteSummary()
         
         while current <= end_date:
-            if self.generate_daily_plan(current):
-                success_count += 1
+            self.generate_daily_plan(current, conflict, summary)
             current += timedelta(days=1)
         
-        print(f"\n✅ 共成功生成 {success_count} 个每日计划文件")
+        print(f"\n✅ 生成完成：{summary.report()}")
+        return summary
+
+    def refresh_nav(self, paths):
+        """在当前进程中增量更新导航数据，只处理刚写入的文件"""
+        if not paths:
+            return True
+        
+        try:
+            result = update_nav(paths, self.base_dir)
+        except (OSError, ValueError) as e:
+            print(f"❌ 导航数据更新失败: {e}")
+            return False
+        
+        counts = result["js"]
+        print(f"🔄 导航数据已更新：{counts['years']} 个年份，{counts['months']} 个月份，{counts['plans']} 个计划")
+        return True
 
-    def list_existing_plans(self):
+    def plan_index(self, cache=None):
+        """按日期排序的计划索引（DateIndex）
+
+        首次调用时扫描一次计划目录，之后只按本进程写入的文件更新索引；
+        标题来自共享解析缓存，未修改的文件不会被重新读取。
+        """
+        if self._index is None:
+            self._index_cache = cache or PlanCache()
+            self._index = build_model(self.base_dir, self._index_cache)
+            self._written = []
+        elif self._written:
+            patch_index(self._index, self._written, self.base_dir, self._index_cache)
+            self._written = []
+        self._index_cache.save()
+        return self._index
+
+    def list_existing_plans(self, cache=None):
         """列出已存在的计划文件"""
         print("\n📅 已存在的计划文件：")
         
-        if not os.path.exists(self.base_dir):
+        index = self.plan_index(cache) if os.path.exists(self.base_dir) else None
+        if not index:
             print("暂无计划文件")
             return
         
-        for year in sorted(os.listdir(self.base_dir)):
-            year_path = os.path.join(self.base_dir, year)
-            if not os.path.isdir(year_path) or year == "templates":
-                continue
+        current_year = None
+        for (year, month), plans in index.months():
+            if year != current_year:
+                current_year = year
+                print(f"\n📁 {year}年：")
             
-            print(f"\n📁 {year}年：")
-            
-            for month in sorted(os.listdir(year_path)):
-                month_path = os.path.join(year_path, month)
-                if not os.path.isdir(month_path):
-                    continue
-                
-                files = [f for f in os.listdir(month_path) if f.endswith('.md')]
-                if files:
-                    print(f"  📂 {month}：{len(files)} 个文件")
-                    for file in sorted(files)[:5]:  # 只显示前5个文件
-                        print(f"    📄 {file}")
-                    if len(files) > 5:
-                        print(f"    ... 还有 {len(files) - 5} 个文件")
+            print(f"  📂 {month}月：{len(plans)} 个文件")
+            for entry in plans[:5]:  # 只显示前5个文件
+                file_name = entry.path.rsplit("/", 1)[-1]
+                print(f"    📄 {file_name}" + (f" - {entry.title}" if entry.title else ""))
+            if len(plans) > 5:
+                print(f"    ... 还有 {len(plans) - 5} 个文件")
+        
+        latest = index.latest(1)[0]
+        print(f"\n共 {len(index)} 个计划，最近一个：{latest.iso_date}（{latest.path}）")
+
+def parse_conflict_option(args):
+    """从命令行参数中取出 --conflict 策略，返回 (策略, 其余参数)"""
+    conflict = ASK
+    rest = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("--conflict="):
+            conflict = arg.split("=", 1)[1]
+        elif arg == "--conflict" and i + 1 < len(args):
+            i += 1
+            conflict = args[i]
+        else:
+            rest.append(arg)
+        i += 1
+    
+    if conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"未知的冲突策略: {conflict}（可选：{'、'.join(CONFLICT_POLICIES)}）")
+    return conflict, rest
 
 def main():
-    generator = DailyPlanGenerator()
+    trace_options, argv = split_trace_options(sys.argv[1:])
+    run_traced(lambda: run_command(argv), **trace_options)
+
+def run_command(argv):
+    try:
+        conflict, args = parse_conflict_option(argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    
+    generator = DailyPlanGenerator(conflict)
     
-    if len(sys.argv) == 1:
+    if not args:
         # 交互模式
         print("🎯 每日计划生成器")
         print("=" * 30)
@@ -199,13 +320,17 @@ def main():
             choice = input("\n请选择操作 (1-6): ").strip()
             
             if choice == '1':
-                generator.generate_daily_plan()
+                summary = WriteSummary()
+                generator.generate_daily_plan(summary=summary)
+                generator.refresh_nav(summary.written)
                 
             elif choice == '2':
                 date_str = input("请输入日期 (格式: YYYY-MM-DD): ").strip()
                 try:
                     date = datetime.strptime(date_str, "%Y-%m-%d")
-                    generator.generate_daily_plan(date)
+                    summary = WriteSummary()
+                    generator.generate_daily_plan(date, summary=summary)
+                    generator.refresh_nav(summary.written)
                 except ValueError:
                     print("❌ 日期格式错误，请使用 YYYY-MM-DD 格式")
                     
@@ -230,7 +355,11 @@ def main():
                         if response.lower() != 'y':
                             continue
                     
-                    generator.generate_range(start_date, end_date)
+                    choices = {'s': SKIP, 'o': OVERWRITE, 'c': IF_CHANGED}
+                    response = input("已存在的文件如何处理？(s=跳过 / o=覆盖 / c=仅内容不同时覆盖) [c]: ")
+                    summary = generator.generate_range(start_date, end_date,
+                                                       choices.get(response.strip().lower(), IF_CHANGED))
+                    generator.refresh_nav(summary.written)
                     
                 except ValueError:
                     print("❌ 日期格式错误，请使用 YYYY-MM-DD 格式")
@@ -247,22 +376,40 @@ def main():
     
     else:
         # 命令行模式
-        if sys.argv[1] == 'today':
-            generator.generate_daily_plan()
-        elif sys.argv[1] == 'week':
+        if args[0] == 'today':
+            summary = WriteSummary()
+            generator.generate_daily_plan(summary=summary)
+            generator.refresh_nav(summary.written)
+        elif args[0] == 'week':
             generator.generate_weekly_plan()
-        elif sys.argv[1] == 'date' and len(sys.argv) > 2:
+        elif args[0] == 'date' and len(args) > 1:
+            try:
+                date = datetime.strptime(args[1], "%Y-%m-%d")
+                summary = WriteSummary()
+                generator.generate_daily_plan(date, summary=summary)
+                generator.refresh_nav(summary.written)
+            except ValueError:
+                print("❌ 日期格式错误，请使用 YYYY-MM-DD 格式")
+        elif args[0] == 'range' and len(args) > 2:
             try:
-                date = datetime.strptime(sys.argv[2], "%Y-%m-%d")
-                generator.generate_daily_plan(date)
+                start_date = datetime.strptime(args[1], "%Y-%m-%d")
+                end_date = datetime.strptime(args[2], "%Y-%m-%d")
             except ValueError:
                 print("❌ 日期格式错误，请使用 YYYY-MM-DD 格式")
+                sys.exit(2)
+            # 批量生成不应阻塞在交互询问上，未指定策略时只重写内容变化的文件
+            summary = generator.generate_range(start_date, end_date,
+                                               IF_CHANGED if conflict == ASK else conflict)
+            generator.refresh_nav(summary.written)
         else:
             print("用法：")
             print("  python generate-daily-plan.py          # 交互模式")
             print("  python generate-daily-plan.py today    # 生成今日计划")
             print("  python generate-daily-plan.py week     # 生成本周计划")
             print("  python generate-daily-plan.py date YYYY-MM-DD  # 生成指定日期计划")
+            print("  python generate-daily-plan.py range YYYY-MM-DD YYYY-MM-DD  # 批量生成日期范围计划")
+            print("  可选参数 --conflict=ask|skip|overwrite|if-changed  # 文件已存在时的处理方式")
+            print("  可选参数 --trace FILE|- --profile FILE --quiet  # 阶段耗时、性能分析、安静模式")
 
 if __name__ == "__main__":
     main()
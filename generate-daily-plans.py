@@ -2,13 +2,33 @@
 # -*- coding: utf-8 -*-
 """
 生成每日计划脚本
-从今天到9月2号，为数学建模比赛做准备
+默认从今天到比赛前一天（curriculum.json 中的目标日期），为数学建模比赛做准备；
+也可以指定任意日期范围，按块分发到多个进程并行生成；
+--profiles 为学习小组中的多个用户在同一个进程池中批量生成
 """
 
 import os
+import sys
+import time
+import argparse
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
 import calendar
 
+from curriculum import CURRICULUM_FILE, load_curriculum
+from plan_schedule import TIMETABLE_FILE, load_timetable
+from plan_template import TemplateStore
+from plan_profiles import load_profiles
+from nav_builder import build_all, update_nav, print_report
+from plan_trace import TRACE, Tracer, log, add_trace_arguments, run_traced
+from plan_writer import CONFLICT_POLICIES, IF_CHANGED, CREATED, UPDATED, WriteSummary, write_plan
+
+# 外层模板中的占位符，[计划内容] 替换为生成的计划正文
+PLAN_PLACEHOLDERS = ("[计划内容]", "[日期]", "YYYY-MM-DD", "星期X")
+
+# 编译后的外层模板，进程池中的各个任务共用
+TEMPLATES = TemplateStore()
+
 def get_weekday(year, month, day):
     """获取星期几"""
     weekdays = ['星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']
@@ -19,162 +39,13 @@ def format_date(year, month, day):
     """格式化日期"""
     return f"{year}年{month}月{day}日"
 
-def get_math_modeling_content(date, weekday):
+def get_math_modeling_content(date, weekday, curriculum=None):
     """获取数学建模学习内容"""
-    # 计算距离比赛的天数
-    competition_date = datetime(2025, 9, 3)
-    days_until_competition = (competition_date - date).days
-    
-    # 根据剩余天数安排学习内容
-    if days_until_competition >= 6:
-        # 第一阶段：基础学习（前10天学习10章内容）
-        day_in_phase = 17 - days_until_competition
-        if day_in_phase == 0 or day_in_phase == 1:
-            return "学习数学建模绪论，距离比赛还有17天"
-        elif day_in_phase == 2:
-            return "学习解析方法与几何模型，距离比赛还有16天"
-        elif day_in_phase == 3:
-            return "学习微分方程与动力系统，距离比赛还有15天"
-        elif day_in_phase == 4:
-            return "学习函数极值与规划模型，距离比赛还有14天"
-        elif day_in_phase == 5:
-            return "学习复杂网络与图论模型，距离比赛还有13天"
-        elif day_in_phase == 6:
-            return "学习进化计算与群体智能，距离比赛还有12天"
-        elif day_in_phase == 7:
-            return "学习数据处理与拟合模型，距离比赛还有11天"
-        elif day_in_phase == 8:
-            return "学习统计建模与机器学习，距离比赛还有10天"
-        elif day_in_phase == 9:
-            return "学习优化算法与数值方法，距离比赛还有9天"
-        elif day_in_phase == 10:
-            return "学习建模实践与案例分析，距离比赛还有8天"
-        elif day_in_phase == 11:
-            return "学习竞赛技巧与总结，距离比赛还有7天"
-        else:
-            return "复习巩固前面章节，距离比赛还有6天"
-    elif days_until_competition >= 3:
-        # 第二阶段：模拟练习（第12-15天）
-        day_in_phase = 15 - days_until_competition
-        if day_in_phase == 1:
-            return "做模拟题练习1，距离比赛还有4天"
-        elif day_in_phase == 2:
-            return "做模拟题练习2，距离比赛还有3天"
-        else:
-            return f"做模拟题练习，距离比赛还有{days_until_competition}天"
-    else:
-        # 第三阶段：冲刺复习（第16-17天）
-        return f"冲刺复习，距离比赛还有{days_until_competition}天"
+    return (curriculum or load_curriculum()).content(date)
 
-def get_math_modeling_details(date, weekday):
+def get_math_modeling_details(date, weekday, curriculum=None):
     """获取数学建模学习详细内容"""
-    # 计算距离比赛的天数
-    competition_date = datetime(2025, 9, 3)
-    days_until_competition = (competition_date - date).days
-    
-    # 基础学习阶段：前10天学习10章内容
-    if days_until_competition >= 6:
-        # 计算在基础学习阶段中的第几天
-        day_in_phase = 17 - days_until_competition
-        
-        if day_in_phase == 0 or day_in_phase == 1:
-            return {
-                "chapter": "绪论：走进数学建模的大门",
-                "focus": "数学建模的基本概念、方法和应用",
-                "tasks": "阅读绪论，理解数学建模的意义",
-                "goal": "建立对数学建模的整体认识"
-            }
-        elif day_in_phase == 2:
-            return {
-                "chapter": "第1章：解析方法与几何模型",
-                "focus": "解析方法、几何模型的基本概念",
-                "tasks": "完成第1章的练习题和思考题",
-                "goal": "掌握解析方法和几何模型"
-            }
-        elif day_in_phase == 3:
-            return {
-                "chapter": "第2章：微分方程与动力系统",
-                "focus": "微分方程、动力系统的基本概念",
-                "tasks": "完成第2章的练习题和思考题",
-                "goal": "理解微分方程与动力系统"
-            }
-        elif day_in_phase == 4:
-            return {
-                "chapter": "第3章：函数极值与规划模型",
-                "focus": "函数极值、规划模型的基本方法",
-                "tasks": "完成第3章的练习题和思考题",
-                "goal": "掌握函数极值与规划模型"
-            }
-        elif day_in_phase == 5:
-            return {
-                "chapter": "第4章：复杂网络与图论模型",
-                "focus": "复杂网络、图论模型的基本概念",
-                "tasks": "完成第4章的练习题和思考题",
-                "goal": "理解复杂网络与图论模型"
-            }
-        elif day_in_phase == 6:
-            return {
-                "chapter": "第5章：进化计算与群体智能",
-                "focus": "进化算法、群体智能的基本原理",
-                "tasks": "完成第5章的练习题和思考题",
-                "goal": "掌握进化计算与群体智能"
-            }
-        elif day_in_phase == 7:
-            return {
-                "chapter": "第6章：数据处理与拟合模型",
-                "focus": "数据处理、拟合模型的基本方法",
-                "tasks": "完成第6章的练习题和思考题",
-                "goal": "掌握数据处理与拟合模型"
-            }
-        elif day_in_phase == 8:
-            return {
-                "chapter": "第7章：统计建模与机器学习",
-                "focus": "统计建模、机器学习的基本原理",
-                "tasks": "完成第7章的练习题和思考题",
-                "goal": "理解统计建模与机器学习"
-            }
-        elif day_in_phase == 9:
-            return {
-                "chapter": "第8章：优化算法与数值方法",
-                "focus": "优化算法、数值方法的基本概念",
-                "tasks": "完成第8章的练习题和思考题",
-                "goal": "掌握优化算法与数值方法"
-            }
-        elif day_in_phase == 10:
-            return {
-                "chapter": "第9章：建模实践与案例分析",
-                "focus": "实际建模案例的分析和解决",
-                "tasks": "分析案例，总结建模思路",
-                "goal": "提高实际建模能力"
-            }
-        elif day_in_phase == 11:
-            return {
-                "chapter": "第10章：竞赛技巧与总结",
-                "focus": "数学建模竞赛的技巧和注意事项",
-                "tasks": "学习竞赛技巧，做好总结",
-                "goal": "为竞赛做好充分准备"
-            }
-        else:
-            return {
-                "chapter": "复习巩固",
-                "focus": "复习前面章节的重点内容",
-                "tasks": "复习薄弱环节，巩固知识点",
-                "goal": "巩固已学知识"
-            }
-    elif days_until_competition >= 6:
-        return {
-            "chapter": "模拟题练习",
-            "focus": "综合运用所学知识",
-            "tasks": "完成模拟题，分析解题思路",
-            "goal": "提高实战能力"
-        }
-    else:
-        return {
-            "chapter": "冲刺复习",
-            "focus": "查漏补缺，重点突破",
-            "tasks": "复习薄弱环节，做最后准备",
-            "goal": "以最佳状态迎接比赛"
-        }
+    return (curriculum or load_curriculum()).details(date)
 
 def get_english_learning_content(date, day_of_week):
     """获取英语学习内容"""
@@ -194,8 +65,9 @@ def get_english_learning_content(date, day_of_week):
     content_index = (day_of_year - 1) % len(content_types)
     return content_types[content_index]
 
-def generate_daily_plan(date):
-    """生成单日计划"""
+def generate_daily_plan(date, timetable=None, curriculum=None):
+    """生成单日计划，时间安排来自 timetable（默认 timetable.json），
+    学习内容来自 curriculum（默认 curriculum.json）"""
     year = date.year
     month = date.month
     day = date.day
@@ -203,78 +75,74 @@ def generate_daily_plan(date):
     formatted_date = format_date(year, month, day)
     
     # 获取数学建模学习内容
-    math_content = get_math_modeling_content(date, weekday)
-    math_details = get_math_modeling_details(date, weekday)
+    math_content = get_math_modeling_content(date, weekday, curriculum)
+    math_details = get_math_modeling_details(date, weekday, curriculum)
     english_content = get_english_learning_content(date, weekday)
     
-    # 根据星期几调整计划
-    if weekday in ['星期六', '星期日']:
-        # 周末可以多安排一些学习时间
-        study_time = "9:00 - 12:00"
-        english_time = "14:00 - 15:30"
-        reading_time = "15:30 - 17:00"
-    else:
-        # 工作日
-        study_time = "10:00 - 12:00"
-        english_time = "14:00 - 15:00"
-        reading_time = "15:30 - 16:30"
+    # 按星期（或例外日期）选择当天的时间表，周末安排更多学习时间
+    schedule = (timetable or load_timetable()).for_date(date)
+    time = schedule.span
     
     plan_content = f"""# 📅 今日计划
 
 **🌤️ 天气：待填写，温度 待填写°C，待填写**
 
+## ⏰ 今日时间表
+
+{schedule.table}
+
 ## 🎯 今日重点任务
 
-### 📚 数学建模学习 (9:00 - 12:00)
+### 📚 数学建模学习 ({time('study')})
 - [ ] **{math_content}**
   - 阅读 [DataWhale数学建模教程](https://datawhalechina.github.io/intro-mathmodel/#/) {math_details['chapter']}
   - 重点学习：{math_details['focus']}
   - {math_details['tasks']}
-  - 预计用时：2-3小时
+  - 预计用时：{schedule.duration('study')}
   - 学习目标：{math_details['goal']}
 
-### 📖 英语学习 (14:00 - 15:00)
+### 📖 英语学习 ({time('english')})
 - [ ] **{english_content}**
   - 完成相应的练习和作业
   - 记录学习心得和难点
-  - 预计用时：1-1.5小时
+  - 预计用时：{schedule.duration('english')}
   - 学习目标：提高雅思听说读写综合能力
 
-### 📚 课外阅读 (15:30 - 16:30)
+### 📚 课外阅读 ({time('reading')})
 - [ ] **阅读课外书籍**
   - 选择一本感兴趣的书籍
   - 做好读书笔记
-  - 预计用时：1-1.5小时
+  - 预计用时：{schedule.duration('reading')}
   - 学习目标：拓展知识面
 
 ## 🌞 生活安排
 
 ### 🍽️ 用餐时间
-- [ ] **早餐** (8:00 - 8:30)
-- [ ] **午餐** (12:00 - 12:30)
-- [ ] **晚餐** (18:00 - 18:30)
+- [ ] **早餐** ({time('breakfast')})
+- [ ] **午餐** ({time('lunch')})
+- [ ] **晚餐** ({time('dinner')})
 
 ### ☀️ 户外活动
-- [ ] **晒太阳** (16:30 - 17:00)
+- [ ] **晒太阳** ({time('outdoor')})
   - 在校园里散步
   - 呼吸新鲜空气
   - 放松身心
 
 ### 🎮 休闲时间
-- [ ] **休闲娱乐** (19:00 - 20:00)
+- [ ] **休闲娱乐** ({time('leisure')})
   - 听音乐、看视频
   - 与朋友聊天
   - 放松大脑
 
 ## 🌙 晚间总结
 
-### 📝 今日总结 (21:00 - 21:30)
+### 📝 今日总结 ({time('review')})
 - [ ] **回顾今日完成情况**
   - 检查学习任务完成度
   - 记录学习收获
   - 总结遇到的问题
 
-### 📋 明日计划 (21:30 - 22:00)
+### 📋 明日计划 ({time('tomorrow')})
 - [ ] **制定明日计划**
   - 根据今日进度调整
   - 安排明日重点任务
@@ -331,57 +199,311 @@ def generate_daily_plan(date):
     
     return plan_content
 
-def main():
-    """主函数"""
-    print("开始生成每日计划...")
+def plan_path(base_dir, date):
+    """计划文件路径：base_dir/YYYY/MM/DD.md"""
+    return os.path.join(base_dir, str(date.year), f"{date.month:02d}", f"{date.day:02d}.md")
+
+def split_range(start_date, end_date, chunk_size):
+    """把日期范围切分为 (起始日期, 天数) 块"""
+    total_days = (end_date - start_date).days + 1
+    return [(start_date + timedelta(days=offset), min(chunk_size, total_days - offset))
+            for offset in range(0, total_days, chunk_size)]
+
+def render_plan(date, timetable, curriculum, template=None):
+    """生成单日计划，有外层模板时把计划正文填入模板"""
+    content = generate_daily_plan(date, timetable, curriculum)
+    if template is None:
+        return content
+    weekday = get_weekday(date.year, date.month, date.day)
+    return template.render({
+        "[计划内容]": content,
+        "[日期]": format_date(date.year, date.month, date.day),
+        "YYYY-MM-DD": date.strftime("%Y-%m-%d"),
+        "星期X": weekday,
+    })
+
+def render_chunk(task):
+    """生成一个日期块内的全部计划，返回 ([(写入结果, 文件路径), ...], 阶段耗时)
+
+    在进程池中运行，目录需事先创建好。阶段耗时由父进程合并到共享计时器。
+    课程表、时间表和模板按文件缓存，同一进程处理的各个块（以及各个用户）共用；
+    curriculum_spec 为 load_curriculum 的参数 (文件, 开始日期, 目标日期)。
+    """
+    (base_dir, chunk_start, days, conflict, timetable_file,
+     curriculum_spec, template_file) = task
+    timetable = load_timetable(timetable_file)
+    curriculum = load_curriculum(*curriculum_spec)
+    template = TEMPLATES.get(template_file, PLAN_PLACEHOLDERS) if template_file else None
+    tracer = Tracer()
+    results = []
+    for i in range(days):
+        date = chunk_start + timedelta(days=i)
+        path = plan_path(base_dir, date)
+        with tracer.phase("render"):
+            content = render_plan(date, timetable, curriculum, template)
+        with tracer.phase("write"):
+            results.append((write_plan(path, content, conflict), path))
+    return results, tracer.snapshot()
+
+def make_month_dirs(base_dir, start_date, end_date):
+    """每个月份目录只创建一次"""
+    months = {(start_date + timedelta(days=i)).strftime("%Y/%m")
+              for i in range((end_date - start_date).days + 1)}
+    for month in sorted(months):
+        os.makedirs(os.path.join(base_dir, *month.split("/")), exist_ok=True)
+
+def generate_range(start_date, end_date, base_dir="daily-plans", conflict=IF_CHANGED,
+                   workers=None, chunk_size=31, verbose=False, timetable_file=TIMETABLE_FILE,
+                   curriculum_file=CURRICULUM_FILE, curriculum_start=None, target_date=None):
+    """生成日期范围内的全部计划，返回写入统计
+
+    workers 为 1 时在当前进程中串行生成，否则按块分发到进程池；
+    两种方式生成的文件完全相同。
+    """
+    summary = WriteSummary()
+    if start_date > end_date:
+        return summary
     
-    # 获取今天的日期
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    target_date = datetime(2025, 9, 2)
+    make_month_dirs(base_dir, start_date, end_date)
     
-    # 确保目录存在
-    base_dir = "daily-plans"
-    if not os.path.exists(base_dir):
-        os.makedirs(base_dir)
+    curriculum_spec = (curriculum_file, curriculum_start, target_date)
+    tasks = [(base_dir, chunk_start, days, conflict, timetable_file, curriculum_spec, None)
+             for chunk_start, days in split_range(start_date, end_date, chunk_size)]
+    
+    if workers == 1 or len(tasks) == 1:
+        for results in map(render_chunk, tasks):
+            _collect(results, summary, verbose)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for results in executor.map(render_chunk, tasks):
+                _collect(results, summary, verbose)
+    
+    return summary
+
+def _collect(chunk, summary, verbose):
+    """汇总一个日期块的写入结果和阶段耗时"""
+    results, phases = chunk
+    TRACE.merge(phases)
+    for status, path in results:
+        summary.add(status, path)
+        if verbose and status in (CREATED, UPDATED):
+            log(f"✅ 生成计划: {path}")
+
+class _InlineExecutor:
+    """在当前进程中立即执行任务，workers 为 1 时代替进程池"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+class ProfileRun:
+    """一个用户的生成进度和耗时统计"""
+
+    def __init__(self, profile, chunks):
+        self.profile = profile
+        self.pending = chunks
+        self.summary = WriteSummary()
+        self.tracer = Tracer()
+        self.nav = None
+        self.finished = None
+        self.error = None
+
+    def seconds(self, *phases):
+        snapshot = self.tracer.snapshot()
+        return sum(snapshot[name]["seconds"] for name in phases if name in snapshot)
+
+def build_profile_nav(task):
+    """在用户的站点目录中构建导航数据，返回 build_all 的统计信息（在进程池中运行）"""
+    site_dir, base_dir, outputs = task
+    previous = os.getcwd()
+    os.chdir(site_dir)
+    try:
+        start = time.perf_counter()
+        result = build_all(base_dir, outputs)
+        result["seconds"] = time.perf_counter() - start
+        return result
+    finally:
+        os.chdir(previous)
+
+def generate_profiles(profiles, workers=None, chunk_size=31, verbose=False):
+    """在同一个进程池中为多个用户生成计划，返回 {用户名: ProfileRun}
+
+    所有用户的日期块一起分发；某个用户的块全部完成后，立即把其导航构建
+    提交到同一个进程池。课程表、时间表和模板在分发前由父进程加载一次，
+    配置错误在分发任务前就会暴露；工作进程不依赖父进程的状态（spawn 方式下
+    什么也不会继承），各自通过按文件的缓存重新加载，同一进程处理的各个块
+    和各个用户共用同一份编译结果。
+    """
+    runs = {}
+    tasks = []
+    for profile in profiles:
+        curriculum_spec = (profile.curriculum, profile.curriculum_start, profile.target_date)
+        load_curriculum(*curriculum_spec)
+        load_timetable(profile.timetable)
+        if profile.template:
+            TEMPLATES.get(profile.template, PLAN_PLACEHOLDERS)
+        make_month_dirs(profile.plans_dir, profile.start, profile.end)
+
+        chunks = split_range(profile.start, profile.end, chunk_size)
+        runs[profile.name] = ProfileRun(profile, len(chunks))
+        tasks.extend((profile.name, (profile.plans_dir, chunk_start, days, profile.conflict,
+                                     profile.timetable, curriculum_spec, profile.template))
+                     for chunk_start, days in chunks)
+
+    start = time.perf_counter()
+    executor = _InlineExecutor() if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    with executor:
+        pending = {executor.submit(render_chunk, task): ("render", name) for name, task in tasks}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, name = pending.pop(future)
+                run = runs[name]
+                # 一个用户失败时记录第一个错误，不影响其他用户；失败的用户不再构建导航
+                try:
+                    result = future.result()
+                except Exception as e:
+                    run.error = run.error or f"{'导航构建' if kind == 'nav' else '生成计划'}失败: {e}"
+                    result = None
+                if kind == "nav":
+                    run.nav = result
+                    run.finished = time.perf_counter() - start
+                    continue
+
+                if result is not None:
+                    run.tracer.merge(result[1])
+                    _collect(result, run.summary, verbose)
+                run.pending -= 1
+                if run.pending:
+                    continue
+                if run.profile.nav and run.error is None:
+                    nav_task = (run.profile.site_dir, run.profile.base_dir, run.profile.nav)
+                    pending[executor.submit(build_profile_nav, nav_task)] = ("nav", name)
+                else:
+                    run.finished = time.perf_counter() - start
+    return runs
+
+def print_profile_report(runs, elapsed):
+    """打印各用户的写入结果和吞吐量"""
+    total_days = sum(run.profile.days for run in runs.values())
+    print(f"\n👥 {len(runs)} 个用户，共 {total_days} 天，总耗时 {elapsed * 1000:.2f} ms"
+          f"（{total_days / elapsed:.0f} 天/秒）")
+    for name, run in runs.items():
+        days = run.profile.days
+        busy = run.seconds("render", "write")
+        nav = f"，导航 {run.nav['seconds'] * 1000:.2f} ms" if run.nav else ""
+        print(f"\n  {name}：{run.profile.start:%Y-%m-%d} 至 {run.profile.end:%Y-%m-%d}，"
+              f"{run.summary.report()}")
+        if run.error:
+            print(f"    ❌ {run.error}")
+        print(f"    生成 {run.seconds('render') * 1000:.2f} ms，写入 {run.seconds('write') * 1000:.2f} ms{nav}，"
+              f"{days / busy if busy else 0:.0f} 天/秒，{run.finished * 1000:.2f} ms 时完成")
+
+def run_profiles(args):
+    """按配置文件为多个用户生成计划和导航数据"""
+    try:
+        profiles = load_profiles(args.profiles, args.start, args.end)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    
+    print(f"开始为 {len(profiles)} 个用户生成每日计划...")
+    start = time.perf_counter()
+    runs = generate_profiles(profiles, args.workers, args.chunk_size, args.verbose)
+    print_profile_report(runs, time.perf_counter() - start)
+
+    failed = [name for name, run in runs.items() if run.error]
+    if failed:
+        print(f"\n❌ {len(failed)} 个用户生成失败: {', '.join(failed)}")
+        return 1
+    return 0
+
+def parse_date(value):
+    """解析命令行中的 YYYY-MM-DD 日期"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式错误: {value}，请使用 YYYY-MM-DD 格式")
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="生成数学建模备赛期间的每日计划")
+    parser.add_argument("--start", type=parse_date, default=None,
+                        help="开始日期 YYYY-MM-DD（默认今天）")
+    parser.add_argument("--end", type=parse_date, default=None,
+                        help="结束日期 YYYY-MM-DD（默认比赛前一天）")
+    parser.add_argument("--base-dir", default="daily-plans", help="计划目录")
+    parser.add_argument("--conflict", default=IF_CHANGED,
+                        choices=[policy for policy in CONFLICT_POLICIES if policy != "ask"],
+                        help="计划文件已存在时的处理方式（默认只重写内容变化的文件）")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="并行生成的进程数（默认按CPU数量，1 表示串行）")
+    parser.add_argument("--chunk-size", type=int, default=31, help="每个进程任务包含的天数")
+    parser.add_argument("--timetable", default=TIMETABLE_FILE, help="作息时间表文件")
+    parser.add_argument("--curriculum", default=CURRICULUM_FILE, help="课程表文件")
+    parser.add_argument("--curriculum-start", type=parse_date, default=None,
+                        help="课程开始日期 YYYY-MM-DD（默认使用课程表文件中的日期）")
+    parser.add_argument("--target-date", type=parse_date, default=None,
+                        help="比赛（目标）日期 YYYY-MM-DD（默认使用课程表文件中的日期）")
+    parser.add_argument("--profiles", metavar="FILE",
+                        help="按配置文件为多个用户批量生成（见 plan_profiles.py），"
+                             "--start、--end 指定时覆盖所有用户的日期范围")
+    parser.add_argument("--verbose", action="store_true", help="逐个输出生成的文件")
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    return run_traced(lambda: run_profiles(args) if args.profiles else run(args),
+                      args.trace, args.profile, args.quiet)
+
+def run(args):
+    """按命令行参数生成计划并更新导航数据"""
+    print("开始生成每日计划...")
     
-    # 生成从今天到9月2号的计划
-    current_date = today
-    plan_count = 0
+    # 课程表或时间表有错误（如日期窗口颠倒、时间块重叠）时在分发任务前报告
+    try:
+        curriculum = load_curriculum(args.curriculum, args.curriculum_start, args.target_date)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ 课程表 {args.curriculum} 无效: {e}")
+        return 1
+    try:
+        load_timetable(args.timetable)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ 时间表 {args.timetable} 无效: {e}")
+        return 1
     
-    # 计算总天数
-    total_days = (target_date - today).days + 1
+    # 默认从今天生成到比赛前一天
+    start_date = args.start or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    end_date = args.end or curriculum.target_date - timedelta(days=1)
     
-    for i in range(total_days):
-        current_date = today + timedelta(days=i)
-        year = current_date.year
-        month = current_date.month
-        day = current_date.day
-        
-        # 创建年月目录
-        year_dir = os.path.join(base_dir, str(year))
-        month_dir = os.path.join(year_dir, f"{month:02d}")
-        
-        os.makedirs(month_dir, exist_ok=True)
-        
-        # 生成计划文件
-        plan_file = os.path.join(month_dir, f"{day:02d}.md")
-        plan_content = generate_daily_plan(current_date)
-        
-        with open(plan_file, 'w', encoding='utf-8') as f:
-            f.write(plan_content)
-        
-        print(f"✅ 生成计划: {year}年{month:02d}月{day:02d}日 {get_weekday(year, month, day)}")
-        plan_count += 1
+    base_dir = args.base_dir
+    summary = generate_range(start_date, end_date, base_dir, args.conflict,
+                             args.workers, args.chunk_size, args.verbose, args.timetable,
+                             args.curriculum, args.curriculum_start, args.target_date)
     
     print(f"\n🎉 计划生成完成！")
-    print(f"📅 总共生成了 {plan_count} 天的计划")
+    print(f"📅 {start_date:%Y-%m-%d} 至 {end_date:%Y-%m-%d}：{summary.report()}")
     print(f"📁 文件保存在 {base_dir} 目录下")
     
-    # 更新导航数据
+    # 在当前进程中更新导航数据，只重新读取刚写入的计划
     print("\n🔄 正在更新导航数据...")
-    os.system("python3 generate-nav.py")
+    try:
+        result = update_nav(summary.written, base_dir=base_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ 导航数据更新失败: {e}")
+        return 1
+    print_report(result)
     
     print("\n✨ 所有工作完成！现在可以查看生成的计划了。")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -5,86 +5,25 @@
 扫描daily-plans目录，生成年份-月份-日期的层级结构
 """
 
-import os
-import json
-import re
-from datetime import datetime
-from pathlib import Path
+import sys
 
-def extract_date_from_filename(filename):
-    """从文件名中提取日期"""
-    # 匹配 YYYY-MM-DD 格式
-    date_pattern = r'(\d{4})-(\d{2})-(\d{2})'
-    match = re.search(date_pattern, filename)
-    if match:
-        return match.groups()
-    return None
+from plan_trace import split_trace_options, run_traced
+from nav_builder import (
+    MONTH_NAMES, build_model, compact_nav_data, nav_js_data, write_nav_js, publish_nav_data,
+    nav_lock,
+)
 
-def scan_plans_directory():
+def scan_plans_directory(cache=None):
     """扫描plans目录，构建层级结构"""
-    plans_data = {}
-    daily_plans_dir = Path("daily-plans")
-    
-    if not daily_plans_dir.exists():
-        print("daily-plans目录不存在")
-        return plans_data
-    
-    # 遍历所有markdown文件
-    for md_file in daily_plans_dir.rglob("*.md"):
-        if md_file.name.startswith("."):  # 跳过隐藏文件
-            continue
-            
-        # 提取日期
-        date_parts = extract_date_from_filename(md_file.name)
-        if not date_parts:
-            continue
-            
-        year, month, date = date_parts
-        
-        # 读取文件内容
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # 提取标题
-            title_match = re.search(r'title:\s*["\']([^"\']+)["\']', content)
-            title = title_match.group(1) if title_match else f"{year}年{month}月{date}日 - 每日计划"
-            
-            # 提取前200个字符作为预览
-            preview = re.sub(r'^---.*?---', '', content, flags=re.DOTALL).strip()
-            preview = re.sub(r'[#*`\-\[\]]', '', preview)  # 移除markdown标记
-            preview = preview[:200] + "..." if len(preview) > 200 else preview
-            
-        except Exception as e:
-            print(f"读取文件 {md_file} 时出错: {e}")
-            title = f"{year}年{month}月{date}日 - 每日计划"
-            preview = "无法读取内容"
-        
-        # 构建数据结构
-        if year not in plans_data:
-            plans_data[year] = {}
-        if month not in plans_data[year]:
-            plans_data[year][month] = {}
-            
-        plans_data[year][month][date] = {
-            "title": title,
-            "content": preview,
-            "file_path": str(md_file.relative_to(daily_plans_dir)),
-            "full_path": str(md_file)
-        }
-    
-    return plans_data
+    return nav_js_data(build_model("daily-plans", cache))
 
-def generate_nav_data():
+def generate_nav_data(cache=None, plans_data=None):
     """生成导航数据"""
-    plans_data = scan_plans_directory()
-    
-    # 生成JavaScript数据
-    js_data = "const plansData = " + json.dumps(plans_data, ensure_ascii=False, indent=2) + ";"
+    if plans_data is None:
+        plans_data = scan_plans_directory(cache)
     
     # 保存到文件
-    with open("nav-data.js", "w", encoding="utf-8") as f:
-        f.write(js_data)
+    write_nav_js(plans_data, "nav-data.js")
     
     print(f"导航数据已生成到 nav-data.js")
     print(f"共找到 {sum(len(months) for months in plans_data.values())} 个月份的计划")
@@ -93,42 +32,51 @@ def generate_nav_data():
     for year in sorted(plans_data.keys()):
         print(f"\n{year}年:")
         for month in sorted(plans_data[year].keys()):
-            month_names = ['一月', '二月', '三月', '四月', '五月', '六月', 
-                          '七月', '八月', '九月', '十月', '十一月', '十二月']
-            month_name = month_names[int(month) - 1]
+            month_name = MONTH_NAMES[int(month) - 1]
             count = len(plans_data[year][month])
             print(f"  {month_name}: {count} 个计划")
     
     return plans_data
 
-def update_html_with_real_data():
-    """更新HTML文件，使用真实的导航数据"""
-    plans_data = scan_plans_directory()
-    
-    # 读取HTML文件
-    with open("index.html", "r", encoding="utf-8") as f:
-        html_content = f.read()
-    
-    # 替换JavaScript数据部分
-    js_data = "const plansData = " + json.dumps(plans_data, ensure_ascii=False, indent=2) + ";"
-    
-    # 使用正则表达式替换
-    pattern = r'const plansData = \{.*?\};'
-    replacement = js_data
-    
-    updated_html = re.sub(pattern, replacement, html_content, flags=re.DOTALL)
-    
-    # 保存更新后的HTML
-    with open("index.html", "w", encoding="utf-8") as f:
-        f.write(updated_html)
-    
-    print("HTML文件已更新，包含真实的导航数据")
+def update_html_with_real_data(cache=None, entries=None):
+    """生成带哈希的导航数据文件，并更新HTML中的引用"""
+    if entries is None:
+        entries = build_model("daily-plans", cache)
+    
+    if publish_nav_data(compact_nav_data(entries), "index.html"):
+        print("HTML文件已更新，引用新的导航数据文件")
+    else:
+        print("导航数据没有变化，HTML文件无需更新")
 
-if __name__ == "__main__":
-    print("正在扫描daily-plans目录...")
-    plans_data = generate_nav_data()
+def stream_nav_data():
+    """流式生成 nav-data.js 和带哈希的数据文件，不在内存中保存完整的导航数据"""
+    from nav_stream import stream_build
+    with nav_lock():
+        result = stream_build("daily-plans", ["js", "html"])
+    counts = result["js"]
+    print(f"导航数据已生成到 nav-data.js")
+    print(f"共找到 {counts['months']} 个月份、{counts['plans']} 个计划")
+
+def main(stream=False):
+    """主函数"""
+    if stream:
+        print("正在流式扫描daily-plans目录...")
+        stream_nav_data()
+        print("\n完成！现在可以打开index.html查看带有真实数据的侧边栏导航了。")
+        return
     
-    print("\n正在更新HTML文件...")
-    update_html_with_real_data()
+    print("正在扫描daily-plans目录...")
+    # 扫描和写入在同一次 nav_lock 内完成，不与其他构建交错写入导航数据
+    with nav_lock():
+        entries = build_model("daily-plans")
+        generate_nav_data(plans_data=nav_js_data(entries))
+        
+        # 复用同一次扫描的结果，不再重复遍历目录
+        print("\n正在更新HTML文件...")
+        update_html_with_real_data(entries=entries)
     
     print("\n完成！现在可以打开index.html查看带有真实数据的侧边栏导航了。")
+
+if __name__ == "__main__":
+    trace_options, args = split_trace_options(sys.argv[1:])
+    run_traced(lambda: main(stream="--stream" in args), **trace_options)
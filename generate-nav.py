@@ -5,85 +5,53 @@
 在本地扫描daily-plans目录，生成nav-data.json文件
 """
 
-import os
-import json
-from datetime import datetime
-import glob
+import sys
 
-def get_weekday(year, month, day):
-    """获取星期几"""
-    weekdays = ['星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']
-    date = datetime(year, int(month), int(day))
-    return weekdays[date.weekday()]
+from plan_trace import log, split_trace_options, run_traced
+from nav_builder import (
+    build_model, nav_json_data, compact_nav_data, write_nav_json, nav_lock,
+)
 
-def format_date(year, month, day):
-    """格式化日期"""
-    return f"{year}年{month}月{day}日"
-
-def scan_daily_plans():
+def scan_daily_plans(cache=None, entries=None):
     """扫描daily-plans目录"""
-    plans_data = {}
-    
-    # 扫描daily-plans目录
-    daily_plans_path = "daily-plans"
-    if not os.path.exists(daily_plans_path):
-        print(f"目录 {daily_plans_path} 不存在")
-        return plans_data
-    
-    # 扫描年份目录
-    for year_dir in sorted(os.listdir(daily_plans_path), reverse=True):
-        year_path = os.path.join(daily_plans_path, year_dir)
-        if not os.path.isdir(year_path) or not year_dir.isdigit():
-            continue
-            
-        year = year_dir
-        plans_data[year] = {}
-        
-        # 扫描月份目录
-        for month_dir in sorted(os.listdir(year_path)):
-            month_path = os.path.join(year_path, month_dir)
-            if not os.path.isdir(month_path) or not month_dir.isdigit():
-                continue
-                
-            month = month_dir
-            plans_data[year][month] = {}
-            
-            # 扫描日期文件
-            for file_name in os.listdir(month_path):
-                if file_name.endswith('.md'):
-                    day = file_name.replace('.md', '')
-                    if day.isdigit():
-                        # 生成完整日期信息
-                        full_date = datetime(int(year), int(month), int(day))
-                        weekday = get_weekday(int(year), int(month), int(day))
-                        formatted_date = format_date(year, month, day)
-                        
-                        plans_data[year][month][day] = {
-                            "title": f"每日计划 - {day}日",
-                            "content": f"点击查看 {formatted_date} {weekday} 的详细计划内容...",
-                            "file_path": f"daily-plans/{year}/{month}/{file_name}",
-                            "full_path": f"./daily-plans/{year}/{month}/{file_name}",
-                            "filename": file_name,
-                            "day": day,
-                            "month": month,
-                            "year": year,
-                            "fullDate": full_date.isoformat(),
-                            "weekday": weekday,
-                            "formattedDate": formatted_date
-                        }
-    
-    return plans_data
+    if entries is None:
+        entries = build_model("daily-plans", cache)
+    return nav_json_data(entries)
+
+def stream_nav_json():
+    """流式生成 nav-data.json，不在内存中保存完整的导航数据"""
+    from nav_stream import stream_build
+    with nav_lock():
+        result = stream_build("daily-plans", ["json"])
+    counts = result["json"]
+    print(f"扫描完成！")
+    print(f"年份数: {counts['years']}")
+    print(f"月份数: {counts['months']}")
+    print(f"计划数: {counts['plans']}")
+    print(f"导航数据已保存到 nav-data.json")
 
-def main():
+def main(stream=False):
     """主函数"""
-    print("开始扫描daily-plans目录...")
+    if stream:
+        print("开始流式扫描daily-plans目录...")
+        stream_nav_json()
+        return
     
-    # 扫描目录
-    plans_data = scan_daily_plans()
+    print("开始扫描daily-plans目录...")
     
-    if not plans_data:
-        print("没有找到任何计划文件")
-        return
+    # 扫描和写入在同一次 nav_lock 内完成，不与其他构建交错写入导航数据
+    with nav_lock():
+        # 扫描目录
+        entries = build_model("daily-plans")
+        plans_data = scan_daily_plans(entries=entries)
+        
+        if not plans_data:
+            print("没有找到任何计划文件")
+            return
+        
+        # 生成JSON文件（紧凑格式，前端加载后再展开可推导字段）
+        output_file = "nav-data.json"
+        write_nav_json(compact_nav_data(entries), output_file)
     
     # 统计信息
     total_years = len(plans_data)
@@ -94,12 +62,6 @@ def main():
     print(f"年份数: {total_years}")
     print(f"月份数: {total_months}")
     print(f"计划数: {total_plans}")
-    
-    # 生成JSON文件
-    output_file = "nav-data.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(plans_data, f, ensure_ascii=False, indent=2)
-    
     print(f"导航数据已保存到 {output_file}")
     
     # 显示找到的文件
@@ -108,7 +70,8 @@ def main():
         for month in plans_data[year]:
             for day in plans_data[year][month]:
                 file_info = plans_data[year][month][day]
-                print(f"  {file_info['file_path']}")
+                log(f"  {file_info['file_path']}")
 
 if __name__ == "__main__":
-    main()
+    trace_options, args = split_trace_options(sys.argv[1:])
+    run_traced(lambda: main(stream="--stream" in args), **trace_options)
@@ -1,11 +1,109 @@
 const plansData = {
-  "2024": {
-    "01": {
-      "15": {
-        "title": "📅 2024年1月15日 - 每日计划",
-        "content": " 📅 2024年1月15日  每日计划\n\n> 日期：2024年01月15日 星期一  \n> 天气：☀️ 晴朗  \n> 心情：😊 愉快  \n\n 🌅 晨间例程 (6:00  8:00)\n\n x 起床洗漱\n x 晨间锻炼 (30分钟)\n x 健康早餐\n x 查看今日计划\n   冥想/反思 (5分钟)\n\n 💼 工作时间 (9:00  18:00)\n\n 🎯 今日重点任务\n x 完成项目需求分析文档 工作 优...",
-        "file_path": "2024/01-January/2024-01-15.md",
-        "full_path": "daily-plans/2024/01-January/2024-01-15.md"
+  "2025": {
+    "08": {
+      "17": {
+        "title": "2025年08月17日 - 每日计划",
+        "content": " 📅 今日计划\n\n☀️ 天气：晴朗，温度 28~36°C，中国·上海复旦大学邯郸校区\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (10:00  12:00)\n x 学习数学建模绪论，距离比赛还有17天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 绪论：走进数学建模的大门\n   重点学习：数学建模...",
+        "file_path": "2025/08/17.md",
+        "full_path": "daily-plans/2025/08/17.md"
+      },
+      "18": {
+        "title": "2025年08月18日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (10:00  12:00)\n   学习数学建模绪论，距离比赛还有17天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 绪论：走进数学建模的大门\n   重点学习：数学建模的基本概念、方法和应用...",
+        "file_path": "2025/08/18.md",
+        "full_path": "daily-plans/2025/08/18.md"
+      },
+      "19": {
+        "title": "2025年08月19日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习解析方法与几何模型，距离比赛还有16天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第1章：解析方法与几何模型\n   重点学习：解析方法、几何模型的基本...",
+        "file_path": "2025/08/19.md",
+        "full_path": "daily-plans/2025/08/19.md"
+      },
+      "20": {
+        "title": "2025年08月20日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习微分方程与动力系统，距离比赛还有15天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第2章：微分方程与动力系统\n   重点学习：微分方程、动力系统的基本...",
+        "file_path": "2025/08/20.md",
+        "full_path": "daily-plans/2025/08/20.md"
+      },
+      "21": {
+        "title": "2025年08月21日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习函数极值与规划模型，距离比赛还有14天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第3章：函数极值与规划模型\n   重点学习：函数极值、规划模型的基本...",
+        "file_path": "2025/08/21.md",
+        "full_path": "daily-plans/2025/08/21.md"
+      },
+      "22": {
+        "title": "2025年08月22日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习复杂网络与图论模型，距离比赛还有13天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第4章：复杂网络与图论模型\n   重点学习：复杂网络、图论模型的基本...",
+        "file_path": "2025/08/22.md",
+        "full_path": "daily-plans/2025/08/22.md"
+      },
+      "23": {
+        "title": "2025年08月23日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习进化计算与群体智能，距离比赛还有12天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第5章：进化计算与群体智能\n   重点学习：进化算法、群体智能的基本...",
+        "file_path": "2025/08/23.md",
+        "full_path": "daily-plans/2025/08/23.md"
+      },
+      "24": {
+        "title": "2025年08月24日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习数据处理与拟合模型，距离比赛还有11天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第6章：数据处理与拟合模型\n   重点学习：数据处理、拟合模型的基本...",
+        "file_path": "2025/08/24.md",
+        "full_path": "daily-plans/2025/08/24.md"
+      },
+      "25": {
+        "title": "2025年08月25日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习统计建模与机器学习，距离比赛还有10天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第7章：统计建模与机器学习\n   重点学习：统计建模、机器学习的基本...",
+        "file_path": "2025/08/25.md",
+        "full_path": "daily-plans/2025/08/25.md"
+      },
+      "26": {
+        "title": "2025年08月26日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习优化算法与数值方法，距离比赛还有9天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第8章：优化算法与数值方法\n   重点学习：优化算法、数值方法的基本概...",
+        "file_path": "2025/08/26.md",
+        "full_path": "daily-plans/2025/08/26.md"
+      },
+      "27": {
+        "title": "2025年08月27日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习建模实践与案例分析，距离比赛还有8天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第9章：建模实践与案例分析\n   重点学习：实际建模案例的分析和解决\n...",
+        "file_path": "2025/08/27.md",
+        "full_path": "daily-plans/2025/08/27.md"
+      },
+      "28": {
+        "title": "2025年08月28日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   学习竞赛技巧与总结，距离比赛还有7天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 第10章：竞赛技巧与总结\n   重点学习：数学建模竞赛的技巧和注意事项\n ...",
+        "file_path": "2025/08/28.md",
+        "full_path": "daily-plans/2025/08/28.md"
+      },
+      "29": {
+        "title": "2025年08月29日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   做模拟题练习，距离比赛还有5天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 冲刺复习\n   重点学习：查漏补缺，重点突破\n   复习薄弱环节，做最后准备\n ...",
+        "file_path": "2025/08/29.md",
+        "full_path": "daily-plans/2025/08/29.md"
+      },
+      "30": {
+        "title": "2025年08月30日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   做模拟题练习，距离比赛还有4天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 冲刺复习\n   重点学习：查漏补缺，重点突破\n   复习薄弱环节，做最后准备\n ...",
+        "file_path": "2025/08/30.md",
+        "full_path": "daily-plans/2025/08/30.md"
+      },
+      "31": {
+        "title": "2025年08月31日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   做模拟题练习，距离比赛还有3天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 冲刺复习\n   重点学习：查漏补缺，重点突破\n   复习薄弱环节，做最后准备\n ...",
+        "file_path": "2025/08/31.md",
+        "full_path": "daily-plans/2025/08/31.md"
+      }
+    },
+    "09": {
+      "01": {
+        "title": "2025年09月01日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   冲刺复习，距离比赛还有2天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 冲刺复习\n   重点学习：查漏补缺，重点突破\n   复习薄弱环节，做最后准备\n   ...",
+        "file_path": "2025/09/01.md",
+        "full_path": "daily-plans/2025/09/01.md"
+      },
+      "02": {
+        "title": "2025年09月02日 - 每日计划",
+        "content": " 📅 今日计划\n\n🌤️ 天气：待填写，温度 待填写°C，待填写\n\n 🎯 今日重点任务\n\n 📚 数学建模学习 (9:00  12:00)\n   冲刺复习，距离比赛还有1天\n   阅读 DataWhale数学建模教程(https://datawhalechina.github.io/intromathmodel//) 冲刺复习\n   重点学习：查漏补缺，重点突破\n   复习薄弱环节，做最后准备\n   ...",
+        "file_path": "2025/09/02.md",
+        "full_path": "daily-plans/2025/09/02.md"
       }
     }
   }
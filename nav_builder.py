@@ -0,0 +1,820 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一的导航数据构建流程
+只遍历一次daily-plans目录，构建内存模型后在同一进程中生成全部输出：
+nav-data.json、nav-data.js、index.html引用的带哈希数据文件、按年月分片的 nav/、search/ 搜索索引以及 stats.json 任务统计
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import hashlib
+import bisect
+import argparse
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from plan_cache import PlanCache
+from plan_model import PlanEntry, DateIndex, DAY_LAYOUT, DATED_LAYOUT, date_parts
+from plan_scanner import scan_plans
+from plan_trace import TRACE, phase, add_trace_arguments, run_traced
+
+try:
+    import brotli
+except ImportError:  # 可选依赖，缺失时只生成 .gz
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DAILY_PLANS_DIR = "daily-plans"
+NAV_JSON_FILE = "nav-data.json"
+NAV_JS_FILE = "nav-data.js"
+INDEX_HTML_FILE = "index.html"
+NAV_DATA_DIR = "data"
+NAV_SHARD_DIR = "nav"
+NAV_MANIFEST_FILE = "index.json"
+NAV_SCHEMA_VERSION = 2
+NAV_LOCK_FILE = ".nav.lock"
+BUILD_OUTPUTS = ["json", "js", "html", "shards", "search", "stats"]
+# 可选输出：指定 --only 或输出文件已存在时才生成
+OPTIONAL_OUTPUTS = ["catalog"]
+# 需要完整解析记录的输出，构建这些输出时扫描阶段直接读取整个文件
+FULL_RECORD_OUTPUTS = {"search", "stats"}
+
+WEEKDAYS = ['星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']
+MONTH_NAMES = ['一月', '二月', '三月', '四月', '五月', '六月',
+               '七月', '八月', '九月', '十月', '十一月', '十二月']
+
+_NAV_DATA_LINK_RE = re.compile(r'(<link rel="preload" id="nav-data" href=")([^"]*)(")')
+
+# nav_lock 的重入深度按线程记录；同一进程的其他线程先在 _thread_lock 上等待，再获取文件锁
+_lock_state = threading.local()
+_thread_lock = threading.Lock()
+
+
+def get_weekday(year, month, day):
+    """获取星期几"""
+    date = datetime(int(year), int(month), int(day))
+    return WEEKDAYS[date.weekday()]
+
+
+def format_date(year, month, day):
+    """格式化日期"""
+    return f"{year}年{month}月{day}日"
+
+
+def build_model(base_dir=DAILY_PLANS_DIR, cache=None, workers=None, prefix=True):
+    """遍历一次计划目录，返回按日期排序的计划索引（DateIndex，元素为 PlanEntry）
+
+    条目保存日期、布局以及解析记录中的标题和预览。layout 为
+    "day"（YYYY/MM/DD.md）或 "dated"（文件名含 YYYY-MM-DD）。
+    目录由 plan_scanner 按布局规则遍历，stat 结果直接交给缓存校验；
+    缓存未命中的文件分发到 workers 个线程并发读取；prefix 为 True 时只读取前缀，
+    后续输出还需要完整记录（任务统计、搜索索引）时传 False，每个文件只读取一次。
+    """
+    entries = []
+    if not os.path.isdir(base_dir):
+        print(f"目录 {base_dir} 不存在")
+        return DateIndex()
+
+    own_cache = cache is None
+    if own_cache:
+        cache = PlanCache()
+
+    walk_start = time.perf_counter()
+    paths, stats = [], []
+    for plan in scan_plans(base_dir):
+        entry = PlanEntry.create(plan.path, plan.date, plan.layout, base_dir)
+        if entry is None:
+            print(f"跳过日期无效的计划文件: {plan.path}")
+            continue
+        entries.append(entry)
+        paths.append(plan.path)
+        stats.append(plan.stat)
+    TRACE.add("walk", time.perf_counter() - walk_start, len(entries))
+
+    records = cache.get_many(paths, prefix=prefix, workers=workers, stats=stats)
+    seen = set()
+    for entry, path, record in zip(entries, paths, records):
+        if isinstance(record, Exception):
+            print(f"读取文件 {path} 时出错: {record}")
+            continue
+        entry.record = record
+        seen.add(path)
+
+    cache.prune(seen)
+    if own_cache:
+        cache.save()
+
+    return DateIndex(entries)
+
+
+def entry_extra(entry, base_dir):
+    """返回条目中无法从年月日推导出的字段"""
+    extra = {}
+    if entry.title:
+        extra["title"] = entry.title
+    if not entry.standard or entry.base != base_dir:
+        extra["path"] = entry.path
+    return extra
+
+
+def preferred_entry(entries, layout):
+    """同一天的多个计划文件中选出一个：优先 layout 布局，其次路径排在前面的"""
+    for entry in entries:
+        if entry.layout == layout:
+            return entry
+    return entries[0] if entries else None
+
+
+def one_per_day(group, layout):
+    """按天去重，每天保留 preferred_entry 选出的文件"""
+    days = {}
+    for entry in group:
+        days.setdefault(entry.ordinal, []).append(entry)
+    return [preferred_entry(day, layout) for day in days.values()]
+
+
+def compact_nav_data(entries, base_dir=DAILY_PLANS_DIR):
+    """生成紧凑格式（版本 2）的 nav-data.json 数据
+
+    years 中每个月份只保存日期列表，其余字段都可由 年/月/日 推导；
+    只有自定义标题或非标准路径这类无法推导的信息放在 extra 中，
+    以 YYYY-MM-DD 为键。entries 为 build_model 返回的 DateIndex，按月分组输出。
+    两种布局的计划都会列出，同一天两种都有时使用 YYYY/MM/DD.md。
+    """
+    data = {"version": NAV_SCHEMA_VERSION, "base": base_dir, "years": {}, "extra": {}}
+    for (year, month), group in entries.months():
+        days = []
+        for entry in one_per_day(group, DAY_LAYOUT):
+            days.append(entry.date[2])
+            extra = entry_extra(entry, base_dir)
+            if extra:
+                data["extra"][entry.iso_date] = extra
+        if days:
+            data["years"].setdefault(year, {})[month] = days
+    return data
+
+
+def expand_day(base_dir, year, month, day, extra=None):
+    """由年月日推导出完整的导航条目（与前端 PlansScanner.expandMonth 一致）"""
+    extra = extra or {}
+    file_path = extra.get("path") or f"{base_dir}/{year}/{month}/{day}.md"
+    full_date = datetime(int(year), int(month), int(day))
+    weekday = WEEKDAYS[full_date.weekday()]
+    formatted_date = format_date(year, month, day)
+
+    return {
+        "title": extra.get("title") or f"每日计划 - {day}日",
+        "content": f"点击查看 {formatted_date} {weekday} 的详细计划内容...",
+        "file_path": file_path,
+        "full_path": f"./{file_path}",
+        "filename": file_path.rsplit("/", 1)[-1],
+        "day": day,
+        "month": month,
+        "year": year,
+        "fullDate": full_date.isoformat(),
+        "weekday": weekday,
+        "formattedDate": formatted_date
+    }
+
+
+def expand_nav_data(data):
+    """把紧凑格式的导航数据展开为 年 -> 月 -> 日 -> 完整条目 的结构，旧格式原样返回"""
+    if "version" not in data:
+        return data
+
+    base_dir = data["base"]
+    extra = data.get("extra", {})
+    plans_data = {}
+    for year in sorted(data["years"], reverse=True):
+        for month, days in data["years"][year].items():
+            plans_data.setdefault(year, {})[month] = {
+                day: expand_day(base_dir, year, month, day, extra.get(f"{year}-{month}-{day}"))
+                for day in days
+            }
+    return plans_data
+
+
+def nav_json_data(entries, base_dir=DAILY_PLANS_DIR):
+    """生成展开后的导航数据结构（YYYY/MM/DD.md 布局）"""
+    return expand_nav_data(compact_nav_data(entries, base_dir))
+
+
+def js_entry(entry, base_dir):
+    """nav-data.js 中的单个条目"""
+    year, month, date = entry.date
+    if entry.loaded:
+        title = entry.title or f"{year}年{month}月{date}日 - 每日计划"
+        preview = entry.preview
+    else:
+        title = f"{year}年{month}月{date}日 - 每日计划"
+        preview = "无法读取内容"
+
+    path = entry.path
+    prefix = base_dir.rstrip("/") + "/"
+    return {
+        "title": title,
+        "content": preview,
+        "file_path": path[len(prefix):],
+        "full_path": path
+    }
+
+
+def nav_js_data(entries, base_dir=DAILY_PLANS_DIR):
+    """生成 nav-data.js 使用的数据结构
+
+    两种布局的计划都会列出，同一天两种都有时使用 YYYY-MM-DD.md。
+    """
+    plans_data = {}
+    for (year, month), group in entries.months():
+        days = {entry.date[2]: js_entry(entry, base_dir)
+                for entry in one_per_day(group, DATED_LAYOUT)}
+        if days:
+            plans_data.setdefault(year, {})[month] = days
+    return plans_data
+
+
+def count_plans(plans_data):
+    """统计年份、月份和计划数量，支持展开格式和紧凑格式"""
+    if "version" in plans_data:
+        plans_data = plans_data["years"]
+    return {
+        "years": len(plans_data),
+        "months": sum(len(months) for months in plans_data.values()),
+        "plans": sum(len(days) for months in plans_data.values() for days in months.values()),
+    }
+
+
+def dump_json(data, pretty=False):
+    """序列化 JSON，默认最小化输出"""
+    with phase("serialize"):
+        if pretty:
+            return json.dumps(data, ensure_ascii=False, indent=2)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+@contextmanager
+def nav_lock(lock_file=NAV_LOCK_FILE):
+    """进程间互斥锁，防止并发构建同时写入导航数据；同一线程内可重入，其他线程同样互斥"""
+    depth = getattr(_lock_state, "depth", 0)
+    if depth:
+        _lock_state.depth = depth + 1
+        try:
+            yield
+        finally:
+            _lock_state.depth -= 1
+        return
+
+    with _thread_lock, open(lock_file, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        _lock_state.depth = 1
+        try:
+            yield
+        finally:
+            _lock_state.depth = 0
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def locked(func):
+    """在 nav_lock 保护下执行整个构建函数"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with nav_lock():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def atomic_write(path, data):
+    """先写临时文件再原子替换，读者不会看到写了一半的文件"""
+    mode = "wb" if isinstance(data, bytes) else "w"
+    encoding = None if isinstance(data, bytes) else "utf-8"
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with phase("write"):
+        with open(tmp_path, mode, encoding=encoding) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def write_precompressed(path, text):
+    """生成 .gz 和 .br（安装了 brotli 时）预压缩副本"""
+    raw = text.encode("utf-8")
+    atomic_write(path + ".gz", gzip.compress(raw, compresslevel=9, mtime=0))
+    if brotli is not None:
+        atomic_write(path + ".br", brotli.compress(raw))
+
+
+def render_plans_js(plans_data):
+    """生成 const plansData = ...; 代码"""
+    with phase("serialize"):
+        return "const plansData = " + json.dumps(plans_data, ensure_ascii=False, indent=2) + ";"
+
+
+def write_nav_json(nav_data, output_file=NAV_JSON_FILE, pretty=False):
+    """写入 nav-data.json 及其预压缩副本，内容未变化时不重写"""
+    text = dump_json(nav_data, pretty)
+    if write_if_changed(output_file, text) or not os.path.exists(output_file + ".gz"):
+        write_precompressed(output_file, text)
+
+
+def write_nav_js(plans_data, output_file=NAV_JS_FILE):
+    """写入 nav-data.js"""
+    atomic_write(output_file, render_plans_js(plans_data))
+
+
+def write_if_changed(path, text):
+    """内容有变化时才写入文件，返回是否写入"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    atomic_write(path, text)
+    return True
+
+
+def write_nav_shards(nav_data, shard_dir=NAV_SHARD_DIR, pretty=False, months=None):
+    """按年月分片写入导航数据
+
+    生成 nav/index.json（可用的年份、月份及每月计划数）和
+    nav/YYYY/MM.json（该月的计划条目，紧凑格式），前端按需加载单个分片，
+    不再逐日探测文件是否存在。只重写内容变化的分片并删除过期分片。
+    months 为 (年, 月) 集合时只处理这些月份的分片和清单。
+    返回写入的文件数。
+    """
+    manifest = {"version": NAV_SCHEMA_VERSION, "years": {}}
+    expected = set()
+    written = 0
+    extra = nav_data["extra"]
+
+    for year in sorted(nav_data["years"], reverse=True):
+        year_months = nav_data["years"][year]
+        manifest["years"][year] = {month: len(year_months[month]) for month in sorted(year_months)}
+        for month in sorted(year_months):
+            if months is not None and (year, month) not in months:
+                continue
+            days = year_months[month]
+            shard = {
+                "version": NAV_SCHEMA_VERSION,
+                "base": nav_data["base"],
+                "year": year,
+                "month": month,
+                "days": days,
+                "extra": {key: extra[key] for key in
+                          (f"{year}-{month}-{day}" for day in days) if key in extra},
+            }
+            path = os.path.join(shard_dir, year, f"{month}.json")
+            expected.add(os.path.normpath(path))
+            written += write_if_changed(path, dump_json(shard, pretty))
+
+    manifest_path = os.path.join(shard_dir, NAV_MANIFEST_FILE)
+    expected.add(os.path.normpath(manifest_path))
+    written += write_if_changed(manifest_path, dump_json(manifest, pretty))
+
+    if months is not None:
+        # 只删除指定月份中已经没有计划的分片
+        for year, month in months:
+            path = os.path.join(shard_dir, year, f"{month}.json")
+            if month not in nav_data["years"].get(year, {}) and os.path.exists(path):
+                os.remove(path)
+                year_dir = os.path.dirname(path)
+                if not os.listdir(year_dir):
+                    os.rmdir(year_dir)
+        return written
+
+    for dir_path, dir_names, file_names in os.walk(shard_dir, topdown=False):
+        for file_name in file_names:
+            path = os.path.normpath(os.path.join(dir_path, file_name))
+            if file_name.endswith(".json") and path not in expected:
+                os.remove(path)
+        if dir_path != shard_dir and not os.listdir(dir_path):
+            os.rmdir(dir_path)
+
+    return written
+
+
+def write_search_index(entries=None, changes=None, base_dir=DAILY_PLANS_DIR, cache=None,
+                       pretty=False):
+    """完整同步（entries）或增量更新（changes）搜索索引"""
+    # search_index 依赖本模块的写入工具，在这里延迟导入
+    from search_index import build_search_index, update_search_index
+    if changes is not None:
+        return update_search_index(changes, base_dir, cache, pretty=pretty)
+    return build_search_index(entries, base_dir, cache, pretty=pretty)
+
+
+def write_task_stats(entries=None, paths=None, base_dir=DAILY_PLANS_DIR, cache=None,
+                     pretty=False):
+    """完整统计（entries）或只重新统计 paths 所在日期的任务完成情况"""
+    from plan_stats import build_stats, update_stats
+    if paths is not None:
+        return update_stats(paths, base_dir, cache, pretty=pretty)
+    return build_stats(entries, base_dir, cache, pretty=pretty)
+
+
+def catalog_enabled():
+    """计划目录的 SQLite 索引是否已创建（见 plan_catalog.py）"""
+    from plan_catalog import catalog_exists
+    return catalog_exists()
+
+
+def write_catalog(entries=None, paths=None, base_dir=DAILY_PLANS_DIR):
+    """与计划目录同步（entries）或只同步 paths 中的文件到 SQLite 索引"""
+    from plan_catalog import PlanCatalog
+    with PlanCatalog() as catalog:
+        if paths is not None:
+            return catalog.update_files(paths, base_dir)
+        if entries is None:
+            return catalog.sync(base_dir)
+        return catalog.sync_entries(entries, base_dir)
+
+
+def write_fingerprinted_nav(nav_data, data_dir=NAV_DATA_DIR):
+    """写入文件名带内容哈希的 data/nav-data.<hash>.json，返回其路径
+
+    内容不变时文件名不变，可以配合长期的 immutable 缓存；旧的数据文件会被删除。
+    """
+    text = dump_json(nav_data)
+    name = fingerprinted_name(hashlib.sha256(text.encode('utf-8')).hexdigest())
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        atomic_write(path, text)
+        write_precompressed(path, text)
+
+    prune_fingerprinted(data_dir, name)
+    return f"{data_dir}/{name}"
+
+
+def fingerprinted_name(digest):
+    """由内容的 sha256 十六进制摘要得到数据文件名"""
+    return f"nav-data.{digest[:10]}.json"
+
+
+def prune_fingerprinted(data_dir, name):
+    """删除 data_dir 中除 name（及其预压缩副本）以外的旧数据文件"""
+    current = {name, name + ".gz", name + ".br"}
+    for file_name in os.listdir(data_dir):
+        if file_name.startswith("nav-data.") and file_name not in current:
+            os.remove(os.path.join(data_dir, file_name))
+
+
+def update_index_html(nav_url, html_file=INDEX_HTML_FILE):
+    """让 index.html 引用 nav_url 指向的数据文件，引用未变化时不重写，返回是否写入"""
+    with open(html_file, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    if not _NAV_DATA_LINK_RE.search(html_content):
+        print(f"⚠️  {html_file} 中没有找到 <link id=\"nav-data\"> 标签，未更新数据引用")
+        return False
+
+    updated_html = _NAV_DATA_LINK_RE.sub(lambda match: match.group(1) + nav_url + match.group(3),
+                                         html_content, count=1)
+    if updated_html == html_content:
+        return False
+    atomic_write(html_file, updated_html)
+    return True
+
+
+def publish_nav_data(nav_data, html_file=INDEX_HTML_FILE):
+    """写入带哈希的数据文件并更新 index.html 中的引用"""
+    return update_index_html(write_fingerprinted_nav(nav_data), html_file)
+
+
+@locked
+def build_all(base_dir=DAILY_PLANS_DIR, outputs=None, cache=None, workers=None,
+              pretty=False):
+    """执行完整构建流程，返回统计信息和各阶段耗时（秒）"""
+    if not outputs:
+        outputs = BUILD_OUTPUTS + (["catalog"] if catalog_enabled() else [])
+    timings = {}
+
+    start = time.perf_counter()
+    own_cache = cache is None
+    if own_cache:
+        cache = PlanCache()
+    # 只统计本次扫描阶段的缓存命中情况（缓存可能跨多次构建复用，后续输出也会读取缓存）
+    hits, misses = cache.hits, cache.misses
+    entries = build_model(base_dir, cache, workers,
+                          prefix=not FULL_RECORD_OUTPUTS.intersection(outputs))
+    timings["scan"] = time.perf_counter() - start
+    hits, misses = cache.hits - hits, cache.misses - misses
+
+    json_data = compact_nav_data(entries, base_dir)
+    js_data = nav_js_data(entries, base_dir)
+
+    writers = {
+        "json": (NAV_JSON_FILE, lambda: write_nav_json(json_data, pretty=pretty)),
+        "js": (NAV_JS_FILE, lambda: write_nav_js(js_data)),
+        "html": (INDEX_HTML_FILE, lambda: publish_nav_data(json_data)),
+        "shards": (NAV_SHARD_DIR + "/", lambda: write_nav_shards(json_data, pretty=pretty)),
+        "search": ("search/", lambda: write_search_index(entries, base_dir=base_dir,
+                                                         cache=cache, pretty=pretty)),
+        "stats": ("stats.json", lambda: write_task_stats(entries, base_dir=base_dir,
+                                                         cache=cache, pretty=pretty)),
+        "catalog": (".plans.db", lambda: write_catalog(entries, base_dir=base_dir)),
+    }
+    for name in outputs:
+        label, writer = writers[name]
+        start = time.perf_counter()
+        writer()
+        timings[label] = time.perf_counter() - start
+    if own_cache:
+        cache.save()
+
+    return {
+        "files": len(entries),
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "json": count_plans(json_data),
+        "js": count_plans(js_data),
+        "timings": timings,
+    }
+
+
+def load_nav_json(nav_file=NAV_JSON_FILE):
+    """读取紧凑格式的 nav-data.json，不存在或为旧格式时返回 None"""
+    try:
+        with open(nav_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == NAV_SCHEMA_VERSION else None
+
+
+def load_plans_js(js_file=NAV_JS_FILE):
+    """读取 nav-data.js 中的 plansData，无法解析时返回 None"""
+    try:
+        with open(js_file, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        prefix = "const plansData = "
+        if not text.startswith(prefix):
+            return None
+        return json.loads(text[len(prefix):].rstrip(";"))
+    except (OSError, ValueError):
+        return None
+
+
+def _sorted_tree(tree):
+    """按年、月排序，使增量更新的结果与完整构建一致"""
+    return {year: {month: tree[year][month] for month in sorted(tree[year])}
+            for year in sorted(tree)}
+
+
+def _patch_compact(nav_data, entry, base_dir):
+    """在紧凑格式数据中添加、更新或删除（未能读取）一个条目"""
+    year, month, day = entry.date
+    key = entry.iso_date
+    months = nav_data["years"].setdefault(year, {})
+    days = months.setdefault(month, [])
+
+    if entry.loaded:
+        if day not in days:
+            bisect.insort(days, day)
+        extra = entry_extra(entry, base_dir)
+        if extra:
+            nav_data["extra"][key] = extra
+        else:
+            nav_data["extra"].pop(key, None)
+    else:
+        if day in days:
+            days.remove(day)
+        nav_data["extra"].pop(key, None)
+        if not days:
+            del months[month]
+        if not months:
+            del nav_data["years"][year]
+
+
+def _patch_js(plans_data, entry, base_dir):
+    """在 nav-data.js 数据中添加、更新或删除（未能读取）一个条目"""
+    year, month, date = entry.date
+    months = plans_data.setdefault(year, {})
+    days = months.setdefault(month, {})
+
+    if entry.loaded:
+        days[date] = js_entry(entry, base_dir)
+        months[month] = {key: days[key] for key in sorted(days)}
+    else:
+        days.pop(date, None)
+        if not days:
+            del months[month]
+        if not months:
+            del plans_data[year]
+
+
+def files_by_day(paths, base_dir=DAILY_PLANS_DIR, cache=None):
+    """paths 所在日期当前存在的全部计划文件：{日期序数: [路径, ...]}
+
+    同一天可能同时存在两种布局的文件，其他文件从缓存中找出
+    （缓存包含上次扫描到的全部计划文件）。
+    """
+    changed = [os.path.normpath(path).replace(os.sep, "/") for path in paths]
+    days = {}
+    for path in changed:
+        entry = PlanEntry.from_path(path, base_dir)
+        if entry is not None:
+            days[entry.ordinal] = set()
+
+    candidates = list(cache.entries) if cache is not None else []
+    for path in candidates + changed:
+        entry = PlanEntry.from_path(path, base_dir)
+        if entry is not None and entry.ordinal in days and os.path.exists(path):
+            days[entry.ordinal].add(path)
+    return {ordinal: sorted(files) for ordinal, files in days.items()}
+
+
+def patch_index(index, paths, base_dir=DAILY_PLANS_DIR, cache=None, layout=None):
+    """按变化的文件更新 DateIndex，不重新遍历计划目录
+
+    paths 所在日期的条目全部重新读取（标题和预览来自缓存）；layout 不为 None 时
+    每天只保留 preferred_entry 选出的文件（与 one_per_day 一致）。
+    """
+    cache = cache if cache is not None else PlanCache()
+    for ordinal, files in files_by_day(paths, base_dir, cache).items():
+        for entry in index.on(ordinal):
+            index.remove(entry.path, ordinal)
+
+        entries = []
+        for path in files:
+            entry = PlanEntry.from_path(path, base_dir)
+            try:
+                entry.record = cache.get(path, prefix=True)
+            except FileNotFoundError:
+                continue
+            entries.append(entry)
+        if layout is not None:
+            entries = [preferred_entry(entries, layout)] if entries else []
+        for entry in entries:
+            index.add(entry)
+    return index
+
+
+@locked
+def update_nav(paths, base_dir=DAILY_PLANS_DIR, cache=None, pretty=False):
+    """增量更新导航数据，只重新读取 paths 中的计划文件
+
+    paths 为刚写入或删除的计划文件路径。只修改这些文件所在月份的条目
+    和分片；已有的导航数据缺失、为旧格式或由其他计划目录生成时回退到完整构建。
+    返回与 build_all 相同结构的统计信息。
+    """
+    nav_data = load_nav_json()
+    js_data = load_plans_js()
+    if (nav_data is None or js_data is None
+            or os.path.normpath(nav_data.get("base", "")) != os.path.normpath(base_dir)):
+        return build_all(base_dir, cache=cache, pretty=pretty)
+
+    timings = {}
+    start = time.perf_counter()
+    own_cache = cache is None
+    if own_cache:
+        cache = PlanCache()
+    hits, misses = cache.hits, cache.misses
+
+    search_changes = []
+    for path in paths:
+        path = os.path.normpath(path).replace(os.sep, "/")
+        entry = PlanEntry.from_path(path, base_dir)
+        if entry is None:
+            continue
+
+        # 搜索索引和任务统计随后需要完整记录，这里直接读取整个文件
+        try:
+            entry.record = cache.get(path)
+        except FileNotFoundError:
+            pass  # 文件已删除，从导航数据中移除
+        search_changes.append((path, entry.date, entry.title))
+
+    # 按天重新选出各输出使用的文件，这一天已没有文件时从导航数据中移除
+    changed_months = set()
+    days = files_by_day(paths, base_dir, cache)
+    for ordinal, files in days.items():
+        entries = []
+        for path in files:
+            entry = PlanEntry.from_path(path, base_dir)
+            try:
+                entry.record = cache.get(path, prefix=True)
+            except FileNotFoundError:
+                continue
+            entries.append(entry)
+
+        removed = PlanEntry(ordinal, base_dir, DAY_LAYOUT)
+        _patch_compact(nav_data, preferred_entry(entries, DAY_LAYOUT) or removed, base_dir)
+        _patch_js(js_data, preferred_entry(entries, DATED_LAYOUT) or removed, base_dir)
+        changed_months.add(date_parts(ordinal)[:2])
+    js_changed = bool(days)
+
+    timings["scan"] = time.perf_counter() - start
+    hits, misses = cache.hits - hits, cache.misses - misses
+
+    if search_changes:
+        start = time.perf_counter()
+        write_search_index(changes=search_changes, base_dir=base_dir, cache=cache, pretty=pretty)
+        timings["search/"] = time.perf_counter() - start
+        start = time.perf_counter()
+        write_task_stats(paths=[change[0] for change in search_changes], base_dir=base_dir,
+                         cache=cache, pretty=pretty)
+        timings["stats.json"] = time.perf_counter() - start
+        if catalog_enabled():
+            start = time.perf_counter()
+            write_catalog(paths=[change[0] for change in search_changes], base_dir=base_dir)
+            timings[".plans.db"] = time.perf_counter() - start
+    if own_cache:
+        cache.save()
+
+    if changed_months:
+        nav_data["years"] = _sorted_tree(nav_data["years"])
+        nav_data["extra"] = {key: nav_data["extra"][key] for key in sorted(nav_data["extra"])}
+        for label, writer in (
+            (NAV_JSON_FILE, lambda: write_nav_json(nav_data, pretty=pretty)),
+            (NAV_SHARD_DIR + "/", lambda: write_nav_shards(nav_data, pretty=pretty,
+                                                           months=changed_months)),
+            (INDEX_HTML_FILE, lambda: publish_nav_data(nav_data)),
+        ):
+            start = time.perf_counter()
+            writer()
+            timings[label] = time.perf_counter() - start
+
+    if js_changed:
+        js_data = _sorted_tree(js_data)
+        start = time.perf_counter()
+        write_nav_js(js_data)
+        timings[NAV_JS_FILE] = time.perf_counter() - start
+
+    return {
+        "files": len(paths),
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "json": count_plans(nav_data),
+        "js": count_plans(js_data),
+        "timings": timings,
+    }
+
+
+def print_report(result):
+    """打印构建统计和各输出耗时"""
+    counts = result["json"]
+    print(f"扫描完成！共 {result['files']} 个计划文件"
+          f"（缓存命中 {result['cache_hits']}，重新解析 {result['cache_misses']}）")
+    print(f"年份数: {counts['years']}")
+    print(f"月份数: {counts['months']}")
+    print(f"计划数: {counts['plans']}")
+
+    print("\n各阶段耗时:")
+    for name, seconds in result["timings"].items():
+        print(f"  {name:<16} {seconds * 1000:8.2f} ms")
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="一次扫描生成全部导航数据")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--only", action="append", choices=BUILD_OUTPUTS + OPTIONAL_OUTPUTS,
+                        help="只生成指定输出，可重复指定（catalog 为 SQLite 索引，已存在时默认同步）")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="并发读取文件的线程数（默认按CPU数量自动选择）")
+    parser.add_argument("--pretty", action="store_true", help="JSON 输出使用缩进格式")
+    parser.add_argument("--stream", action="store_true",
+                        help="流式生成 json、js 和 html 输出，内存占用与计划总数无关（见 nav_stream.py）")
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        from nav_stream import STREAM_OUTPUTS, stream_build
+        unsupported = set(args.only or []) - set(STREAM_OUTPUTS)
+        if unsupported:
+            parser.error(f"--stream 只支持 {', '.join(STREAM_OUTPUTS)} 输出")
+
+    def run():
+        if args.stream:
+            with nav_lock():
+                result = stream_build(args.base_dir, args.only, args.pretty)
+        else:
+            result = build_all(args.base_dir, args.only, workers=args.workers, pretty=args.pretty)
+        print_report(result)
+    run_traced(run, args.trace, args.profile, args.quiet)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
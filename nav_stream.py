@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式导航数据构建
+目录扫描逐个产出计划，按日期顺序增量写出 nav-data.json、nav-data.js 和
+index.html 引用的带哈希数据文件，输出与完整构建相同，但内存中不保存完整的导航数据：
+峰值内存只与一年内的计划数有关。为此不使用解析缓存（缓存本身与计划总数成正比），
+分片、搜索索引和统计仍需完整构建（nav_builder.py）
+"""
+
+import os
+import sys
+import json
+import gzip
+import time
+import heapq
+import shutil
+import hashlib
+import filecmp
+import argparse
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import date as _date
+
+from plan_cache import parse_plan_file
+from plan_model import PlanEntry, DAY_LAYOUT, DATED_LAYOUT
+from plan_scanner import scan_plans, relative_parts
+from plan_trace import phase, add_trace_arguments, run_traced
+from nav_builder import (
+    DAILY_PLANS_DIR, NAV_JSON_FILE, NAV_JS_FILE, NAV_DATA_DIR, NAV_SCHEMA_VERSION,
+    INDEX_HTML_FILE, brotli, nav_lock, fingerprinted_name, prune_fingerprinted,
+    update_index_html, print_report, entry_extra, js_entry, preferred_entry,
+)
+
+STREAM_OUTPUTS = ["json", "js", "html"]
+COPY_CHUNK = 1024 * 1024
+
+
+def iter_plans(base_dir=DAILY_PLANS_DIR):
+    """逐个产出已读取标题和预览的 PlanEntry，按 (日期, 路径) 排序
+
+    扫描按目录顺序进行，条目先放入堆中，进入下一个年份目录时才输出更早的条目，
+    因此内存中最多只有约一年的计划。文件日期早于已输出的条目（放在更晚的年份目录中）时
+    无法保持顺序，抛出 ValueError。
+    """
+    heap = []
+    last = None   # 最后输出的日期序数
+    for plan in scan_plans(base_dir):
+        entry = PlanEntry.create(plan.path, plan.date, plan.layout, base_dir)
+        if entry is None:
+            print(f"跳过日期无效的计划文件: {plan.path}")
+            continue
+
+        boundary = _date(int(relative_parts(plan.path, base_dir)[0]), 1, 1).toordinal()
+        while heap and heap[0][0] < boundary:
+            last = heap[0][0]
+            yield heapq.heappop(heap)[2]
+        if last is not None and entry.ordinal < last:
+            raise ValueError(f"{plan.path} 的日期早于所在年份目录，无法按日期顺序流式输出，"
+                             f"请使用完整构建")
+
+        try:
+            entry.record = parse_plan_file(plan.path, plan.stat, prefix=True)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"读取文件 {plan.path} 时出错: {e}")
+        heapq.heappush(heap, (entry.ordinal, entry.path, entry))
+
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def iter_days(entries):
+    """把按日期排序的条目按天分组，产出每天的条目列表"""
+    day = []
+    for entry in entries:
+        if day and entry.ordinal != day[0].ordinal:
+            yield day
+            day = []
+        day.append(entry)
+    if day:
+        yield day
+
+
+class JSONStream:
+    """把嵌套对象逐项写入文本文件，结果与对整个对象调用 json.dumps 相同
+
+    indent 为 None 时使用最小化分隔符（与 dump_json 一致），否则与 indent=N 的输出一致。
+    """
+
+    def __init__(self, f, indent=None):
+        self.f = f
+        self.indent = indent
+        self.key_separator = ":" if indent is None else ": "
+        self.counts = []   # 每层已打开对象中已写入的成员数
+
+    def _newline(self, depth):
+        if self.indent is not None:
+            self.f.write("\n" + " " * (self.indent * depth))
+
+    def _member(self, key):
+        if not self.counts:
+            return
+        if self.counts[-1]:
+            self.f.write(",")
+        self.counts[-1] += 1
+        self._newline(len(self.counts))
+        self.f.write(json.dumps(key, ensure_ascii=False) + self.key_separator)
+
+    def begin(self, key=None):
+        """打开一个对象（最外层对象不需要 key）"""
+        self._member(key)
+        self.f.write("{")
+        self.counts.append(0)
+
+    def item(self, key, value):
+        """写入一个成员"""
+        self._member(key)
+        text = json.dumps(value, ensure_ascii=False, indent=self.indent,
+                          separators=(",", self.key_separator))
+        if self.indent is not None:
+            text = text.replace("\n", "\n" + " " * (self.indent * len(self.counts)))
+        self.f.write(text)
+
+    def end(self):
+        """关闭当前对象"""
+        if self.counts.pop():
+            self._newline(len(self.counts))
+        self.f.write("}")
+
+
+class _HashingWriter:
+    """写入文件的同时计算 sha256"""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, text):
+        self.sha256.update(text.encode("utf-8"))
+        self.f.write(text)
+
+
+class MonthStream(ABC):
+    """按 年 -> 月 分组的流式输出基类，子类决定每个月的写法"""
+
+    def __init__(self, stream):
+        self.json = stream
+        self.year = None
+        self.month = None
+        self.years = 0
+        self.months = 0
+        self.plans = 0
+
+    def add(self, entry):
+        year, month, _ = entry.date
+        if (year, month) != (self.year, self.month):
+            self.close_month()
+            if year != self.year:
+                if self.year is not None:
+                    self.json.end()
+                self.json.begin(year)
+                self.years += 1
+            self.year, self.month = year, month
+            self.open_month()
+            self.months += 1
+        self.add_day(entry)
+        self.plans += 1
+
+    def close_years(self):
+        self.close_month()
+        if self.year is not None:
+            self.json.end()
+
+    def counts(self):
+        return {"years": self.years, "months": self.months, "plans": self.plans}
+
+    def open_month(self):
+        pass
+
+    def close_month(self):
+        pass
+
+    @abstractmethod
+    def add_day(self, entry):
+        """写出当月的一天"""
+
+
+class CompactNavStream(MonthStream):
+    """流式写出紧凑格式（版本 2）的导航数据，与 compact_nav_data + dump_json 一致
+
+    extra 要写在 years 之后，先逐行暂存到临时文件。
+    """
+
+    def __init__(self, f, base_dir=DAILY_PLANS_DIR, pretty=False):
+        super().__init__(JSONStream(f, 2 if pretty else None))
+        self.base_dir = base_dir
+        self.days = []
+        self.extra = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.json.begin()
+        self.json.item("version", NAV_SCHEMA_VERSION)
+        self.json.item("base", base_dir)
+        self.json.begin("years")
+
+    def close_month(self):
+        if self.days:
+            self.json.item(self.month, self.days)
+            self.days = []
+
+    def add_day(self, entry):
+        self.days.append(entry.date[2])
+        extra = entry_extra(entry, self.base_dir)
+        if extra:
+            self.extra.write(json.dumps([entry.iso_date, extra], ensure_ascii=False) + "\n")
+
+    def finish(self):
+        self.close_years()
+        self.json.end()
+        self.json.begin("extra")
+        self.extra.seek(0)
+        for line in self.extra:
+            key, value = json.loads(line)
+            self.json.item(key, value)
+        self.extra.close()
+        self.json.end()
+        self.json.end()
+
+
+class PlansJSStream(MonthStream):
+    """流式写出 nav-data.js，与 nav_js_data + render_plans_js 一致"""
+
+    def __init__(self, f, base_dir=DAILY_PLANS_DIR):
+        super().__init__(JSONStream(f, 2))
+        self.base_dir = base_dir
+        self.f = f
+        f.write("const plansData = ")
+        self.json.begin()
+
+    def open_month(self):
+        self.json.begin(self.month)
+
+    def close_month(self):
+        if self.month is not None:
+            self.json.end()
+            self.month = None
+
+    def add_day(self, entry):
+        self.json.item(entry.date[2], js_entry(entry, self.base_dir))
+
+    def finish(self):
+        self.close_years()
+        self.json.end()
+        self.f.write(";")
+
+
+def _temp_path(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def replace_if_changed(tmp_path, path):
+    """临时文件与目标内容不同时替换目标，否则删除临时文件，返回是否替换"""
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def compress_file(path):
+    """分块生成 .gz 和 .br（安装了 brotli 时）预压缩副本"""
+    with phase("write"):
+        tmp_path = _temp_path(path + ".gz")
+        with open(path, "rb") as src, open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK)
+        os.replace(tmp_path, path + ".gz")
+
+        if brotli is not None:
+            tmp_path = _temp_path(path + ".br")
+            compressor = brotli.Compressor()
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(COPY_CHUNK), b""):
+                    dst.write(compressor.process(chunk))
+                dst.write(compressor.finish())
+            os.replace(tmp_path, path + ".br")
+
+
+def stream_build(base_dir=DAILY_PLANS_DIR, outputs=None, pretty=False):
+    """流式构建导航数据，返回与 build_all 相同结构的统计信息
+
+    outputs 为 STREAM_OUTPUTS 的子集。调用方负责持有 nav_lock。
+    """
+    outputs = outputs or STREAM_OUTPUTS
+    timings = {}
+    start = time.perf_counter()
+
+    streams = []
+    files = {}
+    json_stream = js_stream = fingerprint = None
+    try:
+        if "json" in outputs:
+            files["json"] = open(_temp_path(NAV_JSON_FILE), "w", encoding="utf-8")
+            json_stream = CompactNavStream(files["json"], base_dir, pretty)
+            streams.append((json_stream, DAY_LAYOUT))
+        if "js" in outputs:
+            files["js"] = open(_temp_path(NAV_JS_FILE), "w", encoding="utf-8")
+            js_stream = PlansJSStream(files["js"], base_dir)
+            streams.append((js_stream, DATED_LAYOUT))
+        if "html" in outputs:
+            # 带哈希的数据文件总是最小化格式，边写边计算文件名所用的哈希
+            files["html"] = open(_temp_path(os.path.join(NAV_DATA_DIR, "nav-data.json")),
+                                 "w", encoding="utf-8")
+            fingerprint = _HashingWriter(files["html"])
+            streams.append((CompactNavStream(fingerprint, base_dir), DAY_LAYOUT))
+
+        plan_count = 0
+        try:
+            with phase("serialize"):
+                for day in iter_days(iter_plans(base_dir)):
+                    plan_count += len(day)
+                    for stream, layout in streams:
+                        stream.add(preferred_entry(day, layout))
+                for stream, _ in streams:
+                    stream.finish()
+        finally:
+            for f in files.values():
+                f.close()
+        timings["scan"] = time.perf_counter() - start
+
+        if "json" in outputs:
+            start = time.perf_counter()
+            if (replace_if_changed(files["json"].name, NAV_JSON_FILE)
+                    or not os.path.exists(NAV_JSON_FILE + ".gz")):
+                compress_file(NAV_JSON_FILE)
+            timings[NAV_JSON_FILE] = time.perf_counter() - start
+        if "js" in outputs:
+            start = time.perf_counter()
+            os.replace(files["js"].name, NAV_JS_FILE)
+            timings[NAV_JS_FILE] = time.perf_counter() - start
+        if "html" in outputs:
+            start = time.perf_counter()
+            name = fingerprinted_name(fingerprint.sha256.hexdigest())
+            path = os.path.join(NAV_DATA_DIR, name)
+            if os.path.exists(path):
+                os.remove(files["html"].name)
+            else:
+                os.replace(files["html"].name, path)
+                compress_file(path)
+            prune_fingerprinted(NAV_DATA_DIR, name)
+            update_index_html(f"{NAV_DATA_DIR}/{name}", INDEX_HTML_FILE)
+            timings[INDEX_HTML_FILE] = time.perf_counter() - start
+    finally:
+        # 扫描或写出中途出错时删除还没有替换到位的临时文件
+        for f in files.values():
+            f.close()
+            if os.path.exists(f.name):
+                os.remove(f.name)
+
+    empty = {"years": 0, "months": 0, "plans": 0}
+    return {
+        "files": plan_count,
+        "cache_hits": 0,
+        "cache_misses": plan_count,
+        "json": json_stream.counts() if json_stream else empty,
+        "js": js_stream.counts() if js_stream else empty,
+        "timings": timings,
+    }
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="流式构建导航数据（内存占用与计划总数无关）")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--only", action="append", choices=STREAM_OUTPUTS,
+                        help="只生成指定输出，可重复指定")
+    parser.add_argument("--pretty", action="store_true", help="nav-data.json 使用缩进格式")
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+
+    def run():
+        with nav_lock():
+            result = stream_build(args.base_dir, args.only, args.pretty)
+        print_report(result)
+    run_traced(run, args.trace, args.profile, args.quiet)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导航数据监听模式
+常驻监听daily-plans目录，计划文件变化后去抖合并，只增量更新受影响的年月条目。
+Linux 下使用 inotify，其他平台或 inotify 不可用时退化为定时轮询
+"""
+
+import os
+import sys
+import time
+import struct
+import select
+import argparse
+
+from nav_builder import DAILY_PLANS_DIR, build_all, update_nav, nav_lock
+from plan_cache import PlanCache
+from plan_scanner import scan_plans
+
+# inotify 事件掩码（见 inotify(7)）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# wait() 返回该值表示需要完整重建（事件队列溢出等）
+RESCAN = None
+
+
+def _is_plan_file(name):
+    return name.endswith(".md") and not name.startswith(".")
+
+
+class PollingWatcher:
+    """通过定时比较 mtime 和大小检测变化"""
+
+    def __init__(self, base_dir, interval=1.0):
+        self.base_dir = base_dir
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        # 与构建使用同一扫描器，stat 结果来自 DirEntry
+        return {plan.path: (plan.stat.st_mtime_ns, plan.stat.st_size)
+                for plan in scan_plans(self.base_dir) if plan.stat is not None}
+
+    def wait(self, timeout):
+        """等待最多 timeout 秒，返回变化的文件路径集合"""
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        current = self._snapshot()
+        changed = {path for path in current.keys() | self.snapshot.keys()
+                   if current.get(path) != self.snapshot.get(path)}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """基于 inotify 的递归目录监听（通过 ctypes 调用 libc）"""
+
+    def __init__(self, base_dir):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self.base_dir = base_dir
+        self.watches = {}
+        self._add_tree(base_dir)
+
+    def _add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = path
+
+    def _add_tree(self, root):
+        """监听 root 及其所有子目录，返回其中已存在的计划文件"""
+        found = set()
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names[:] = [d for d in dir_names if not d.startswith(".")]
+            self._add_watch(dir_path)
+            found.update(os.path.join(dir_path, name).replace(os.sep, "/")
+                         for name in file_names if _is_plan_file(name))
+        return found
+
+    def wait(self, timeout):
+        """等待最多 timeout 秒，返回变化的文件路径集合；队列溢出时返回 RESCAN"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return RESCAN
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_DELETE_SELF:
+                del self.watches[wd]
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # 新目录中可能已经有文件，一并视为变化
+                    changed |= self._add_tree(path)
+                elif mask & IN_MOVED_FROM:
+                    return RESCAN
+            elif _is_plan_file(name):
+                changed.add(path.replace(os.sep, "/"))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_watcher(base_dir, poll=False, interval=1.0):
+    """优先使用 inotify，不可用时退化为轮询"""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(base_dir)
+        except (OSError, AttributeError) as e:
+            print(f"inotify 不可用，改为轮询: {e}")
+    return PollingWatcher(base_dir, interval)
+
+
+def watch(base_dir=DAILY_PLANS_DIR, debounce=0.3, poll=False, interval=1.0):
+    """持续监听计划目录，变化停止 debounce 秒后批量增量更新导航数据"""
+    if not os.path.isdir(base_dir):
+        print(f"目录 {base_dir} 不存在")
+        return 1
+
+    # 构建和保存缓存在同一次 nav_lock 内完成，其他构建不会在两者之间写入缓存文件
+    cache = PlanCache()
+    with nav_lock():
+        build_all(base_dir, cache=cache)
+        cache.save()
+
+    watcher = open_watcher(base_dir, poll, interval)
+    print(f"👀 正在监听 {base_dir}（{type(watcher).__name__}），按 Ctrl+C 停止")
+
+    pending = set()
+    rescan = False
+    last_event = 0.0
+    try:
+        while True:
+            timeout = debounce if pending or rescan else None
+            changes = watcher.wait(timeout)
+            if changes is RESCAN:
+                rescan = True
+                last_event = time.monotonic()
+            elif changes:
+                pending |= changes
+                last_event = time.monotonic()
+
+            if (pending or rescan) and time.monotonic() - last_event >= debounce:
+                start = time.perf_counter()
+                with nav_lock():
+                    if rescan:
+                        result = build_all(base_dir, cache=cache)
+                    else:
+                        result = update_nav(sorted(pending), base_dir, cache=cache)
+                    cache.save()
+                elapsed = (time.perf_counter() - start) * 1000
+                what = "完整重建" if rescan else f"{len(pending)} 个文件"
+                print(f"🔄 {time.strftime('%H:%M:%S')} 已更新导航数据（{what}，"
+                      f"{result['json']['plans']} 个计划，{elapsed:.1f} ms）")
+                pending.clear()
+                rescan = False
+    except KeyboardInterrupt:
+        print("\n👋 已停止监听")
+    finally:
+        watcher.close()
+    return 0
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="监听计划目录并增量更新导航数据")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="最后一次变化后等待的秒数，期间的变化合并处理")
+    parser.add_argument("--poll", action="store_true", help="强制使用轮询而不是 inotify")
+    parser.add_argument("--interval", type=float, default=1.0, help="轮询间隔（秒）")
+    args = parser.parse_args(argv)
+    return watch(args.base_dir, args.debounce, args.poll, args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划文件解析缓存
+按 路径 + mtime + 大小 + 内容哈希 缓存每个计划文件的解析记录（见 plan_parser），
+供 generate-nav.py、generate-nav-data.py 和 generate-daily-plan.py 共用，
+未修改的文件不会被重新读取和解析
+"""
+
+import os
+import json
+import mmap
+import codecs
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from plan_parser import PREFIX_FIELDS, parse_text, term_counts
+from plan_trace import phase
+
+CACHE_FILE = ".plan-cache.json"
+CACHE_VERSION = 5
+
+PREFIX_BYTES = 4096            # 前缀读取模式下首次读取的字节数
+MMAP_THRESHOLD = 1024 * 1024   # 超过该大小的文件使用 mmap 读取前缀
+
+
+def decode_prefix(data):
+    """解码文件前缀，丢弃末尾被截断的不完整 UTF-8 字符"""
+    return codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+
+
+def _prefix_sufficient(data):
+    """前缀是否已包含完整的 front matter 和足够生成预览的正文"""
+    return parse_text(decode_prefix(data), PREFIX_FIELDS)[1]
+
+
+def read_plan_prefix(path, size, limit=PREFIX_BYTES):
+    """只读取 front matter 和生成预览所需的文件前缀
+
+    返回 (data, complete)，complete 表示是否读到了文件末尾。
+    前缀不够时按倍数扩大读取范围；大文件通过 mmap 切片读取。
+    """
+    with open(path, 'rb') as f:
+        if size <= limit:
+            return f.read(), True
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _grow_prefix(lambda n: mm[:n], size, limit)
+
+        def read(n):
+            f.seek(0)
+            return f.read(n)
+        return _grow_prefix(read, size, limit)
+
+
+def _grow_prefix(read, size, limit):
+    """逐步扩大前缀，直到内容足够或读完整个文件"""
+    n = limit
+    while True:
+        data = read(n)
+        if n >= size:
+            return data, True
+        if _prefix_sufficient(data):
+            return data, False
+        n *= 2
+
+
+def parse_plan(content, partial=False):
+    """解析计划文件内容，返回可缓存的记录
+
+    partial 为 True 时内容只是文件前缀，只解析 PREFIX_FIELDS 中的字段；
+    完整解析时还记录搜索索引使用的词频（terms）。
+    """
+    if partial:
+        record, _ = parse_text(content, PREFIX_FIELDS)
+    else:
+        record, _ = parse_text(content)
+        record["terms"] = term_counts(content)
+    return record
+
+
+def read_plan_file(path, st, prefix=False):
+    """读取计划文件，返回 (原始字节, 是否读完整个文件, 已解码的文本或 None)"""
+    with phase("read"):
+        if prefix:
+            raw, complete = read_plan_prefix(path, st.st_size)
+            return raw, complete, decode_prefix(raw) if not complete else None
+        with open(path, 'rb') as f:
+            return f.read(), True, None
+
+
+def parse_plan_file(path, st=None, prefix=False):
+    """不经过缓存直接读取并解析计划文件（流式构建使用，内存占用与文件数无关）"""
+    if st is None:
+        st = os.stat(path)
+    raw, complete, content = read_plan_file(path, st, prefix)
+    with phase("parse"):
+        return parse_plan(content if content is not None else raw.decode('utf-8'),
+                          partial=not complete)
+
+
+class PlanCache:
+    """持久化的计划文件解析缓存"""
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.entries = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """从磁盘加载缓存，文件损坏或版本不符时从空缓存开始"""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取缓存 {self.cache_file} 时出错，将重新解析: {e}")
+            return
+
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("entries", {})
+
+    def save(self):
+        """缓存有变化时原子写回磁盘
+
+        临时文件名带进程号和线程号，多个进程或线程同时保存时不会互相覆盖临时文件。
+        """
+        if not self.dirty:
+            return
+
+        tmp_file = f"{self.cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "entries": self.entries},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        self.dirty = False
+
+    def lookup(self, key, st, prefix=False):
+        """stat 未变化且记录满足读取模式时直接返回缓存记录，否则返回 None"""
+        entry = self.entries.get(key)
+        if (entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size
+                and (prefix or not entry.get("partial"))):
+            self.hits += 1
+            return entry["record"]
+        return None
+
+    def _load(self, key, st, prefix):
+        """读取并解析文件，不修改缓存，可在线程池中并发执行"""
+        raw, complete, content = read_plan_file(key, st, prefix)
+        digest = hashlib.sha1(raw).hexdigest()
+
+        entry = self.entries.get(key)
+        if entry and entry["hash"] == digest and entry.get("partial", False) == (not complete):
+            # 内容未变，只是 mtime 改变（如 touch、git checkout）
+            return digest, complete, entry["record"], True
+
+        with phase("parse"):
+            if content is None:
+                content = raw.decode('utf-8')
+            record = parse_plan(content, partial=not complete)
+        return digest, complete, record, False
+
+    def _store(self, key, st, loaded):
+        """把 _load 的结果写入缓存"""
+        digest, complete, record, unchanged = loaded
+        if unchanged:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        self.entries[key] = {
+            "mtime": st.st_mtime_ns,
+            "size": st.st_size,
+            "hash": digest,
+            "partial": not complete,
+            "record": record,
+        }
+        self.dirty = True
+        return record
+
+    def get(self, path, st=None, prefix=False):
+        """返回文件的解析记录，仅在文件发生变化时重新读取和解析
+
+        prefix 为 True 时只读取文件前缀（front matter 和预览所需部分），
+        文件没有读完时记录中只有 PREFIX_FIELDS 中的字段。
+        """
+        key = str(path).replace(os.sep, "/")
+        if st is None:
+            st = os.stat(path)
+
+        record = self.lookup(key, st, prefix)
+        if record is not None:
+            return record
+        return self._store(key, st, self._load(key, st, prefix))
+
+    def get_many(self, paths, prefix=False, workers=None, stats=None):
+        """批量获取解析记录，需要重新读取的文件分发到线程池并发处理
+
+        stats 为与 paths 对应的已有 stat 结果（如扫描时的 DirEntry.stat()），
+        为 None 的位置重新 stat。返回值与 paths 顺序一致；读取失败的文件对应位置为异常对象。
+        """
+        keys = [str(path).replace(os.sep, "/") for path in paths]
+        results = [None] * len(keys)
+        pending = []
+
+        for i, key in enumerate(keys):
+            st = stats[i] if stats is not None else None
+            try:
+                if st is None:
+                    st = os.stat(key)
+            except OSError as e:
+                results[i] = e
+                continue
+            record = self.lookup(key, st, prefix)
+            if record is not None:
+                results[i] = record
+            else:
+                pending.append((i, key, st))
+
+        def load(item):
+            i, key, st = item
+            try:
+                return self._load(key, st, prefix)
+            except (OSError, UnicodeDecodeError) as e:
+                return e
+
+        if len(pending) > 1 and workers != 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                loaded = list(executor.map(load, pending))
+        else:
+            loaded = [load(item) for item in pending]
+
+        # 在主线程中按输入顺序写回缓存，结果与并发调度无关
+        for (i, key, st), result in zip(pending, loaded):
+            if isinstance(result, Exception):
+                results[i] = result
+            else:
+                results[i] = self._store(key, st, result)
+        return results
+
+    def prune(self, seen=()):
+        """删除已不存在的文件的缓存条目，seen 中的路径本次已确认存在"""
+        stale = [key for key in self.entries
+                 if key not in seen and not os.path.exists(key)]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
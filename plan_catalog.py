@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划目录的 SQLite 索引（可选）
+把计划、各级标题、任务和全文搜索词项（FTS5）保存在本地 .plans.db 中，
+按 路径 + mtime + 大小 增量同步，只重新解析有变化的文件。
+存在索引文件时，完整构建和增量更新（update_nav）会顺带同步；
+查询直接走 SQL 索引，不需要遍历目录，也可以从索引导出 nav-data.json
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+from plan_model import PlanEntry, DateIndex, date_ordinal, to_ordinal, date_parts
+from plan_parser import TASK_STATES, parse_text, tokenize, plan_text
+from plan_scanner import ScannedPlan, scan_plans, classify_path
+from nav_builder import (DAILY_PLANS_DIR, NAV_JSON_FILE, compact_nav_data, count_plans,
+                         write_nav_json, nav_lock)
+
+CATALOG_FILE = ".plans.db"
+CATALOG_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE plans (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,             -- YYYY-MM-DD
+    layout TEXT NOT NULL,           -- day / dated（见 plan_scanner）
+    mtime INTEGER NOT NULL,         -- st_mtime_ns
+    size INTEGER NOT NULL,
+    title TEXT,
+    preview TEXT,
+    tags TEXT NOT NULL DEFAULT ''   -- 空格分隔
+);
+CREATE INDEX plans_date ON plans(date);
+CREATE TABLE sections (
+    plan_id INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (plan_id, position)
+) WITHOUT ROWID;
+CREATE TABLE tasks (
+    plan_id INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    state TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (plan_id, position)
+) WITHOUT ROWID;
+CREATE INDEX tasks_state ON tasks(state, section);
+"""
+
+# 词项与 search_index 相同（中文 bigram），以空格分隔后交给 FTS5 的 unicode61 分词器
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE plan_fts USING fts5(terms)"
+
+
+class PlanCatalog:
+    """计划目录的 SQLite 索引
+
+    plans 的 id 同时是 plan_fts 的 rowid；sections 和 tasks 随计划删除级联删除。
+    当前 SQLite 不支持 FTS5 时其他表照常可用，只是不能全文搜索。
+    """
+
+    def __init__(self, db_file=CATALOG_FILE):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.updated = 0
+        self.removed = 0
+        self._init_schema()
+
+    def _init_schema(self):
+        """创建表结构，版本不符时丢弃旧表重建"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_SCHEMA_VERSION:
+            with self.conn:
+                for (name,) in self.conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'table'"
+                        " AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'plan_fts_%'").fetchall():
+                    self.conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+                self.conn.executescript(_SCHEMA)
+                try:
+                    self.conn.execute(_FTS_SCHEMA)
+                except sqlite3.OperationalError:
+                    print("⚠️  当前 SQLite 不支持 FTS5，索引中不包含全文搜索")
+                self.conn.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+
+        self.has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'plan_fts'").fetchone() is not None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def base_dir(self):
+        """最近一次同步的计划目录"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'base'").fetchone()
+        return row[0] if row else DAILY_PLANS_DIR
+
+    def _states(self):
+        """已索引文件的 {路径: (mtime, 大小)}"""
+        return {row[0]: (row[1], row[2])
+                for row in self.conn.execute("SELECT path, mtime, size FROM plans")}
+
+    def _upsert(self, plan, ordinal, st):
+        """读取并完整解析文件，替换该路径原有的全部记录"""
+        with open(plan.path, "r", encoding="utf-8") as f:
+            content = f.read()
+        record, _ = parse_text(content)
+
+        self._delete(plan.path)
+        cursor = self.conn.execute(
+            "INSERT INTO plans (path, date, layout, mtime, size, title, preview, tags)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (plan.path, "-".join(date_parts(ordinal)), plan.layout, st.st_mtime_ns, st.st_size,
+             record["title"], record["preview"], " ".join(record["tags"])))
+        plan_id = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO sections (plan_id, position, level, text) VALUES (?, ?, ?, ?)",
+            [(plan_id, i, level, text) for i, (level, text) in enumerate(record["headings"])])
+        self.conn.executemany(
+            "INSERT INTO tasks (plan_id, position, section, state, text) VALUES (?, ?, ?, ?, ?)",
+            [(plan_id, i, task["section"], task["state"], task["text"])
+             for i, task in enumerate(record["tasks"])])
+        if self.has_fts:
+            self.conn.execute("INSERT INTO plan_fts (rowid, terms) VALUES (?, ?)",
+                              (plan_id, " ".join(tokenize(plan_text(content)))))
+        self.updated += 1
+
+    def _delete(self, path):
+        row = self.conn.execute("SELECT id FROM plans WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return False
+        if self.has_fts:
+            self.conn.execute("DELETE FROM plan_fts WHERE rowid = ?", (row[0],))
+        self.conn.execute("DELETE FROM plans WHERE id = ?", (row[0],))
+        return True
+
+    def _update(self, plan, known):
+        """stat 未变化时跳过，日期无效或读取失败时移除"""
+        ordinal = date_ordinal(plan.date)
+        if ordinal is None:
+            self.removed += self._delete(plan.path)
+            return
+        try:
+            st = plan.stat or os.stat(plan.path)
+            if known.get(plan.path) != (st.st_mtime_ns, st.st_size):
+                self._upsert(plan, ordinal, st)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"读取文件 {plan.path} 时出错: {e}")
+            self.removed += self._delete(plan.path)
+
+    def sync(self, base_dir=DAILY_PLANS_DIR, plans=None):
+        """与整个计划目录同步，返回 (更新数, 删除数)
+
+        plans 为已有的扫描结果（ScannedPlan 序列，stat 可以为 None），
+        为 None 时用 plan_scanner 遍历目录。
+        """
+        if plans is None:
+            plans = scan_plans(base_dir)
+        self.updated = self.removed = 0
+        with self.conn:
+            known = self._states()
+            seen = set()
+            for plan in plans:
+                seen.add(plan.path)
+                self._update(plan, known)
+            for path in known.keys() - seen:
+                self.removed += self._delete(path)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('base', ?)",
+                              (base_dir,))
+        return self.updated, self.removed
+
+    def sync_entries(self, entries, base_dir=DAILY_PLANS_DIR):
+        """与 build_model 的结果同步（不再遍历目录）"""
+        return self.sync(base_dir, (ScannedPlan(entry.path, entry.date, entry.layout, None)
+                                    for entry in entries))
+
+    def update_files(self, paths, base_dir=DAILY_PLANS_DIR):
+        """只同步 paths 中的文件（刚写入或删除的计划），返回 (更新数, 删除数)"""
+        self.updated = self.removed = 0
+        with self.conn:
+            for path in paths:
+                path = os.path.normpath(path).replace(os.sep, "/")
+                found = classify_path(path, base_dir)
+                if found is None:
+                    continue
+                if os.path.exists(path):
+                    self._update(ScannedPlan(path, found[0], found[1], None),
+                                 {row[0]: (row[1], row[2]) for row in self.conn.execute(
+                                     "SELECT path, mtime, size FROM plans WHERE path = ?",
+                                     (path,))})
+                else:
+                    self.removed += self._delete(path)
+        return self.updated, self.removed
+
+    # 查询
+    def plans(self, start=None, end=None, limit=None):
+        """日期在 start 到 end（含）之间的计划，按日期和路径排序"""
+        sql = "SELECT * FROM plans WHERE date BETWEEN ? AND ? ORDER BY date, path"
+        params = [_iso(start) if start is not None else "",
+                  _iso(end) if end is not None else "9999-99-99"]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+    def latest(self, n):
+        """最近的 n 个计划，新的在前"""
+        return self.conn.execute(
+            "SELECT * FROM plans ORDER BY date DESC, path LIMIT ?", (n,)).fetchall()
+
+    def plan(self, day):
+        """某一天的计划及其标题和任务：[(计划, 标题列表, 任务列表), ...]"""
+        result = []
+        for plan in self.conn.execute("SELECT * FROM plans WHERE date = ? ORDER BY path",
+                                      (_iso(day),)).fetchall():
+            sections = self.conn.execute(
+                "SELECT level, text FROM sections WHERE plan_id = ? ORDER BY position",
+                (plan["id"],)).fetchall()
+            tasks = self.conn.execute(
+                "SELECT section, state, text FROM tasks WHERE plan_id = ? ORDER BY position",
+                (plan["id"],)).fetchall()
+            result.append((plan, sections, tasks))
+        return result
+
+    def tasks(self, states=None, section=None, start=None, end=None, limit=None):
+        """按状态、分类和日期筛选任务，返回 (日期, 路径, 分类, 状态, 内容)"""
+        sql = ("SELECT plans.date, plans.path, tasks.section, tasks.state, tasks.text"
+               " FROM tasks JOIN plans ON plans.id = tasks.plan_id WHERE 1")
+        params = []
+        if states:
+            sql += f" AND tasks.state IN ({', '.join('?' * len(states))})"
+            params.extend(states)
+        if section:
+            sql += " AND tasks.section = ?"
+            params.append(section)
+        if start is not None:
+            sql += " AND plans.date >= ?"
+            params.append(_iso(start))
+        if end is not None:
+            sql += " AND plans.date <= ?"
+            params.append(_iso(end))
+        sql += " ORDER BY plans.date, plans.path, tasks.position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+    def search(self, query, limit=20):
+        """全文搜索，所有词项都要出现，按 bm25 相关度、日期倒序排列"""
+        if not self.has_fts:
+            raise RuntimeError("当前索引不支持全文搜索（SQLite 缺少 FTS5）")
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        match = " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        return self.conn.execute(
+            "SELECT plans.date, plans.path, plans.title, bm25(plan_fts) AS rank"
+            " FROM plan_fts JOIN plans ON plans.id = plan_fts.rowid"
+            " WHERE plan_fts MATCH ? ORDER BY rank, plans.date DESC LIMIT ?",
+            (match, limit)).fetchall()
+
+    def counts(self):
+        """计划数和各状态的任务数"""
+        plans = self.conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+        tasks = dict(self.conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state"))
+        return plans, tasks
+
+    def date_index(self):
+        """由索引构建 DateIndex，内容与 build_model 的结果相同"""
+        base_dir = self.base_dir
+        entries = []
+        for row in self.conn.execute("SELECT path, date, layout, title, preview FROM plans"):
+            entry = PlanEntry.create(row["path"], row["date"].split("-"), row["layout"], base_dir)
+            entry.title, entry.preview = row["title"], row["preview"]
+            entries.append(entry)
+        return DateIndex(entries)
+
+    def export_nav_json(self, output_file=NAV_JSON_FILE, pretty=False):
+        """从索引生成 nav-data.json（不读取计划目录），返回计划数量统计"""
+        nav_data = compact_nav_data(self.date_index(), self.base_dir)
+        write_nav_json(nav_data, output_file, pretty)
+        return count_plans(nav_data)
+
+
+def _iso(day):
+    """任意 to_ordinal 接受的日期 -> YYYY-MM-DD"""
+    return "-".join(date_parts(to_ordinal(day)))
+
+
+def catalog_exists(db_file=CATALOG_FILE):
+    return os.path.exists(db_file)
+
+
+def _print_plans(rows):
+    for row in rows:
+        print(f"  {row['date']}  {row['title'] or os.path.basename(row['path'])}  ({row['path']})")
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="查询计划目录的 SQLite 索引")
+    parser.add_argument("--db", default=CATALOG_FILE, help="索引文件")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--sync", action="store_true", help="查询前先与计划目录同步")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("sync", help="与计划目录同步")
+    commands.add_parser("info", help="显示计划和任务数量")
+
+    days = commands.add_parser("days", help="列出日期范围内的计划")
+    days.add_argument("--start", help="起始日期 YYYY-MM-DD")
+    days.add_argument("--end", help="结束日期 YYYY-MM-DD")
+    days.add_argument("--latest", type=int, help="只列出最近 N 个计划")
+
+    show = commands.add_parser("show", help="显示某一天的标题和任务")
+    show.add_argument("date", help="日期 YYYY-MM-DD")
+
+    tasks = commands.add_parser("tasks", help="按状态和分类列出任务")
+    tasks.add_argument("--state", action="append", choices=list(TASK_STATES),
+                       help="任务状态（[ ] 中的字符），可重复指定，默认未完成的状态")
+    tasks.add_argument("--section", help="任务分类，如 数学建模、英语")
+    tasks.add_argument("--start", help="起始日期 YYYY-MM-DD")
+    tasks.add_argument("--end", help="结束日期 YYYY-MM-DD")
+    tasks.add_argument("--limit", type=int, help="最多显示的任务数")
+
+    search = commands.add_parser("search", help="全文搜索")
+    search.add_argument("query", nargs="+", help="搜索关键词（中文至少两个字）")
+    search.add_argument("--limit", type=int, default=20, help="最多显示的结果数")
+
+    export = commands.add_parser("export", help="从索引生成 nav-data.json")
+    export.add_argument("--output", default=NAV_JSON_FILE, help="输出文件")
+    export.add_argument("--pretty", action="store_true", help="使用缩进格式")
+
+    args = parser.parse_args(argv)
+    command = args.command or "info"
+
+    with PlanCatalog(args.db) as catalog:
+        if args.sync or command == "sync":
+            start = time.perf_counter()
+            updated, removed = catalog.sync(args.base_dir)
+            print(f"🗄️  索引已同步：更新 {updated} 个，删除 {removed} 个"
+                  f"（{(time.perf_counter() - start) * 1000:.2f} ms）")
+
+        start = time.perf_counter()
+        try:
+            if command == "info":
+                plans, counts = catalog.counts()
+                print(f"🗄️  {args.db}：{plans} 个计划，{sum(counts.values())} 个任务")
+                for state, n in sorted(counts.items(), key=lambda item: -item[1]):
+                    print(f"  {TASK_STATES.get(state, state):<6} {n:5d}")
+            elif command == "days":
+                rows = (catalog.latest(args.latest) if args.latest
+                        else catalog.plans(args.start, args.end))
+                print(f"共 {len(rows)} 个计划:")
+                _print_plans(rows)
+            elif command == "show":
+                found = catalog.plan(args.date)
+                if not found:
+                    print(f"没有 {args.date} 的计划")
+                    return 1
+                for plan, sections, plan_tasks in found:
+                    print(f"📅 {plan['date']}  {plan['title'] or ''}  ({plan['path']})")
+                    for level, text in sections:
+                        print(f"  {'  ' * (level - 1)}{'#' * level} {text}")
+                    for section, state, text in plan_tasks:
+                        print(f"  [{state}] {section}：{text}")
+            elif command == "tasks":
+                states = args.state or [state for state in TASK_STATES if state not in "x!"]
+                rows = catalog.tasks(states, args.section, args.start, args.end, args.limit)
+                print(f"共 {len(rows)} 个任务:")
+                for date, path, section, state, text in rows:
+                    print(f"  {date}  [{state}] {section}：{text}")
+            elif command == "search":
+                query = " ".join(args.query)
+                rows = catalog.search(query, args.limit)
+                if not rows:
+                    print(f"没有找到包含 \"{query}\" 的计划")
+                    return 1
+                print(f"找到 {len(rows)} 个计划:")
+                _print_plans(rows)
+            elif command == "export":
+                with nav_lock():
+                    counts = catalog.export_nav_json(args.output, args.pretty)
+                print(f"📄 已从索引生成 {args.output}（{counts['plans']} 个计划）")
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ {e}")
+            return 1
+        if command != "sync":
+            print(f"⏱️ 查询耗时 {(time.perf_counter() - start) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
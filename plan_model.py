@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑的计划内存模型
+每个计划只保存日期序数、布局以及无法由日期推导出的路径、标题和预览，
+年月日字符串、标准路径等字段在访问时推导；保留 entry["path"]、entry["date"]
+这类字典式访问，兼容按字典使用条目的调用方。
+DateIndex 按日期序数排序，用二分查找回答日期范围、周、月和最近 N 个计划的查询
+"""
+
+import os
+import sys
+import bisect
+import calendar
+import functools
+from array import array
+from datetime import date as _date
+
+from plan_scanner import DayLayout, DatedLayout, classify_path
+
+DAY_LAYOUT = DayLayout.name        # YYYY/MM/DD.md
+DATED_LAYOUT = DatedLayout.name    # YYYY/MM-Month/YYYY-MM-DD.md
+
+_ENTRY_KEYS = ("path", "date", "layout", "record")
+
+
+def date_ordinal(date):
+    """("YYYY", "MM", "DD") -> 日期序数，日期无效时返回 None"""
+    try:
+        return _date(int(date[0]), int(date[1]), int(date[2])).toordinal()
+    except (ValueError, TypeError, IndexError):
+        return None
+
+
+def to_ordinal(value):
+    """把 date/datetime、"YYYY-MM-DD"、(年, 月, 日) 或序数转换为日期序数
+
+    无法识别时抛出 ValueError。
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, _date):   # datetime 是 date 的子类
+        return value.toordinal()
+    parts = value.split("-") if isinstance(value, str) else value
+    ordinal = date_ordinal(parts) if len(parts) == 3 else None
+    if ordinal is None:
+        raise ValueError(f"无效的日期: {value}")
+    return ordinal
+
+
+@functools.lru_cache(maxsize=4096)
+def date_parts(ordinal):
+    """日期序数 -> ("YYYY", "MM", "DD")，同一天共用一个元组"""
+    day = _date.fromordinal(ordinal)
+    return f"{day.year:04d}", f"{day.month:02d}", f"{day.day:02d}"
+
+
+def standard_path(base_dir, year, month, day):
+    """YYYY/MM/DD.md 布局下的标准路径"""
+    return f"{base_dir}/{year}/{month}/{day}.md"
+
+
+class PlanEntry:
+    """单个计划的紧凑记录
+
+    路径与标准路径相同时不保存；preview 为 None 表示文件未能读取
+    （读取出错或已删除），此时 record 为 None。
+    """
+
+    __slots__ = ("ordinal", "base", "layout", "_path", "title", "preview")
+
+    def __init__(self, ordinal, base, layout, path=None, title=None, preview=None):
+        self.ordinal = ordinal
+        self.base = sys.intern(base)
+        self.layout = layout
+        self._path = path
+        self.title = title
+        self.preview = preview
+
+    @classmethod
+    def create(cls, path, date, layout, base_dir):
+        """由扫描结果创建条目，日期无效时返回 None"""
+        ordinal = date_ordinal(date)
+        if ordinal is None:
+            return None
+
+        entry = cls(ordinal, base_dir, layout)
+        if layout != DAY_LAYOUT or path != entry.path:
+            entry._path = path
+        return entry
+
+    @classmethod
+    def from_path(cls, path, base_dir):
+        """由计划文件路径创建条目（按 plan_scanner 的布局规则），不是计划时返回 None"""
+        path = path.replace(os.sep, "/")
+        found = classify_path(path, base_dir)
+        return cls.create(path, *found, base_dir) if found else None
+
+    @property
+    def date(self):
+        return date_parts(self.ordinal)
+
+    @property
+    def iso_date(self):
+        return "-".join(date_parts(self.ordinal))
+
+    @property
+    def path(self):
+        if self._path is not None:
+            return self._path
+        return standard_path(self.base, *date_parts(self.ordinal))
+
+    @property
+    def standard(self):
+        """路径是否可以由日期推导"""
+        return self._path is None
+
+    @property
+    def loaded(self):
+        return self.preview is not None
+
+    @property
+    def record(self):
+        """解析记录中模型保存的字段，未能读取时为 None"""
+        if self.preview is None:
+            return None
+        return {"title": self.title, "preview": self.preview}
+
+    @record.setter
+    def record(self, record):
+        if record is None:
+            self.title = self.preview = None
+        else:
+            self.title = record.get("title") or None
+            self.preview = record.get("preview") or ""
+
+    def sort_key(self):
+        return self.ordinal, self.path
+
+    # 字典式访问，兼容原先的条目字典
+    def __getitem__(self, key):
+        if key not in _ENTRY_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key != "record":
+            raise KeyError(key)
+        self.record = value
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _ENTRY_KEYS else default
+
+    def __repr__(self):
+        return f"PlanEntry({self.iso_date}, {self.path!r}, {self.layout})"
+
+
+class DateIndex:
+    """按 (日期, 路径) 排序的计划索引
+
+    entries 与 ordinals（日期序数数组）一一对应，所有查询都先用 bisect
+    定位日期区间再切片，不需要遍历目录或全部条目。可以像列表一样迭代和取下标。
+    """
+
+    def __init__(self, entries=()):
+        self.entries = sorted(entries, key=PlanEntry.sort_key)
+        self.ordinals = array("l", [entry.ordinal for entry in self.entries])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, i):
+        return self.entries[i]
+
+    def _bounds(self, first, last):
+        """日期序数在 [first, last] 内的条目下标区间"""
+        return (bisect.bisect_left(self.ordinals, first),
+                bisect.bisect_right(self.ordinals, last))
+
+    def _find(self, path, ordinal):
+        lo, hi = self._bounds(ordinal, ordinal)
+        for i in range(lo, hi):
+            if self.entries[i].path == path:
+                return i
+        return None
+
+    def add(self, entry):
+        """添加条目，同一路径的旧条目被替换"""
+        self.remove(entry.path, entry.ordinal)
+        key = entry.sort_key()
+        lo, hi = self._bounds(entry.ordinal, entry.ordinal)
+        i = lo + bisect.bisect_left([e.path for e in self.entries[lo:hi]], key[1])
+        self.entries.insert(i, entry)
+        self.ordinals.insert(i, entry.ordinal)
+
+    def remove(self, path, ordinal):
+        """删除条目，返回是否存在"""
+        i = self._find(path, ordinal)
+        if i is None:
+            return False
+        del self.entries[i]
+        del self.ordinals[i]
+        return True
+
+    def range(self, start=None, end=None):
+        """start 到 end（含）之间的计划，省略的一端不设限"""
+        first = to_ordinal(start) if start is not None else 0
+        last = to_ordinal(end) if end is not None else sys.maxsize
+        lo, hi = self._bounds(first, last)
+        return self.entries[lo:hi]
+
+    def on(self, day):
+        """某一天的计划（两种布局可能同时存在）"""
+        return self.range(day, day)
+
+    def week(self, day):
+        """day 所在的周一到周日之间的计划"""
+        ordinal = to_ordinal(day)
+        monday = ordinal - (ordinal - 1) % 7   # 序数 1（0001-01-01）是星期一
+        return self.range(monday, monday + 6)
+
+    def month(self, year, month):
+        year, month = int(year), int(month)
+        last = calendar.monthrange(year, month)[1]
+        return self.range(_date(year, month, 1), _date(year, month, last))
+
+    def year(self, year):
+        year = int(year)
+        return self.range(_date(year, 1, 1), _date(year, 12, 31))
+
+    def latest(self, n, before=None):
+        """最近的 n 个计划（before 之前，含当天），新的在前"""
+        hi = (bisect.bisect_right(self.ordinals, to_ordinal(before))
+              if before is not None else len(self.ordinals))
+        return self.entries[max(0, hi - n):hi][::-1]
+
+    def months(self):
+        """按月分组迭代：((年, 月), 条目列表)，每组用一次二分查找定位"""
+        lo = 0
+        while lo < len(self.ordinals):
+            year, month, _ = date_parts(self.ordinals[lo])
+            next_month = (_date(int(year) + 1, 1, 1) if month == "12"
+                          else _date(int(year), int(month) + 1, 1))
+            hi = bisect.bisect_left(self.ordinals, next_month.toordinal(), lo)
+            yield (year, month), self.entries[lo:hi]
+            lo = hi
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划文件解析器
+逐行扫描一次 Markdown，同时得到 front matter、标题、各级标题、带状态的任务、标签和预览，
+调用方只需要部分字段时（如导航只要标题和预览），字段齐全后立即停止扫描
+"""
+
+import re
+from collections import Counter
+
+PREVIEW_LENGTH = 200
+
+# 计划模板中“任务状态说明”定义的状态
+TASK_STATES = {
+    " ": "未开始",
+    "x": "已完成",
+    "~": "部分完成",
+    "!": "已取消",
+    ">": "进行中",
+    "?": "需要帮助",
+}
+# 按所在标题归类任务，标题中不含这些关键词的任务归入 OTHER_SECTION
+TASK_SECTIONS = ("数学建模", "英语", "阅读", "生活安排")
+OTHER_SECTION = "其他"
+
+FIELDS = ("front_matter", "title", "headings", "tasks", "tags", "preview")
+PREFIX_FIELDS = ("front_matter", "title", "preview")   # 只需读取文件开头即可得到的字段
+_FULL_PASS_FIELDS = {"headings", "tasks", "tags"}       # 需要扫描全文的字段
+
+_MARKDOWN_MARK_RE = re.compile(r'[#*`\-\[\]]')
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*)')
+_TASK_RE = re.compile(r'^\s*[-*+] \[([ xX~!>?])\]\s*(.*)')
+_TAG_RE = re.compile(r'(?:^|\s)#([^\s#/\[\]()]+)')
+# 连续的中文字符或连续的字母数字（与 search-plans.js 中的 TOKEN_RE 一致）
+_TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[A-Za-z0-9]+')
+
+
+def _front_matter_item(line, front_matter):
+    """解析 front matter 中 key: value 形式的一行"""
+    if ":" not in line or line.startswith((" ", "\t", "#")):
+        return
+    key, value = line.split(":", 1)
+    front_matter[key.strip()] = value.strip().strip('"\'')
+
+
+def _front_matter_tags(value):
+    """front matter 中的 tags 支持 [a, b] 和 a, b 两种写法"""
+    return [tag.strip().strip('"\'') for tag in re.split(r'[,，\s]+', value.strip("[]"))
+            if tag.strip().strip('"\'')]
+
+
+def _task_section(headings):
+    """由外到内的标题栈中最近的一个包含分类关键词的标题决定任务分类"""
+    for _, text in reversed(headings):
+        for name in TASK_SECTIONS:
+            if name in text:
+                return name
+    return OTHER_SECTION
+
+
+class PlanParser:
+    """单遍扫描的计划解析器
+
+    feed() 逐行输入（行尾不含换行符），返回 False 表示请求的字段已经齐全，
+    调用方可以停止读取；finish() 返回解析记录，只包含请求的字段。
+    """
+
+    def __init__(self, fields=FIELDS):
+        self.fields = set(fields)
+        self.full_pass = bool(self.fields & _FULL_PASS_FIELDS)
+        self.want_preview = "preview" in self.fields
+
+        self.line_no = 0
+        self.in_front_matter = False
+        self.front_matter_lines = []
+        self.front_matter = {}
+        self.front_matter_done = False
+
+        self.heading_stack = []
+        self.headings = []
+        self.tasks = []
+        self.tags = []
+
+        self.preview_lines = []
+        self.preview_chars = 0
+        self.preview = None
+        self.satisfied = False
+
+    def feed(self, line):
+        """处理一行，返回是否还需要后续内容"""
+        self.line_no += 1
+        if self.line_no == 1 and line.startswith("---"):
+            self.in_front_matter = True
+            return True
+
+        if self.in_front_matter:
+            if line.startswith("---"):
+                self.in_front_matter = False
+                self.front_matter_done = True
+                for item in self.front_matter_lines:
+                    _front_matter_item(item, self.front_matter)
+                self.front_matter_lines = None
+                # 与原先的 ^---.*?--- 一致：结束标记之后的同一行内容属于正文
+                self._body_line(line[3:])
+            else:
+                self.front_matter_lines.append(line)
+            return not self._check_satisfied()
+
+        self.front_matter_done = True
+        self._body_line(line)
+        return not self._check_satisfied()
+
+    def _body_line(self, line):
+        if self.full_pass:
+            if line.startswith("#"):
+                match = _HEADING_RE.match(line)
+                if match:
+                    level = len(match.group(1))
+                    text = match.group(2).strip()
+                    self.heading_stack = [h for h in self.heading_stack if h[0] < level]
+                    self.heading_stack.append((level, text))
+                    self.headings.append([level, text])
+            else:
+                match = _TASK_RE.match(line)
+                if match:
+                    self.tasks.append({
+                        "state": match.group(1).lower(),
+                        "section": _task_section(self.heading_stack),
+                        "text": match.group(2).strip(),
+                    })
+            if "#" in line:
+                for tag in _TAG_RE.findall(line):
+                    if tag not in self.tags:
+                        self.tags.append(tag)
+
+        if self.want_preview and self.preview is None:
+            if self.preview_lines or line.strip():
+                self.preview_lines.append(line)
+                self.preview_chars += len(line) + 1
+                if self.preview_chars > PREVIEW_LENGTH:
+                    self._try_preview()
+
+    def _try_preview(self):
+        """正文已足够长时确定预览（结果与读完全文后再截断相同）"""
+        text = "\n".join(self.preview_lines).lstrip()
+        cleaned = _MARKDOWN_MARK_RE.sub('', text.rstrip())
+        if len(cleaned) > PREVIEW_LENGTH:
+            self.preview = _MARKDOWN_MARK_RE.sub('', text)[:PREVIEW_LENGTH] + "..."
+            self.preview_lines = None
+
+    def _check_satisfied(self):
+        if not self.full_pass and self.front_matter_done and not self.in_front_matter:
+            if not self.want_preview or self.preview is not None:
+                self.satisfied = True
+        return self.satisfied
+
+    def finish(self):
+        """结束解析，返回只包含请求字段的记录"""
+        if self.in_front_matter:
+            # front matter 没有结束标记：按普通正文处理
+            lines = ["---"] + self.front_matter_lines
+            self.in_front_matter = False
+            self.front_matter_lines = None
+            self.front_matter_done = True
+            for line in lines:
+                self._body_line(line)
+
+        if self.want_preview and self.preview is None:
+            preview = _MARKDOWN_MARK_RE.sub('', "\n".join(self.preview_lines or []).strip())
+            self.preview = preview[:PREVIEW_LENGTH] + "..." if len(preview) > PREVIEW_LENGTH else preview
+
+        tags = list(self.tags)
+        if "tags" in self.front_matter:
+            tags = [tag for tag in _front_matter_tags(self.front_matter["tags"])
+                    if tag not in tags] + tags
+
+        values = {
+            "front_matter": self.front_matter,
+            "title": self.front_matter.get("title") or None,
+            "headings": self.headings,
+            "tasks": self.tasks,
+            "tags": tags,
+            "preview": self.preview,
+        }
+        return {field: values[field] for field in FIELDS if field in self.fields}
+
+
+def parse_lines(lines, fields=FIELDS):
+    """解析行序列（可以是文件对象），字段齐全后不再读取剩余的行
+
+    返回 (记录, 是否提前结束)。
+    """
+    parser = PlanParser(fields)
+    for line in lines:
+        if not parser.feed(line.rstrip("\r\n")):
+            break
+    return parser.finish(), parser.satisfied
+
+
+def parse_text(content, fields=FIELDS):
+    """解析完整的文本，返回 (记录, 是否提前结束)"""
+    return parse_lines(_iter_lines(content), fields)
+
+
+def _iter_lines(content):
+    """逐行切分文本，不预先生成整个行列表"""
+    start = 0
+    while True:
+        end = content.find("\n", start)
+        if end == -1:
+            if start < len(content):
+                yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+def split_front_matter(content):
+    """返回 (front matter, 正文)"""
+    if content.startswith("---"):
+        end = content.find("\n---", 3)
+        if end != -1:
+            front_matter = {}
+            for line in _iter_lines(content[3:end]):
+                _front_matter_item(line, front_matter)
+            return front_matter, content[end + 4:]
+    return {}, content
+
+
+def plan_text(content):
+    """去掉 front matter，返回标题和正文（搜索索引的输入）"""
+    front_matter, body = split_front_matter(content)
+    return f"{front_matter.get('title', '')}\n{body}"
+
+
+def tokenize(text):
+    """切分文本：中文输出相邻两字（bigram），单个汉字输出该字；英文单词转为小写"""
+    for match in _TOKEN_RE.finditer(text):
+        run = match.group()
+        if run.isascii():
+            yield run.lower()
+        elif len(run) == 1:
+            yield run
+        else:
+            for i in range(len(run) - 1):
+                yield run[i:i + 2]
+
+
+def term_counts(content):
+    """计划全文的 {词项: 词频}，随完整解析记录一起缓存，搜索索引不再单独读取文件"""
+    return dict(Counter(tokenize(plan_text(content))))
+
+
+def task_counts(tasks):
+    """任务列表 -> {分类: {状态: 数量}}"""
+    counts = {}
+    for task in tasks:
+        section = counts.setdefault(task["section"], {})
+        section[task["state"]] = section.get(task["state"], 0) + 1
+    return counts
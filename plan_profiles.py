@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多用户批量生成的配置
+profiles.json 为学习小组中每个人列出站点目录、日期范围、课程表（及其日期窗口）、作息时间表和模板，
+defaults 中的字段作为各用户的默认值；文件中的相对路径相对于配置文件所在目录，
+未配置课程表和时间表时使用本仓库中的 curriculum.json 和 timetable.json
+"""
+
+import os
+import json
+from collections import namedtuple
+from datetime import timedelta
+
+from curriculum import CURRICULUM_FILE, load_curriculum, parse_date
+from plan_schedule import TIMETABLE_FILE, load_timetable
+from plan_writer import CONFLICT_POLICIES, IF_CHANGED, ASK
+from nav_builder import DAILY_PLANS_DIR, INDEX_HTML_FILE, BUILD_OUTPUTS, OPTIONAL_OUTPUTS
+
+PROFILES_FILE = "profiles.json"
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 站点目录中有 index.html 时还会更新其数据引用
+DEFAULT_NAV_OUTPUTS = ["json", "js"]
+
+_FIELDS = ("name", "site_dir", "base_dir", "start", "end", "curriculum", "curriculum_start",
+           "target_date", "timetable", "template", "conflict", "nav")
+
+
+class Profile(namedtuple("Profile", _FIELDS)):
+    """一个用户的生成配置
+
+    site_dir 为该用户的站点根目录（导航数据写在这里），计划写入 site_dir/base_dir；
+    curriculum_start、target_date 覆盖课程表文件中的日期窗口（为 None 时使用文件中的日期）；
+    template 为可选的外层模板，nav 为生成完成后构建的导航输出（空列表表示不构建）。
+    """
+
+    __slots__ = ()
+
+    @property
+    def plans_dir(self):
+        return os.path.join(self.site_dir, self.base_dir)
+
+    @property
+    def days(self):
+        return (self.end - self.start).days + 1
+
+
+def _resolve(root, path):
+    """配置中的路径相对于 root，未配置（空值）时返回 None"""
+    if not path:
+        return None
+    return path if os.path.isabs(path) else os.path.normpath(os.path.join(root, path))
+
+
+def _profile(config, root):
+    """由合并默认值后的配置创建 Profile，配置有误时抛出 ValueError"""
+    unknown = set(config) - set(_FIELDS)
+    if unknown:
+        raise ValueError(f"未知的字段: {', '.join(sorted(unknown))}")
+    for field in ("name", "site_dir"):
+        if not config.get(field):
+            raise ValueError(f"缺少 {field}")
+
+    name = config["name"]
+    site_dir = _resolve(root, config["site_dir"])
+    curriculum_file = (_resolve(root, config.get("curriculum"))
+                       or os.path.join(REPO_DIR, CURRICULUM_FILE))
+    curriculum_start = config.get("curriculum_start") or None
+    target_date = config.get("target_date") or None
+    curriculum = load_curriculum(curriculum_file, curriculum_start, target_date)
+
+    # 默认生成课程表覆盖的整个窗口（开始日期到目标日期前一天）
+    start = parse_date(config["start"]) if config.get("start") else curriculum.start_date
+    end = (parse_date(config["end"]) if config.get("end")
+           else curriculum.target_date - timedelta(days=1))
+    if start > end:
+        raise ValueError(f"{name} 的开始日期 {start:%Y-%m-%d} 晚于结束日期 {end:%Y-%m-%d}")
+
+    timetable_file = (_resolve(root, config.get("timetable"))
+                      or os.path.join(REPO_DIR, TIMETABLE_FILE))
+    load_timetable(timetable_file)   # 时间块重叠等错误在生成前报告
+
+    conflict = config.get("conflict") or IF_CHANGED
+    if conflict not in CONFLICT_POLICIES or conflict == ASK:
+        raise ValueError(f"{name} 的冲突策略无效: {conflict}")
+
+    nav = config.get("nav")
+    if nav is None:
+        nav = DEFAULT_NAV_OUTPUTS + (
+            ["html"] if os.path.exists(os.path.join(site_dir, INDEX_HTML_FILE)) else [])
+    invalid = set(nav) - set(BUILD_OUTPUTS + OPTIONAL_OUTPUTS)
+    if invalid:
+        raise ValueError(f"{name} 的导航输出无效: {', '.join(sorted(invalid))}")
+
+    return Profile(
+        name=name,
+        site_dir=site_dir,
+        base_dir=config.get("base_dir") or DAILY_PLANS_DIR,
+        start=start,
+        end=end,
+        curriculum=curriculum_file,
+        curriculum_start=curriculum_start,
+        target_date=target_date,
+        timetable=timetable_file,
+        template=_resolve(root, config.get("template")),
+        conflict=conflict,
+        nav=list(nav),
+    )
+
+
+def load_profiles(path=PROFILES_FILE, start=None, end=None):
+    """读取配置文件，返回 Profile 列表；start、end 不为 None 时覆盖所有用户的日期范围"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    root = os.path.dirname(os.path.abspath(path))
+    defaults = config.get("defaults", {})
+    profiles = []
+    for item in config["profiles"]:
+        merged = dict(defaults, **item)
+        if start is not None:
+            merged["start"] = start
+        if end is not None:
+            merged["end"] = end
+        try:
+            profiles.append(_profile(merged, root))
+        except (KeyError, ValueError, OSError) as e:
+            raise ValueError(f"{path} 中的用户 {item.get('name', len(profiles) + 1)} 配置有误: {e}")
+
+    names = [profile.name for profile in profiles]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"{path} 中的用户名重复: {', '.join(sorted(duplicates))}")
+    plans_dirs = [os.path.abspath(profile.plans_dir) for profile in profiles]
+    if len(set(plans_dirs)) != len(plans_dirs):
+        raise ValueError(f"{path} 中有多个用户使用同一个计划目录")
+    return profiles
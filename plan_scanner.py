@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划目录扫描
+基于 os.scandir 只遍历一次计划目录，由布局规则决定进入哪些目录、哪些文件是计划：
+YYYY/MM/DD.md（day）和生成器使用的 YYYY/MM-Month/YYYY-MM-DD.md（dated）。
+任何规则都不接受的目录（templates/ 等）不会被进入；文件的 stat 来自 DirEntry，
+读取缓存时不再重复 stat
+"""
+
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+_YEAR_RE = re.compile(r'^\d{4}$')
+_MONTH_DIR_RE = re.compile(r'^\d{2}(-[A-Za-z]+)?$')   # MM 或 MM-Month
+_DATED_FILENAME_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+# 扫描结果：path 使用 / 分隔，date 为 (年, 月, 日) 字符串，stat 读取失败时为 None
+ScannedPlan = namedtuple("ScannedPlan", ["path", "date", "layout", "stat"])
+
+
+class LayoutRule(ABC):
+    """计划布局规则
+
+    parts 为相对计划目录的路径各级名称。accepts_dir 决定是否进入目录，
+    match 返回计划文件的 (年, 月, 日)，不是该布局的计划时返回 None。
+    """
+
+    name = None
+
+    @abstractmethod
+    def accepts_dir(self, parts):
+        """是否进入 parts 对应的目录"""
+
+    @abstractmethod
+    def match(self, parts):
+        """计划文件的 (年, 月, 日)，不是该布局的计划时返回 None"""
+
+
+class DayLayout(LayoutRule):
+    """YYYY/MM/DD.md"""
+
+    name = "day"
+
+    def accepts_dir(self, parts):
+        if not _YEAR_RE.match(parts[0]):
+            return False
+        return len(parts) == 1 or (len(parts) == 2 and parts[1].isdigit() and len(parts[1]) <= 2)
+
+    def match(self, parts):
+        if len(parts) != 3 or not parts[2].endswith(".md") or not self.accepts_dir(parts[:2]):
+            return None
+        day = parts[2][:-3]
+        if day.isdigit() and len(day) <= 2:
+            return parts[0], parts[1], day
+        return None
+
+
+class DatedLayout(LayoutRule):
+    """YYYY/MM-Month/YYYY-MM-DD.md，也接受 YYYY/MM/YYYY-MM-DD.md"""
+
+    name = "dated"
+
+    def accepts_dir(self, parts):
+        if not _YEAR_RE.match(parts[0]):
+            return False
+        return len(parts) == 1 or (len(parts) == 2 and bool(_MONTH_DIR_RE.match(parts[1])))
+
+    def match(self, parts):
+        if len(parts) != 3 or not parts[2].endswith(".md") or not self.accepts_dir(parts[:2]):
+            return None
+        match = _DATED_FILENAME_RE.search(parts[2])
+        return match.groups() if match else None
+
+
+# 文件名中带日期的规则优先
+LAYOUTS = (DatedLayout(), DayLayout())
+
+
+def classify(parts, layouts=LAYOUTS):
+    """按布局规则识别文件，返回 (日期, 布局名)，不是计划时返回 None"""
+    for rule in layouts:
+        date = rule.match(parts)
+        if date:
+            return date, rule.name
+    return None
+
+
+def relative_parts(path, base_dir):
+    """path 相对 base_dir 的各级名称，不在 base_dir 下时返回 None"""
+    path = os.path.normpath(path).replace(os.sep, "/")
+    base = os.path.normpath(base_dir).replace(os.sep, "/")
+    if base == ".":
+        return tuple(path.split("/"))
+    if not path.startswith(base + "/"):
+        return None
+    return tuple(path[len(base) + 1:].split("/"))
+
+
+def classify_path(path, base_dir, layouts=LAYOUTS):
+    """识别单个路径（增量更新时使用），规则与 scan_plans 相同"""
+    parts = relative_parts(path, base_dir)
+    return classify(parts, layouts) if parts else None
+
+
+def scan_plans(base_dir, layouts=LAYOUTS):
+    """遍历计划目录，按路径顺序逐个产出 ScannedPlan
+
+    隐藏文件和目录被跳过，符号链接目录不会被进入（与 os.walk 默认行为一致）。
+    """
+    def scan(dir_path, parts):
+        try:
+            with os.scandir(dir_path) as it:
+                items = sorted(it, key=lambda item: item.name)
+        except OSError:
+            return
+
+        for item in items:
+            if item.name.startswith("."):
+                continue
+            child = parts + (item.name,)
+            path = f"{dir_path}/{item.name}"
+            if item.is_dir(follow_symlinks=False):
+                if any(rule.accepts_dir(child) for rule in layouts):
+                    yield from scan(path, child)
+                continue
+
+            found = classify(child, layouts) if item.name.endswith(".md") else None
+            if found:
+                try:
+                    st = item.stat()
+                except OSError:
+                    st = None
+                yield ScannedPlan(path, found[0], found[1], st)
+
+    root = base_dir.replace(os.sep, "/").rstrip("/") or "/"
+    return scan(root, ())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+作息时间表
+从数据文件加载各类日子（工作日、周末等）的时间块，加载时用区间索引检查重叠，
+并预先生成每类日子的时间段文本和时间表；任意日期通过星期和例外日期
+一次查表得到当天的安排，批量生成时不再重复计算
+"""
+
+import os
+import json
+import bisect
+from collections import namedtuple
+from datetime import datetime
+
+TIMETABLE_FILE = "timetable.json"
+
+# start、end 为当天的分钟数
+TimeBlock = namedtuple("TimeBlock", ["id", "label", "start", "end"])
+
+_loaded = {}
+
+
+def parse_time(value):
+    """"H:MM" -> 当天的分钟数，24:00 表示一天结束"""
+    try:
+        hours, minutes = value.split(":")
+        total = int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        raise ValueError(f"时间格式错误: {value!r}，请使用 H:MM 格式")
+    if not 0 <= int(minutes) < 60 or not 0 <= total <= 24 * 60:
+        raise ValueError(f"时间超出范围: {value!r}")
+    return total
+
+
+def format_time(minutes):
+    """分钟数 -> "H:MM"（与计划中的 9:00 - 12:00 写法一致）"""
+    return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+def format_duration(minutes):
+    """时长 -> "2小时"、"1.5小时" 或 "45分钟\""""
+    if minutes < 60 or minutes % 30:
+        return f"{minutes}分钟" if minutes < 60 else f"{minutes // 60}小时{minutes % 60}分钟"
+    hours = minutes / 60
+    return f"{hours:g}小时"
+
+
+class IntervalIndex:
+    """按开始时间排序的半开区间 [start, end) 索引
+
+    max_ends[i] 为前 i+1 个区间的最大结束时间，查询时先二分找到开始时间早于查询
+    结束时间的区间，再向前扫描到 max_ends 不再超过查询开始时间为止。
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals, key=lambda item: (item.start, item.end))
+        self.starts = [item.start for item in self.intervals]
+        self.max_ends = []
+        latest = None
+        for item in self.intervals:
+            latest = item.end if latest is None else max(latest, item.end)
+            self.max_ends.append(latest)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def overlapping(self, start, end):
+        """与 [start, end) 重叠的区间，按开始时间排序"""
+        i = bisect.bisect_left(self.starts, end) - 1
+        found = []
+        while i >= 0 and self.max_ends[i] > start:
+            if self.intervals[i].end > start:
+                found.append(self.intervals[i])
+            i -= 1
+        return found[::-1]
+
+    def conflicts(self):
+        """所有相互重叠的区间对"""
+        pairs = []
+        for i, item in enumerate(self.intervals):
+            for other in self.intervals[i + 1:bisect.bisect_left(self.starts, item.end)]:
+                pairs.append((item, other))
+        return pairs
+
+
+class DaySchedule:
+    """一类日子的时间块，时间段文本和时间表在创建时生成"""
+
+    def __init__(self, kind, blocks):
+        self.kind = kind
+        self.index = IntervalIndex(blocks)
+        self.blocks = {}
+        for block in self.index:
+            if block.end <= block.start:
+                raise ValueError(f"时间表 {kind} 中 {block.id} 的结束时间不晚于开始时间")
+            if block.id in self.blocks:
+                raise ValueError(f"时间表 {kind} 中 {block.id} 重复出现")
+            self.blocks[block.id] = block
+
+        conflicts = self.index.conflicts()
+        if conflicts:
+            raise ValueError(f"时间表 {kind} 中的时间块重叠: " + "；".join(
+                f"{a.label}（{self._span(a)}）与 {b.label}（{self._span(b)}）"
+                for a, b in conflicts))
+
+        self.spans = {block.id: self._span(block) for block in self.index}
+        self.durations = {block.id: format_duration(block.end - block.start)
+                          for block in self.index}
+        self.table = "\n".join(["| 时间 | 安排 |", "|------|------|"]
+                               + [f"| {self.spans[block.id]} | {block.label} |"
+                                  for block in self.index])
+
+    @staticmethod
+    def _span(block):
+        return f"{format_time(block.start)} - {format_time(block.end)}"
+
+    def _block(self, block_id):
+        if block_id not in self.blocks:
+            raise KeyError(f"时间表 {self.kind} 中没有 {block_id}")
+        return block_id
+
+    def span(self, block_id):
+        """时间段文本，如 "9:00 - 12:00\""""
+        return self.spans[self._block(block_id)]
+
+    def duration(self, block_id):
+        """时长文本，如 "3小时\""""
+        return self.durations[self._block(block_id)]
+
+    def at(self, minutes):
+        """该时刻正在进行的时间块，没有时返回 None"""
+        found = self.index.overlapping(minutes, minutes + 1)
+        return found[0] if found else None
+
+
+class Timetable:
+    """按星期和例外日期为每天选择一类时间表
+
+    weekdays 为周一到周日各自使用的时间表名称，overrides 把 YYYY-MM-DD 映射到
+    时间表名称（节假日、考试日等）。
+    """
+
+    def __init__(self, config):
+        self.name = config.get("name", "")
+        self.schedules = {
+            kind: DaySchedule(kind, [TimeBlock(block["id"], block.get("label", block["id"]),
+                                               parse_time(block["start"]), parse_time(block["end"]))
+                                     for block in blocks])
+            for kind, blocks in config["schedules"].items()
+        }
+
+        self.weekdays = [self._schedule(kind) for kind in config["weekdays"]]
+        if len(self.weekdays) != 7:
+            raise ValueError("weekdays 需要列出周一到周日共 7 项")
+        self.overrides = {
+            datetime.strptime(day, "%Y-%m-%d").toordinal(): self._schedule(kind)
+            for day, kind in config.get("overrides", {}).items()
+        }
+
+    def _schedule(self, kind):
+        if kind not in self.schedules:
+            raise ValueError(f"未定义的时间表: {kind}")
+        return self.schedules[kind]
+
+    def for_date(self, date):
+        """当天使用的 DaySchedule"""
+        return self.overrides.get(date.toordinal()) or self.weekdays[date.weekday()]
+
+
+def load_timetable(path=TIMETABLE_FILE):
+    """加载时间表，同一文件只解析一次"""
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _loaded:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        _loaded[key] = Timetable(config)
+    return _loaded[key]
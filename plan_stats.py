@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+任务完成情况统计
+逐个计划累加任务状态（[ ]、[x]、[~]、[!]、[>]、[?]），按天、周、月、年以及
+数学建模、英语、阅读、生活安排等分类汇总为 stats.json，供 stats.html 直接展示。
+任务数据来自解析缓存，未修改的文件不会被重新读取
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime
+
+from plan_cache import PlanCache
+from plan_model import date_parts
+from plan_parser import TASK_STATES, TASK_SECTIONS, OTHER_SECTION, task_counts
+from nav_builder import (DAILY_PLANS_DIR, build_model, files_by_day, dump_json, write_if_changed,
+                         nav_lock)
+
+STATS_FILE = "stats.json"
+STATS_SCHEMA_VERSION = 1
+
+PERIODS = ("years", "months", "weeks", "days")
+DONE_STATE = "x"
+
+
+def period_keys(date):
+    """一个日期所属的年、月、ISO 周和日的汇总键"""
+    year, month, day = date
+    iso_year, week, _ = datetime(int(year), int(month), int(day)).isocalendar()
+    return {
+        "years": year,
+        "months": f"{year}-{month}",
+        "weeks": f"{iso_year}-W{week:02d}",
+        "days": f"{year}-{month}-{day}",
+    }
+
+
+def _ratio(count, total):
+    return round(count / total, 4) if total else 0
+
+
+def _summarize_counts(counts):
+    """状态计数 -> 任务数、各状态计数和比例、完成率"""
+    total = sum(counts.values())
+    ordered = {state: counts[state] for state in TASK_STATES if counts.get(state)}
+    return {
+        "tasks": total,
+        "counts": ordered,
+        "ratios": {state: _ratio(n, total) for state, n in ordered.items()},
+        "completion": _ratio(counts.get(DONE_STATE, 0), total),
+    }
+
+
+class TaskStats:
+    """各时间粒度的任务状态累加器
+
+    每个汇总项内部只保存计划数和 {分类: {状态: 数量}}，
+    比例在输出时计算，因此可以按天加上或减去单个计划的贡献。
+    """
+
+    def __init__(self):
+        self.total = {"plans": 0, "sections": {}}
+        self.periods = {period: {} for period in PERIODS}
+
+    @staticmethod
+    def _apply(bucket, tasks, plans, sign):
+        bucket["plans"] += sign * plans
+        for section, counts in tasks.items():
+            target = bucket["sections"].setdefault(section, {})
+            for state, n in counts.items():
+                target[state] = target.get(state, 0) + sign * n
+                if not target[state]:
+                    del target[state]
+            if not target:
+                del bucket["sections"][section]
+
+    def add(self, date, tasks, plans=1, sign=1):
+        """把一个日期的任务计数加入（sign 为 -1 时减去）所有汇总项"""
+        self._apply(self.total, tasks, plans, sign)
+        for period, key in period_keys(date).items():
+            bucket = self.periods[period].setdefault(key, {"plans": 0, "sections": {}})
+            self._apply(bucket, tasks, plans, sign)
+            if bucket["plans"] <= 0:
+                del self.periods[period][key]
+
+    def day(self, key):
+        """返回某天的 (计划数, 任务计数)，没有记录时返回 None"""
+        bucket = self.periods["days"].get(key)
+        if not bucket:
+            return None
+        return bucket["plans"], {section: dict(counts) for section, counts in bucket["sections"].items()}
+
+    @staticmethod
+    def _summarize(bucket):
+        states = {}
+        for counts in bucket["sections"].values():
+            for state, n in counts.items():
+                states[state] = states.get(state, 0) + n
+
+        summary = {"plans": bucket["plans"], **_summarize_counts(states)}
+        sections = list(TASK_SECTIONS) + [OTHER_SECTION]
+        summary["sections"] = {section: _summarize_counts(bucket["sections"][section])
+                               for section in sections if section in bucket["sections"]}
+        return summary
+
+    def to_json(self):
+        data = {
+            "version": STATS_SCHEMA_VERSION,
+            "states": TASK_STATES,
+            "sections": list(TASK_SECTIONS) + [OTHER_SECTION],
+            "total": self._summarize(self.total),
+        }
+        for period in PERIODS:
+            buckets = self.periods[period]
+            data[period] = {key: self._summarize(buckets[key]) for key in sorted(buckets)}
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        """从 stats.json 恢复累加器，版本不符时返回 None"""
+        if not data or data.get("version") != STATS_SCHEMA_VERSION:
+            return None
+
+        def restore(summary):
+            return {"plans": summary["plans"],
+                    "sections": {section: dict(item["counts"])
+                                 for section, item in summary["sections"].items()}}
+
+        stats = cls()
+        stats.total = restore(data["total"])
+        for period in PERIODS:
+            stats.periods[period] = {key: restore(summary)
+                                     for key, summary in data[period].items()}
+        return stats
+
+
+def load_stats(stats_file=STATS_FILE):
+    """读取已有的统计数据，不存在或格式不符时返回 None"""
+    try:
+        with open(stats_file, "r", encoding="utf-8") as f:
+            return TaskStats.from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_stats(stats, stats_file=STATS_FILE, pretty=False):
+    """写入 stats.json，内容未变化时不重写"""
+    return write_if_changed(stats_file, dump_json(stats.to_json(), pretty))
+
+
+def build_stats(entries=None, base_dir=DAILY_PLANS_DIR, cache=None, stats_file=STATS_FILE,
+                pretty=False, workers=None):
+    """完整统计所有计划，entries 为 None 时重新扫描目录"""
+    cache = cache or PlanCache()
+    if entries is None:
+        entries = build_model(base_dir, cache, workers, prefix=False)
+
+    stats = TaskStats()
+    records = cache.get_many([entry["path"] for entry in entries], workers=workers)
+    for entry, record in zip(entries, records):
+        if isinstance(record, Exception):
+            print(f"读取文件 {entry['path']} 时出错: {record}")
+            continue
+        stats.add(entry["date"], task_counts(record["tasks"]))
+
+    write_stats(stats, stats_file, pretty)
+    return stats
+
+
+def update_stats(paths, base_dir=DAILY_PLANS_DIR, cache=None, stats_file=STATS_FILE,
+                 pretty=False):
+    """只重新统计 paths 所在日期，已有统计不可用时回退到完整统计"""
+    cache = cache or PlanCache()
+    stats = load_stats(stats_file)
+    if stats is None:
+        return build_stats(None, base_dir, cache, stats_file, pretty)
+
+    # 同一天可能同时存在两种布局的文件，这一天的全部文件重新统计
+    for ordinal, day_files in files_by_day(paths, base_dir, cache).items():
+        date = date_parts(ordinal)
+        old = stats.day("-".join(date))
+        if old:
+            stats.add(date, old[1], plans=old[0], sign=-1)
+        if not day_files:
+            continue
+        tasks = {}
+        for record in cache.get_many(day_files):
+            if isinstance(record, Exception):
+                continue
+            for section, counts in task_counts(record["tasks"]).items():
+                target = tasks.setdefault(section, {})
+                for state, n in counts.items():
+                    target[state] = target.get(state, 0) + n
+        stats.add(date, tasks, plans=len(day_files))
+
+    write_stats(stats, stats_file, pretty)
+    return stats
+
+
+def print_stats(stats):
+    """打印总体和各分类的完成情况"""
+    total = TaskStats._summarize(stats.total)
+    print(f"📊 共 {total['plans']} 个计划，{total['tasks']} 个任务，"
+          f"完成率 {total['completion']:.1%}")
+    for state, n in total["counts"].items():
+        print(f"  {TASK_STATES[state]:<6} {n:5d}  ({total['ratios'][state]:.1%})")
+    print("\n各分类:")
+    for section, summary in total["sections"].items():
+        print(f"  {section:<6} {summary['tasks']:5d} 个任务，完成率 {summary['completion']:.1%}")
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="统计计划中的任务完成情况，生成 stats.json")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--output", default=STATS_FILE, help="输出文件")
+    parser.add_argument("--workers", type=int, default=None, help="并发读取文件的线程数")
+    parser.add_argument("--pretty", action="store_true", help="JSON 输出使用缩进格式")
+    args = parser.parse_args(argv)
+
+    cache = PlanCache()
+    with nav_lock():
+        stats = build_stats(None, args.base_dir, cache, args.output, args.pretty, args.workers)
+    cache.save()
+    print_stats(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划模板编译与缓存
+模板只在首次使用或文件 mtime 变化时读取，并编译为 "文本片段 + 占位符槽位" 列表，
+渲染时一次遍历拼接结果，不再对整篇文档反复执行 str.replace
+"""
+
+import os
+import re
+
+
+class CompiledTemplate:
+    """编译后的模板
+
+    parts 中偶数下标为原样输出的文本，奇数下标为占位符槽位 (placeholder, occurrence)，
+    occurrence 表示该占位符在模板中第几次出现（从 0 开始），
+    counts 记录每个占位符的出现次数。
+    渲染结果与按 placeholders 的顺序对整篇文本依次 str.replace 相同。
+    """
+
+    def __init__(self, text, placeholders):
+        self.text = text
+        self.sequence = tuple(placeholders)
+
+        # 结果与按 placeholders 顺序依次 str.replace 相同：包含前面某个占位符的占位符
+        # 在依次替换时已被破坏，永远不会匹配（如 "2024" 之后的 "categories: [daily-plan, 2024]"）；
+        # 其余占位符较长的优先匹配，如 "YYYY-MM-DD HH:mm" 先于 "YYYY-MM-DD"
+        reachable = []
+        for placeholder in placeholders:
+            if placeholder not in reachable and not any(p in placeholder for p in reachable):
+                reachable.append(placeholder)
+        ordered = sorted(reachable, key=len, reverse=True)
+        self.placeholders = ordered
+        self.counts = {}
+
+        if not ordered:
+            self.parts = [text]
+            return
+
+        pattern = re.compile("|".join(re.escape(p) for p in ordered))
+        parts = []
+        occurrences = {}
+        last = 0
+        for match in pattern.finditer(text):
+            placeholder = match.group()
+            count = occurrences.get(placeholder, 0)
+            occurrences[placeholder] = count + 1
+            parts.append(text[last:match.start()])
+            parts.append((placeholder, count))
+            last = match.end()
+        parts.append(text[last:])
+        self.parts = parts
+        self.counts = occurrences
+
+    def render(self, values):
+        """一次遍历渲染模板
+
+        values 中的值为字符串时替换所有出现位置；为列表时按出现顺序依次替换，
+        超出列表长度的出现位置以及未提供值的占位符保持原样。
+        替换值中含有占位符时（如 2024 年的日期含 "2024"），依次替换会继续替换这些文本，
+        此时按顺序逐个 str.replace，保持相同的结果。
+        """
+        if self._rescans(values):
+            return self._replace_in_order(values)
+
+        out = []
+        append = out.append
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                append(part)
+                continue
+
+            placeholder, occurrence = part
+            value = values.get(placeholder)
+            if isinstance(value, (list, tuple)):
+                value = value[occurrence] if occurrence < len(value) else None
+            append(placeholder if value is None else value)
+        return "".join(out)
+
+    def _rescans(self, values):
+        """替换值中是否含有占位符"""
+        for value in values.values():
+            for item in value if isinstance(value, (list, tuple)) else (value,):
+                if item is not None and any(p in item for p in self.sequence):
+                    return True
+        return False
+
+    def _replace_in_order(self, values):
+        """按占位符顺序依次替换整篇文本，列表值每次替换第一处"""
+        content = self.text
+        for placeholder in self.sequence:
+            value = values.get(placeholder)
+            if isinstance(value, (list, tuple)):
+                for item in value:
+                    content = content.replace(placeholder, item, 1)
+            elif value is not None:
+                content = content.replace(placeholder, value)
+        return content
+
+
+def compile_template(text, placeholders):
+    """编译模板文本"""
+    return CompiledTemplate(text, placeholders)
+
+
+class TemplateStore:
+    """按文件缓存编译后的模板，文件 mtime 变化时自动重新加载"""
+
+    def __init__(self):
+        self._templates = {}
+        self.loads = 0
+
+    def get(self, path, placeholders):
+        """返回编译后的模板，文件不存在时抛出 FileNotFoundError"""
+        mtime = os.stat(path).st_mtime_ns
+        key = (os.path.abspath(path), tuple(placeholders))
+
+        cached = self._templates.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            template = compile_template(f.read(), placeholders)
+        self._templates[key] = (mtime, template)
+        self.loads += 1
+        return template
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+阶段耗时统计与性能分析
+各脚本共用的计时层：按阶段（walk、read、parse、render、serialize、write）累计耗时和处理数量，
+可输出 JSON 追踪文件和 cProfile 结果；安静模式下不再逐个文件输出进度
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+PHASES = ("walk", "read", "parse", "render", "serialize", "write")
+TRACE_VERSION = 1
+
+
+class Tracer:
+    """累计各阶段的调用次数、耗时和处理数量（线程安全）"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.quiet = False
+
+    def add(self, name, seconds, items=1):
+        """记录一次阶段耗时"""
+        with self.lock:
+            phase = self.phases.get(name)
+            if phase is None:
+                phase = self.phases[name] = {"calls": 0, "seconds": 0.0, "items": 0}
+            phase["calls"] += 1
+            phase["seconds"] += seconds
+            phase["items"] += items
+
+    @contextmanager
+    def phase(self, name, items=1):
+        """计时一个阶段"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, items)
+
+    def merge(self, phases):
+        """合并其他进程返回的阶段统计（见 snapshot）"""
+        with self.lock:
+            for name, other in phases.items():
+                phase = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0, "items": 0})
+                for key in phase:
+                    phase[key] += other[key]
+
+    def snapshot(self):
+        """当前的阶段统计副本，可以跨进程传递"""
+        with self.lock:
+            return {name: dict(phase) for name, phase in self.phases.items()}
+
+    def reset(self):
+        with self.lock:
+            self.phases = {}
+            self.started = time.perf_counter()
+
+    def log(self, message):
+        """逐个文件的进度输出，安静模式下丢弃"""
+        if not self.quiet:
+            print(message)
+
+    def report(self, script=None, argv=None):
+        """生成 JSON 追踪数据"""
+        ordered = sorted(self.snapshot().items(),
+                         key=lambda item: (PHASES.index(item[0]) if item[0] in PHASES else len(PHASES),
+                                           item[0]))
+        return {
+            "version": TRACE_VERSION,
+            "script": script,
+            "argv": argv,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "wall_seconds": time.perf_counter() - self.started,
+            "phases": dict(ordered),
+        }
+
+    def print_summary(self):
+        """打印各阶段耗时"""
+        report = self.report()
+        print(f"\n⏱️ 总耗时 {report['wall_seconds'] * 1000:.2f} ms")
+        for name, phase in report["phases"].items():
+            print(f"  {name:<12} {phase['seconds'] * 1000:10.2f} ms"
+                  f"  {phase['calls']:6d} 次  {phase['items']:6d} 项")
+
+
+# 进程内共享的计时器
+TRACE = Tracer()
+
+
+def phase(name, items=1):
+    """使用共享计时器计时一个阶段"""
+    return TRACE.phase(name, items)
+
+
+def log(message):
+    """使用共享计时器输出进度（安静模式下丢弃）"""
+    TRACE.log(message)
+
+
+def add_trace_arguments(parser):
+    """为 argparse 命令行添加 --trace、--profile 和 --quiet 选项"""
+    parser.add_argument("--trace", metavar="FILE",
+                        help="把各阶段耗时写入 JSON 文件（- 表示输出到终端）")
+    parser.add_argument("--profile", metavar="FILE", help="用 cProfile 运行并保存分析结果")
+    parser.add_argument("--quiet", action="store_true", help="不输出逐个文件的进度")
+    return parser
+
+
+def split_trace_options(argv):
+    """从不使用 argparse 的脚本参数中取出计时选项，返回 (选项, 其余参数)"""
+    options = {"trace": None, "profile": None, "quiet": False}
+    rest = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name = arg[2:].split("=", 1)[0] if arg.startswith("--") else None
+        if name == "quiet":
+            options["quiet"] = True
+        elif name in ("trace", "profile"):
+            if "=" in arg:
+                options[name] = arg.split("=", 1)[1]
+            elif i + 1 < len(argv):
+                i += 1
+                options[name] = argv[i]
+        else:
+            rest.append(arg)
+        i += 1
+    return options, rest
+
+
+def run_traced(func, trace=None, profile=None, quiet=False, script=None):
+    """在计时器（以及可选的 cProfile）下运行 func，结束后输出追踪结果"""
+    TRACE.reset()
+    TRACE.quiet = quiet
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        return func()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+            print(f"📈 性能分析结果已保存到 {profile}（python3 -m pstats {profile} 查看）")
+        if trace == "-":
+            TRACE.print_summary()
+        elif trace:
+            report = TRACE.report(script or os.path.basename(sys.argv[0]), sys.argv[1:])
+            with open(trace, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"⏱️ 阶段耗时已保存到 {trace}")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划文件写入
+按冲突策略写入生成的计划文件：内容与磁盘上完全一致的文件不会被重写，
+避免破坏基于 mtime 的缓存、Jekyll 增量构建以及无意义的 git 变更
+"""
+
+import os
+
+# 冲突策略：已存在的文件如何处理
+ASK = "ask"                # 内容不同时询问是否覆盖
+SKIP = "skip"              # 保留已存在的文件
+OVERWRITE = "overwrite"    # 总是重写
+IF_CHANGED = "if-changed"  # 内容不同时覆盖，相同时不动
+
+CONFLICT_POLICIES = (ASK, SKIP, OVERWRITE, IF_CHANGED)
+
+# 写入结果
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+
+STATUS_LABELS = {
+    CREATED: "新建",
+    UPDATED: "更新",
+    UNCHANGED: "未变化",
+    SKIPPED: "跳过",
+}
+
+
+def write_plan(path, content, policy=IF_CHANGED, ask=input):
+    """按冲突策略写入文件，返回写入结果"""
+    if policy not in CONFLICT_POLICIES:
+        raise ValueError(f"未知的冲突策略: {policy}")
+
+    if os.path.exists(path):
+        if policy == SKIP:
+            return SKIPPED
+
+        if policy != OVERWRITE:
+            # 按字节比较：换行符不同（如 CRLF）也算内容变化
+            with open(path, 'rb') as f:
+                if f.read() == content.encode('utf-8'):
+                    return UNCHANGED
+
+            if policy == ASK:
+                response = ask(f"文件 {os.path.basename(path)} 已存在，是否覆盖？(y/N): ")
+                if response.lower() != 'y':
+                    return SKIPPED
+        status = UPDATED
+    else:
+        status = CREATED
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    return status
+
+
+class WriteSummary:
+    """统计一次批量生成中各类写入结果"""
+
+    def __init__(self):
+        self.counts = {status: 0 for status in STATUS_LABELS}
+        self.written = []
+
+    def add(self, status, path):
+        """记录一个文件的写入结果"""
+        self.counts[status] += 1
+        if status in (CREATED, UPDATED):
+            self.written.append(path)
+
+    def report(self):
+        """生成汇总文本"""
+        return "，".join(f"{label} {self.counts[status]} 个"
+                        for status, label in STATUS_LABELS.items())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地预览服务器
+替代 python3 -m http.server：静态文件支持 ETag/If-None-Match、预压缩副本（.br/.gz）
+和热点文件的内存 LRU 缓存；在内存中维护daily-plans目录的计划索引，
+通过 /api/plans 按年份、月份、日期、所在周、日期范围或最近 N 个查询
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from nav_builder import (DAILY_PLANS_DIR, build_model, expand_day, nav_lock, one_per_day,
+                         patch_index)
+from nav_watch import RESCAN, open_watcher
+from plan_cache import PlanCache
+from plan_model import DateIndex, DAY_LAYOUT
+
+CACHE_MAX_BYTES = 32 * 1024 * 1024   # LRU 缓存的总大小上限
+CACHE_MAX_FILE = 2 * 1024 * 1024     # 超过该大小的文件不进入缓存
+
+# 文件名带内容哈希的数据文件（nav_builder.write_fingerprinted_nav）内容永不改变
+_FINGERPRINTED_RE = re.compile(r'\.[0-9a-f]{10}\.json$')
+
+# 预压缩副本的编码和文件后缀，按优先顺序排列
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header):
+    """解析 Accept-Encoding，返回 {编码: q 值}；未列出的编码使用 "*" 的 q 值（没有时为 0）"""
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def encoding_weight(weights, coding):
+    """某个编码的 q 值"""
+    return weights.get(coding, weights.get("*", 0.0))
+
+
+def etag_matches(header, etag):
+    """If-None-Match 是否命中 etag：逗号分隔的多个标签按弱比较（忽略 W/ 前缀），"*" 匹配任意"""
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag and tag == etag:
+            return True
+    return False
+
+
+def plan_item(entry):
+    """把紧凑条目展开为接口返回的计划信息"""
+    year, month, day = entry.date
+    item = expand_day(entry.base, year, month, day, {"path": entry.path, "title": entry.title})
+    item["date"] = entry.iso_date
+    item["preview"] = entry.preview or ""
+    return item
+
+
+class PlanIndex:
+    """计划目录的内存索引，目录变化时由后台线程刷新
+
+    只保存紧凑的 PlanEntry（DateIndex），查询时才展开为完整的计划信息。
+    """
+
+    def __init__(self, base_dir=DAILY_PLANS_DIR):
+        self.base_dir = base_dir
+        self.cache = PlanCache()
+        self.lock = threading.Lock()
+        self.dates = DateIndex()
+        self.refresh()
+
+    def refresh(self, paths=None):
+        """更新索引：paths 为 None 时重新扫描目录，否则只重新读取这些文件所在日期的计划
+
+        扫描和保存缓存都在 nav_lock 内进行，不会与同时运行的导航构建交错写入缓存文件。
+        同一天有多个文件时按 nav-data.json 的规则选择（优先 YYYY/MM/DD.md 布局）。
+        """
+        with nav_lock():
+            if paths is None:
+                dates = DateIndex(one_per_day(build_model(self.base_dir, self.cache), DAY_LAYOUT))
+            else:
+                # 在副本上修改，查询方拿到的索引不会再被修改
+                dates = patch_index(DateIndex(self.dates), paths, self.base_dir, self.cache,
+                                    DAY_LAYOUT)
+            self.cache.save()
+
+        with self.lock:
+            self.dates = dates
+
+    def watch(self, poll=False, interval=1.0):
+        """在后台线程中监听目录变化并刷新索引"""
+        def run():
+            watcher = open_watcher(self.base_dir, poll, interval)
+            while True:
+                changes = watcher.wait(None)
+                if changes or changes is RESCAN:
+                    # 刷新失败时保留旧索引，下次目录变化时重试，不让监听线程退出
+                    try:
+                        self.refresh(None if changes is RESCAN else sorted(changes))
+                    except Exception as e:
+                        print(f"⚠️ 刷新计划索引失败: {e}", file=sys.stderr)
+
+        threading.Thread(target=run, name="plan-index-watcher", daemon=True).start()
+
+    def query(self, year=None, month=None, date=None, start=None, end=None,
+              week=None, latest=None):
+        """按条件查询计划，返回按日期排序的列表（latest 为最近 N 个，新的在前）
+
+        日期参数格式为 YYYY-MM-DD，无效时抛出 ValueError。
+        """
+        with self.lock:
+            dates = self.dates
+
+        if date:
+            entries = dates.on(date)
+        elif week:
+            entries = dates.week(week)
+        elif year and month:
+            entries = dates.month(year, month)
+        elif year:
+            entries = dates.year(year)
+        elif latest:
+            entries = dates.latest(int(latest), end)
+        else:
+            entries = dates.range(start, end)
+        return [plan_item(entry) for entry in entries]
+
+
+class FileCache:
+    """按 (mtime, size) 校验的静态文件 LRU 缓存"""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.files = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path, st):
+        """返回文件内容，文件被修改后自动重新读取"""
+        key = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            cached = self.files.get(path)
+            if cached and cached[0] == key:
+                self.files.move_to_end(path)
+                return cached[1]
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) > CACHE_MAX_FILE:
+            return data
+
+        with self.lock:
+            old = self.files.pop(path, None)
+            if old:
+                self.size -= len(old[1])
+            self.files[path] = (key, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.files.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """静态文件 + /api/plans 查询接口"""
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        ".md": "text/markdown; charset=utf-8",
+        ".js": "text/javascript; charset=utf-8",
+        ".json": "application/json; charset=utf-8",
+    }
+
+    index = None
+    file_cache = None
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        url = urlsplit(self.path)
+        if url.path == "/api/plans":
+            self._serve_api(parse_qs(url.query), send_body)
+            return
+
+        path = self.translate_path(url.path)
+        if not os.path.isfile(path):
+            # 目录（index.html、目录列表）和 404 交给标准实现处理
+            if send_body:
+                super().do_GET()
+            else:
+                super().do_HEAD()
+            return
+        self._serve_file(path, send_body)
+
+    def _serve_api(self, params, send_body):
+        def param(name):
+            values = params.get(name)
+            return values[0] if values else None
+
+        try:
+            plans = self.index.query(
+                year=param("year"),
+                month=param("month"),
+                date=param("date"),
+                start=param("from"),
+                end=param("to"),
+                week=param("week"),
+                latest=param("latest"),
+            )
+        except ValueError as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, explain=str(e))
+            return
+        body = json.dumps({"count": len(plans), "plans": plans},
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _serve_file(self, path, send_body):
+        st = os.stat(path)
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+        # 客户端接受（q > 0）且有比原文件更新的预压缩副本时直接发送，q 值相同时优先 br
+        encoding = None
+        weights = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for candidate, suffix in sorted(PRECOMPRESSED,
+                                        key=lambda item: -encoding_weight(weights, item[0])):
+            if encoding_weight(weights, candidate) <= 0:
+                continue
+            try:
+                compressed = os.stat(path + suffix)
+            except OSError:
+                continue
+            if compressed.st_mtime_ns >= st.st_mtime_ns:
+                encoding = candidate
+                etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}-{candidate}"'
+                break
+
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body_path = path + (".br" if encoding == "br" else ".gz") if encoding else path
+        data = self.file_cache.get(body_path, os.stat(body_path))
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        if _FINGERPRINTED_RE.search(path):
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="每日计划系统本地预览服务器")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口")
+    parser.add_argument("--bind", default="", help="监听地址（默认所有地址）")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--poll", action="store_true", help="强制使用轮询监听目录变化")
+    args = parser.parse_args(argv)
+
+    PreviewHandler.index = PlanIndex(args.base_dir)
+    PreviewHandler.index.watch(args.poll)
+    PreviewHandler.file_cache = FileCache()
+
+    server = ThreadingHTTPServer((args.bind, args.port), PreviewHandler)
+    print(f"🌐 预览服务器已启动: http://localhost:{args.port}"
+          f"（已索引 {len(PreviewHandler.index.dates)} 个计划）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 服务器已停止")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
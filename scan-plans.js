@@ -3,12 +3,116 @@ class PlansScanner {
     constructor() {
         this.plansData = {};
         this.baseUrl = window.location.origin + window.location.pathname.replace(/\/[^\/]*$/, '');
+        this.manifest = null;
+        this.monthShards = {};
+    }
+
+    // 加载构建时生成的分片清单 nav/index.json，不存在时返回 false
+    async loadManifest() {
+        if (this.manifest !== null) {
+            return this.manifest;
+        }
+
+        try {
+            const response = await fetch('./nav/index.json');
+            this.manifest = response.ok ? await response.json() : false;
+        } catch (e) {
+            this.manifest = false;
+        }
+        return this.manifest;
+    }
+
+    // 加载单个月份的分片 nav/YYYY/MM.json，同一分片只请求一次
+    loadMonthShard(year, month) {
+        const key = `${year}/${month}`;
+        if (!this.monthShards[key]) {
+            this.monthShards[key] = fetch(`./nav/${year}/${month}.json`)
+                .then(response => response.ok ? response.json() : {})
+                .then(shard => shard.version
+                    ? PlansScanner.expandMonth(shard.base, shard.year, shard.month, shard.days, shard.extra || {})
+                    : shard)
+                .catch(() => ({}));
+        }
+        return this.monthShards[key];
+    }
+
+    // 展开紧凑格式（version 2）的导航数据，补全可由年月日推导的字段；旧格式原样返回
+    static expandNavData(data) {
+        if (!data || !data.version) {
+            return data;
+        }
+
+        const plansData = {};
+        for (const year of Object.keys(data.years)) {
+            plansData[year] = {};
+            for (const month of Object.keys(data.years[year])) {
+                plansData[year][month] = PlansScanner.expandMonth(
+                    data.base, year, month, data.years[year][month], data.extra || {});
+            }
+        }
+        return plansData;
+    }
+
+    // 由日期列表推导出一个月的完整条目（与 nav_builder.expand_day 一致）
+    static expandMonth(base, year, month, days, extra) {
+        const weekdays = ['星期日', '星期一', '星期二', '星期三', '星期四', '星期五', '星期六'];
+        const monthData = {};
+
+        for (const day of days) {
+            const info = extra[`${year}-${month}-${day}`] || {};
+            const date = new Date(parseInt(year), parseInt(month) - 1, parseInt(day));
+            const weekday = weekdays[date.getDay()];
+            const formattedDate = `${year}年${month}月${day}日`;
+            const filePath = info.path || `${base}/${year}/${month}/${day}.md`;
+
+            monthData[day] = {
+                title: info.title || `每日计划 - ${day}日`,
+                content: `点击查看 ${formattedDate} ${weekday} 的详细计划内容...`,
+                file_path: filePath,
+                full_path: `./${filePath}`,
+                filename: filePath.split('/').pop(),
+                day: day,
+                month: month,
+                year: year,
+                fullDate: `${year}-${month}-${day}T00:00:00`,
+                weekday: weekday,
+                formattedDate: formattedDate
+            };
+        }
+
+        return monthData;
+    }
+
+    // 根据分片清单加载全部月份，每个有计划的月份只发一次请求
+    async loadFromManifest(manifest) {
+        const plansData = {};
+        const requests = [];
+
+        for (const year of Object.keys(manifest.years)) {
+            plansData[year] = {};
+            for (const month of Object.keys(manifest.years[year])) {
+                requests.push(this.loadMonthShard(year, month).then(monthData => {
+                    plansData[year][month] = monthData;
+                }));
+            }
+        }
+
+        await Promise.all(requests);
+        return plansData;
     }
 
     // 扫描daily-plans目录
     async scanPlansDirectory() {
         console.log('开始扫描计划目录...');
         
+        // 优先使用构建时生成的分片清单，避免逐个探测文件
+        const manifest = await this.loadManifest();
+        if (manifest) {
+            const plansData = await this.loadFromManifest(manifest);
+            console.log('从分片清单加载完成:', plansData);
+            return plansData;
+        }
+        
         // 不依赖目录列表，直接检查已知的文件
         const plansData = {};
         
@@ -45,6 +149,13 @@ class PlansScanner {
 
     // 通过直接检查文件来扫描月份
     async scanMonthByFiles(year, month) {
+        // 有分片清单时直接加载该月分片
+        const manifest = await this.loadManifest();
+        if (manifest) {
+            const months = manifest.years[year] || {};
+            return month in months ? await this.loadMonthShard(year, month) : {};
+        }
+        
         const monthData = {};
         
         // 检查31天（最大天数）
@@ -0,0 +1,96 @@
+// 计划全文搜索模块：使用构建时生成的 search/ 索引，只加载查询用到的分片
+class PlanSearch {
+    constructor(indexUrl = './search') {
+        this.indexUrl = indexUrl;
+        this.manifest = null;
+        this.shards = {};
+    }
+
+    // 切分文本（与 search_index.tokenize 一致）：中文输出相邻两字，英文单词转为小写
+    static tokenize(text) {
+        const tokens = [];
+        const tokenRe = /[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[A-Za-z0-9]+/g;
+        for (const match of text.matchAll(tokenRe)) {
+            const run = match[0];
+            if (/^[A-Za-z0-9]+$/.test(run)) {
+                tokens.push(run.toLowerCase());
+            } else if (run.length === 1) {
+                tokens.push(run);
+            } else {
+                for (let i = 0; i < run.length - 1; i++) {
+                    tokens.push(run.slice(i, i + 2));
+                }
+            }
+        }
+        return tokens;
+    }
+
+    // 词项所属分片：首字符码位取模的哈希分片（与 search_index.hash_shard 一致）
+    hashShard(term) {
+        return (term.codePointAt(0) % this.manifest.shards).toString(16).padStart(2, '0');
+    }
+
+    // 加载文档列表 search/index.json
+    async loadManifest() {
+        if (!this.manifest) {
+            const response = await fetch(`${this.indexUrl}/index.json`);
+            if (!response.ok) {
+                throw new Error('搜索索引不存在，请先运行 python3 nav_builder.py');
+            }
+            this.manifest = await response.json();
+        }
+        return this.manifest;
+    }
+
+    // 加载单个分片，同一分片只请求一次
+    loadShard(key) {
+        if (!this.shards[key]) {
+            this.shards[key] = fetch(`${this.indexUrl}/${key}.json`)
+                .then(response => response.ok ? response.json() : { terms: {} })
+                .then(shard => shard.terms)
+                .catch(() => ({}));
+        }
+        return this.shards[key];
+    }
+
+    // 返回同时包含所有词项的计划，按匹配次数、日期倒序排列
+    async search(query, limit = 20) {
+        const manifest = await this.loadManifest();
+        const terms = [...new Set(PlanSearch.tokenize(query))];
+        if (terms.length === 0) {
+            return [];
+        }
+
+        const shards = await Promise.all(terms.map(term => this.loadShard(this.hashShard(term))));
+        let scores = null;
+        terms.forEach((term, i) => {
+            const postings = new Map(shards[i][term] || []);
+            if (scores === null) {
+                scores = postings;
+                return;
+            }
+            const merged = new Map();
+            for (const [docId, score] of scores) {
+                if (postings.has(docId)) {
+                    merged.set(docId, score + postings.get(docId));
+                }
+            }
+            scores = merged;
+        });
+
+        return [...scores]
+            .map(([docId, score]) => {
+                const [date, path, title] = manifest.docs[docId];
+                return { score, date, path, title };
+            })
+            .sort((a, b) => b.score - a.score || b.date.localeCompare(a.date))
+            .slice(0, limit);
+    }
+}
+
+// 导出搜索类
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = PlanSearch;
+} else {
+    window.PlanSearch = PlanSearch;
+}
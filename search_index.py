@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计划全文搜索索引
+中文按相邻两字（bigram）切分，英文和数字按单词切分，生成倒排索引。
+索引按词项首字符码位的哈希（取模）分成固定数量的分片写入 search/，浏览器只需加载查询用到的分片；
+词频取自 PlanCache 的完整解析记录，与任务统计共用一次读取，
+构建时只重新索引内容有变化的文件，并只重写受影响的分片
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from plan_cache import PlanCache
+from plan_parser import tokenize
+from nav_builder import (DAILY_PLANS_DIR, build_model, dump_json, atomic_write,
+                         write_if_changed, nav_lock)
+
+SEARCH_DIR = "search"
+SEARCH_MANIFEST_FILE = "index.json"
+SEARCH_STATE_FILE = ".search-state.json"
+SEARCH_SCHEMA_VERSION = 1
+SHARD_COUNT = 64
+
+
+def hash_shard(term):
+    """词项所属分片：首字符码位对 SHARD_COUNT 取模（哈希分片，不是按前缀分片）
+
+    同一首字符的词项总在同一分片，分片数固定，不随词表增长。
+    """
+    return f"{ord(term[0]) % SHARD_COUNT:02x}"
+
+
+class SearchIndex:
+    """可增量更新的倒排索引
+
+    search/index.json 保存文档列表 [日期, 路径, 标题]（下标即文档编号，删除的文档留空位），
+    search/XX.json 保存该分片内每个词项的倒排列表 [[文档编号, 词频], ...]。
+    .search-state.json 记录每个文件的 mtime、大小和词项，用于判断哪些文件需要重新索引，
+    以及删除旧的倒排记录。词频从 cache（PlanCache）的完整解析记录中读取。
+    """
+
+    def __init__(self, index_dir=SEARCH_DIR, state_file=SEARCH_STATE_FILE, cache=None):
+        self.index_dir = index_dir
+        self.state_file = state_file
+        self.cache = cache if cache is not None else PlanCache()
+        self.docs = []
+        self.files = {}
+        self.shards = {}
+        self.dirty = set()
+        self.loaded = False
+        self.updated = 0
+
+    def load(self):
+        """加载索引状态；状态与已生成的索引不一致时从空索引开始"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            with open(os.path.join(self.index_dir, SEARCH_MANIFEST_FILE), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return self
+
+        if (state.get("version") == SEARCH_SCHEMA_VERSION
+                and manifest.get("version") == SEARCH_SCHEMA_VERSION
+                and manifest.get("shards") == SHARD_COUNT
+                and state.get("docs") == manifest.get("docs")):
+            self.docs = manifest["docs"]
+            self.files = state["files"]
+            self.loaded = True
+        return self
+
+    def _shard(self, key):
+        """按需读取分片"""
+        if key not in self.shards:
+            terms = {}
+            if self.loaded:
+                try:
+                    with open(os.path.join(self.index_dir, f"{key}.json"), "r", encoding="utf-8") as f:
+                        terms = json.load(f)["terms"]
+                except (OSError, ValueError, KeyError):
+                    pass
+            self.shards[key] = terms
+        return self.shards[key]
+
+    def _drop(self, path):
+        """删除文件的全部倒排记录，返回其文档编号"""
+        info = self.files.pop(path, None)
+        if info is None:
+            return None
+
+        doc_id = info["id"]
+        for term in info["terms"]:
+            key = hash_shard(term)
+            terms = self._shard(key)
+            postings = [p for p in terms.get(term, ()) if p[0] != doc_id]
+            if postings:
+                terms[term] = postings
+            else:
+                terms.pop(term, None)
+            self.dirty.add(key)
+        return doc_id
+
+    def add(self, path, date, title, counts, st):
+        """添加或更新一个计划文件，counts 为 {词项: 词频}"""
+        doc_id = self._drop(path)
+        if doc_id is None:
+            doc_id = self.docs.index(None) if None in self.docs else len(self.docs)
+            if doc_id == len(self.docs):
+                self.docs.append(None)
+
+        for term, tf in counts.items():
+            key = hash_shard(term)
+            postings = self._shard(key).setdefault(term, [])
+            postings.append([doc_id, tf])
+            postings.sort()
+            self.dirty.add(key)
+
+        self.docs[doc_id] = ["-".join(date), path, title]
+        self.files[path] = {
+            "id": doc_id,
+            "mtime": st.st_mtime_ns,
+            "size": st.st_size,
+            "terms": sorted(counts),
+        }
+        self.updated += 1
+
+    def remove(self, path):
+        """从索引中移除一个计划文件"""
+        doc_id = self._drop(path)
+        if doc_id is None:
+            return
+        self.docs[doc_id] = None
+        while self.docs and self.docs[-1] is None:
+            self.docs.pop()
+        self.updated += 1
+
+    def _changed(self, path, st):
+        info = self.files.get(path)
+        return not (info and info["mtime"] == st.st_mtime_ns and info["size"] == st.st_size)
+
+    def update_file(self, path, date, title=None):
+        """文件未变化时跳过，已删除时移除，否则重新索引"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.remove(path)
+            return
+
+        if self._changed(path, st):
+            record = self.cache.get(path, st)
+            self.add(path, date, title, record["terms"], st)
+
+    def sync(self, entries):
+        """与完整的计划列表（build_model 的结果）同步，变化的文件经缓存批量读取"""
+        seen = set()
+        changed = []
+        for entry in entries:
+            path = entry["path"]
+            seen.add(path)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if self._changed(path, st):
+                changed.append((entry, st))
+
+        records = self.cache.get_many([entry["path"] for entry, _ in changed],
+                                      stats=[st for _, st in changed])
+        for (entry, st), record in zip(changed, records):
+            if isinstance(record, Exception):
+                print(f"读取文件 {entry['path']} 时出错: {record}")
+                continue
+            self.add(entry["path"], entry["date"], record.get("title"), record["terms"], st)
+        for path in [path for path in self.files if path not in seen]:
+            self.remove(path)
+
+    def save(self, pretty=False):
+        """只重写变化的分片，然后写入清单和状态文件，返回写入的分片数"""
+        written = 0
+        for key in sorted(self.dirty):
+            path = os.path.join(self.index_dir, f"{key}.json")
+            terms = self.shards[key]
+            if terms:
+                shard = {"version": SEARCH_SCHEMA_VERSION,
+                         "terms": {term: terms[term] for term in sorted(terms)}}
+                written += write_if_changed(path, dump_json(shard, pretty))
+            elif os.path.exists(path):
+                os.remove(path)
+                written += 1
+        self.dirty.clear()
+
+        manifest = {"version": SEARCH_SCHEMA_VERSION, "shards": SHARD_COUNT, "docs": self.docs}
+        write_if_changed(os.path.join(self.index_dir, SEARCH_MANIFEST_FILE), dump_json(manifest, pretty))
+        atomic_write(self.state_file, json.dumps(
+            {"version": SEARCH_SCHEMA_VERSION, "docs": self.docs, "files": self.files},
+            ensure_ascii=False, separators=(',', ':')))
+        self.loaded = True
+        return written
+
+
+def _clear_index_dir(index_dir):
+    """删除旧的分片文件，用于从空索引完整重建"""
+    if not os.path.isdir(index_dir):
+        return
+    for file_name in os.listdir(index_dir):
+        if file_name.endswith(".json"):
+            os.remove(os.path.join(index_dir, file_name))
+
+
+def build_search_index(entries=None, base_dir=DAILY_PLANS_DIR, cache=None,
+                       index_dir=SEARCH_DIR, pretty=False):
+    """与计划目录同步搜索索引，entries 为 None 时重新扫描目录"""
+    cache = cache or PlanCache()
+    if entries is None:
+        entries = build_model(base_dir, cache, prefix=False)
+
+    index = SearchIndex(index_dir, cache=cache).load()
+    if not index.loaded:
+        _clear_index_dir(index_dir)
+    index.sync(entries)
+    index.save(pretty)
+    return index
+
+
+def update_search_index(changes, base_dir=DAILY_PLANS_DIR, cache=None,
+                        index_dir=SEARCH_DIR, pretty=False):
+    """只更新 changes 中的文件，changes 为 (路径, 日期, 标题) 列表
+
+    已有索引不可用时回退到完整构建。
+    """
+    cache = cache or PlanCache()
+    index = SearchIndex(index_dir, cache=cache).load()
+    if not index.loaded:
+        return build_search_index(None, base_dir, cache, index_dir, pretty)
+
+    for path, date, title in changes:
+        index.update_file(path, date, title)
+    index.save(pretty)
+    return index
+
+
+class SearchReader:
+    """只读查询已生成的索引，按需加载分片"""
+
+    def __init__(self, index_dir=SEARCH_DIR):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, SEARCH_MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.docs = json.load(f)["docs"]
+        self.shards = {}
+
+    def postings(self, term):
+        key = hash_shard(term)
+        if key not in self.shards:
+            try:
+                with open(os.path.join(self.index_dir, f"{key}.json"), "r", encoding="utf-8") as f:
+                    self.shards[key] = json.load(f)["terms"]
+            except FileNotFoundError:
+                self.shards[key] = {}
+        return self.shards[key].get(term, [])
+
+    def search(self, query, limit=20):
+        """返回同时包含所有词项的文档，按词频之和、日期倒序排列"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        scores = None
+        for term in terms:
+            postings = dict(self.postings(term))
+            if scores is None:
+                scores = postings
+            else:
+                scores = {doc_id: score + postings[doc_id]
+                          for doc_id, score in scores.items() if doc_id in postings}
+            if not scores:
+                return []
+
+        results = [(score, *self.docs[doc_id]) for doc_id, score in scores.items()]
+        results.sort(key=lambda result: (result[0], result[1]), reverse=True)
+        return results[:limit]
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="搜索计划内容")
+    parser.add_argument("query", nargs="*", help="搜索关键词（中文至少两个字）")
+    parser.add_argument("--index-dir", default=SEARCH_DIR, help="索引目录")
+    parser.add_argument("--base-dir", default=DAILY_PLANS_DIR, help="计划目录")
+    parser.add_argument("--limit", type=int, default=20, help="最多显示的结果数")
+    parser.add_argument("--build", action="store_true", help="先更新索引再搜索")
+    args = parser.parse_args(argv)
+
+    if args.build or not os.path.exists(os.path.join(args.index_dir, SEARCH_MANIFEST_FILE)):
+        cache = PlanCache()
+        with nav_lock():
+            index = build_search_index(None, args.base_dir, cache, args.index_dir)
+        cache.save()
+        print(f"🔎 索引已更新（重新索引 {index.updated} 个文件，共 {sum(d is not None for d in index.docs)} 个计划）")
+
+    if not args.query:
+        return 0
+
+    query = " ".join(args.query)
+    results = SearchReader(args.index_dir).search(query, args.limit)
+    if not results:
+        print(f"没有找到包含 \"{query}\" 的计划")
+        return 1
+
+    print(f"找到 {len(results)} 个计划:")
+    for score, date, path, title in results:
+        print(f"  {date}  {title or os.path.basename(path)}  ({path}，匹配 {score})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
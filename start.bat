@@ -16,4 +16,4 @@ echo 🛑 按 Ctrl+C 停止服务器
 echo.
 
 REM 启动服务器
-python -m http.server 8000
+python preview_server.py --port 8000
@@ -10,7 +10,7 @@ echo ""
 PORT=8000
 if lsof -Pi :$PORT -sTCP:LISTEN -t >/dev/null ; then
     echo "⚠️  端口 $PORT 已被占用，正在停止..."
-    pkill -f "python3 -m http.server $PORT"
+    pkill -f "preview_server.py --port $PORT"
     sleep 2
 fi
 
@@ -21,4 +21,4 @@ echo "🛑 按 Ctrl+C 停止服务器"
 echo ""
 
 # 启动服务器
-python3 -m http.server $PORT
+python3 preview_server.py --port $PORT
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+仓库中提交的构建产物检查
+站点直接使用提交的导航数据、分片、搜索索引和统计，它们必须来自同一次对 daily-plans/ 的完整构建
+"""
+
+import os
+import sys
+import shutil
+import filecmp
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from nav_builder import build_all
+
+ARTIFACTS = ["nav-data.json", "nav-data.json.gz", "nav-data.js", "index.html", "stats.json"]
+ARTIFACT_DIRS = ["data", "nav", "search"]
+
+
+def list_files(root):
+    """root 下所有文件的相对路径"""
+    return sorted(os.path.relpath(os.path.join(dir_path, name), root)
+                  for dir_path, _, names in os.walk(root) for name in names)
+
+
+class CommittedArtifactsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="artifacts-test-")
+        shutil.copytree(os.path.join(REPO_DIR, "daily-plans"), os.path.join(self.root, "daily-plans"))
+        shutil.copy(os.path.join(REPO_DIR, "index.html"), self.root)
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def test_artifacts_match_fresh_build(self):
+        build_all()
+        for name in ARTIFACTS:
+            self.assertTrue(filecmp.cmp(name, os.path.join(REPO_DIR, name), shallow=False),
+                            f"{name} 与完整构建的结果不一致，请运行 python3 nav_builder.py 后提交")
+        for dir_name in ARTIFACT_DIRS:
+            committed = os.path.join(REPO_DIR, dir_name)
+            self.assertEqual(list_files(dir_name), list_files(committed), dir_name)
+            for name in list_files(dir_name):
+                self.assertTrue(filecmp.cmp(os.path.join(dir_name, name),
+                                            os.path.join(committed, name), shallow=False),
+                                f"{dir_name}/{name} 与完整构建的结果不一致")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+curriculum 的测试
+课程表展开后的每日内容与原先硬编码的备赛安排一致（倒计时使用实际天数）
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from curriculum import load_curriculum
+
+# 原先 get_math_modeling_content 按距离比赛的天数给出的学习内容（比赛日 2025-09-03）
+BASELINE_TOPICS = {
+    17: "学习数学建模绪论",
+    16: "学习数学建模绪论",
+    15: "学习解析方法与几何模型",
+    14: "学习微分方程与动力系统",
+    13: "学习函数极值与规划模型",
+    12: "学习复杂网络与图论模型",
+    11: "学习进化计算与群体智能",
+    10: "学习数据处理与拟合模型",
+    9: "学习统计建模与机器学习",
+    8: "学习优化算法与数值方法",
+    7: "学习建模实践与案例分析",
+    6: "学习竞赛技巧与总结",
+    5: "做模拟题练习",
+    4: "做模拟题练习",
+    3: "做模拟题练习",
+    2: "冲刺复习",
+    1: "冲刺复习",
+    0: "冲刺复习",
+}
+
+# 原先 get_math_modeling_details 中各内容对应的章节
+BASELINE_CHAPTERS = {
+    "学习数学建模绪论": "绪论：走进数学建模的大门",
+    "学习解析方法与几何模型": "第1章：解析方法与几何模型",
+    "学习微分方程与动力系统": "第2章：微分方程与动力系统",
+    "学习函数极值与规划模型": "第3章：函数极值与规划模型",
+    "学习复杂网络与图论模型": "第4章：复杂网络与图论模型",
+    "学习进化计算与群体智能": "第5章：进化计算与群体智能",
+    "学习数据处理与拟合模型": "第6章：数据处理与拟合模型",
+    "学习统计建模与机器学习": "第7章：统计建模与机器学习",
+    "学习优化算法与数值方法": "第8章：优化算法与数值方法",
+    "学习建模实践与案例分析": "第9章：建模实践与案例分析",
+    "学习竞赛技巧与总结": "第10章：竞赛技巧与总结",
+    "做模拟题练习": "模拟题练习",
+    "冲刺复习": "冲刺复习",
+}
+
+TARGET = datetime(2025, 9, 3)
+
+
+class CurriculumTest(unittest.TestCase):
+
+    def setUp(self):
+        self.curriculum = load_curriculum(os.path.join(REPO_DIR, "curriculum.json"))
+
+    def test_matches_baseline_schedule(self):
+        for days_left, topic in BASELINE_TOPICS.items():
+            date = TARGET - timedelta(days=days_left)
+            content, details = self.curriculum.resolve(date)
+            self.assertEqual(content, f"{topic}，距离比赛还有{days_left}天", date)
+            self.assertEqual(details["chapter"], BASELINE_CHAPTERS[topic], date)
+
+    def test_outside_window(self):
+        content, details = self.curriculum.resolve(TARGET - timedelta(days=18))
+        self.assertEqual(content, "复习巩固前面章节，距离比赛还有18天")
+        self.assertEqual(details["chapter"], "复习巩固")
+        self.assertEqual(self.curriculum.content(TARGET + timedelta(days=1)),
+                         "复习巩固前面章节，比赛已结束")
+
+    def test_date_overrides_shift_schedule(self):
+        curriculum = load_curriculum(os.path.join(REPO_DIR, "curriculum.json"),
+                                     "2026-03-01", "2026-03-18")
+        self.assertEqual(curriculum.content(datetime(2026, 3, 18)), "冲刺复习，距离比赛还有0天")
+        self.assertEqual(curriculum.content(datetime(2026, 3, 1)), "学习数学建模绪论，距离比赛还有17天")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+generate-daily-plan.py 的测试
+重新生成已有的每日计划时沿用文件中的生成时间，内容未变化时不重写也不询问
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from plan_writer import ASK, IF_CHANGED, UNCHANGED, UPDATED, WriteSummary
+from test_generate_daily_plans import load_script
+
+TEMPLATE = """# [日期] 计划
+
+日期：YYYY年MM月DD日 星期X
+
+## 任务
+
+- [ ] 复习
+
+---
+创建时间：YYYY-MM-DD HH:mm
+更新时间：YYYY-MM-DD HH:mm
+"""
+
+
+class DailyPlanTimestampTest(unittest.TestCase):
+
+    def setUp(self):
+        self.script = load_script("generate-daily-plan.py")
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="plan-test-")
+        os.chdir(self.root)
+        os.makedirs("daily-plans/templates")
+        with open("daily-plans/templates/daily-template.md", "w", encoding="utf-8") as f:
+            f.write(TEMPLATE)
+        self.date = datetime(2025, 8, 20)
+        self.path = "daily-plans/2025/08-August/2025-08-20.md"
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def generate(self, conflict):
+        generator = self.script.DailyPlanGenerator(conflict)
+        summary = WriteSummary()
+        generator.generate_daily_plan(self.date, summary=summary)
+        return summary
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_rerun_keeps_timestamps(self):
+        self.generate(IF_CHANGED)
+        content = self.read().replace(datetime.now().strftime("%Y-%m-%d"), "2020-01-01", 2)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+        for conflict in (IF_CHANGED, ASK):
+            summary = self.generate(conflict)
+            self.assertEqual(summary.counts[UNCHANGED], 1)
+            self.assertEqual(self.read(), content)
+
+    def test_template_change_keeps_timestamps(self):
+        self.generate(IF_CHANGED)
+        stamps = self.script.TIMESTAMP_PATTERN.findall(self.read())
+
+        with open("daily-plans/templates/daily-template.md", "a", encoding="utf-8") as f:
+            f.write("\n备注：\n")
+        os.utime("daily-plans/templates/daily-template.md", (0, 0))
+        summary = self.generate(IF_CHANGED)
+        self.assertEqual(summary.counts[UPDATED], 1)
+        self.assertEqual(self.script.TIMESTAMP_PATTERN.findall(self.read()), stamps)
+        self.assertIn("备注：", self.read())
+
+    def test_plan_index_scans_once(self):
+        generator = self.script.DailyPlanGenerator(IF_CHANGED)
+        self.assertEqual(len(generator.plan_index()), 0)
+
+        with mock.patch.object(self.script, "build_model") as build_model:
+            generator.generate_daily_plan(self.date)
+            generator.generate_daily_plan(datetime(2025, 8, 21))
+            index = generator.plan_index()
+        build_model.assert_not_called()
+        self.assertEqual([entry.iso_date for entry in index], ["2025-08-20", "2025-08-21"])
+        self.assertEqual([entry.iso_date for entry in index.week("2025-08-20")],
+                         ["2025-08-20", "2025-08-21"])
+
+
+if __name__ == "__main__":
+    unittest.main()
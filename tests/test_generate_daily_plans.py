@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+generate-daily-plans.py 的命令行测试
+在临时目录中生成计划，检查导航数据是否包含新写入的计划
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import importlib.util
+from datetime import datetime
+from unittest import mock
+from contextlib import redirect_stdout
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def load_script(file_name):
+    """导入文件名带连字符的脚本"""
+    spec = importlib.util.spec_from_file_location(
+        file_name[:-3].replace("-", "_"), os.path.join(REPO_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class GenerateDailyPlansTest(unittest.TestCase):
+
+    def setUp(self):
+        self.script = load_script("generate-daily-plans.py")
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="plans-test-")
+        shutil.copy(os.path.join(REPO_DIR, "index.html"), self.root)
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def generate(self, *argv):
+        args = ["--curriculum", os.path.join(REPO_DIR, "curriculum.json"),
+                "--timetable", os.path.join(REPO_DIR, "timetable.json"),
+                "--workers", "1", "--quiet", *argv]
+        with redirect_stdout(io.StringIO()):
+            return self.script.main(args)
+
+    def test_nav_uses_custom_base_dir(self):
+        # 第一次没有导航数据，完整构建；第二次增量更新
+        self.assertEqual(self.generate("--start", "2025-08-20", "--end", "2025-08-21",
+                                       "--base-dir", "other-plans"), 0)
+        self.assertEqual(self.generate("--start", "2025-08-22", "--end", "2025-08-22",
+                                       "--base-dir", "other-plans"), 0)
+
+        with open("nav-data.json", "r", encoding="utf-8") as f:
+            nav_data = json.load(f)
+        self.assertEqual(nav_data["base"], "other-plans")
+        self.assertEqual(nav_data["years"], {"2025": {"08": ["20", "21", "22"]}})
+
+        with open("nav-data.js", "r", encoding="utf-8") as f:
+            self.assertIn("other-plans/2025/08/22.md", f.read())
+
+    def test_parallel_matches_serial(self):
+        # 进程池按名称反序列化 render_chunk，需要能在 sys.modules 中找到脚本模块
+        sys.modules[self.script.__name__] = self.script
+        self.addCleanup(sys.modules.pop, self.script.__name__, None)
+
+        start, end = datetime(2025, 7, 20), datetime(2025, 9, 10)
+        for base_dir, workers in (("serial", 1), ("parallel", 3)):
+            with redirect_stdout(io.StringIO()):
+                summary = self.script.generate_range(
+                    start, end, base_dir, workers=workers, chunk_size=7,
+                    timetable_file=os.path.join(REPO_DIR, "timetable.json"),
+                    curriculum_file=os.path.join(REPO_DIR, "curriculum.json"))
+            self.assertEqual(summary.counts["created"], (end - start).days + 1)
+
+        serial = sorted(os.path.relpath(os.path.join(root, name), "serial")
+                        for root, _, files in os.walk("serial") for name in files)
+        parallel = sorted(os.path.relpath(os.path.join(root, name), "parallel")
+                          for root, _, files in os.walk("parallel") for name in files)
+        self.assertEqual(serial, parallel)
+        for path in serial:
+            with open(os.path.join("serial", path), "rb") as a, \
+                    open(os.path.join("parallel", path), "rb") as b:
+                self.assertEqual(a.read(), b.read(), path)
+
+    def test_profile_failure_is_reported(self):
+        profiles = {
+            "defaults": {"start": "2025-08-20", "end": "2025-08-22", "nav": ["json"]},
+            "profiles": [{"name": "alice", "site_dir": "alice"},
+                         {"name": "bob", "site_dir": "bob"}],
+        }
+        with open("profiles.json", "w", encoding="utf-8") as f:
+            json.dump(profiles, f)
+
+        build_nav = self.script.build_profile_nav
+
+        def fail_for_bob(task):
+            if task[0].endswith("bob"):
+                raise OSError("站点目录不可用")
+            return build_nav(task)
+
+        output = io.StringIO()
+        with mock.patch.object(self.script, "build_profile_nav", side_effect=fail_for_bob), \
+                redirect_stdout(output):
+            code = self.script.main(["--profiles", "profiles.json", "--workers", "1", "--quiet"])
+
+        self.assertEqual(code, 1)
+        self.assertIn("站点目录不可用", output.getvalue())
+        self.assertIn("1 个用户生成失败: bob", output.getvalue())
+        # 其他用户照常完成
+        self.assertTrue(os.path.exists(os.path.join("alice", "nav-data.json")))
+        self.assertTrue(os.path.exists(os.path.join("bob", "daily-plans", "2025", "08", "22.md")))
+        self.assertEqual(os.getcwd(), os.path.realpath(self.root))
+
+
+if __name__ == "__main__":
+    unittest.main()
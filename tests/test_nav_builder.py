@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+nav_builder 的测试
+增量更新与完整构建的导航数据一致
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from nav_builder import NAV_JSON_FILE, build_all, expand_nav_data, nav_lock, update_nav
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class NavBuilderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="nav-test-")
+        shutil.copy(os.path.join(REPO_DIR, "index.html"), self.root)
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def load_nav(self):
+        with open(NAV_JSON_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_update_from_other_base_dir(self):
+        write("daily-plans/2025/09/01.md", "# A\n")
+        write("other/2025/09/02.md", "# B\n")
+        build_all("daily-plans")
+        update_nav(["other/2025/09/02.md"], base_dir="other")
+
+        nav_data = self.load_nav()
+        self.assertEqual(nav_data["base"], "other")
+        paths = [plan["full_path"] for year in expand_nav_data(nav_data).values()
+                 for month in year.values() for plan in month.values()]
+        self.assertEqual([os.path.normpath(path) for path in paths], ["other/2025/09/02.md"])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+
+class NavLockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="lock-test-")
+        self.lock_file = os.path.join(self.root, ".nav.lock")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_reentrant_in_thread(self):
+        with nav_lock(self.lock_file):
+            with nav_lock(self.lock_file):
+                pass
+
+    def test_excludes_other_threads(self):
+        held = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def holder():
+            with nav_lock(self.lock_file):
+                held.set()
+                release.wait(5)
+                order.append("holder")
+
+        def waiter():
+            held.wait(5)
+            with nav_lock(self.lock_file):
+                order.append("waiter")
+
+        threads = [threading.Thread(target=holder), threading.Thread(target=waiter)]
+        for thread in threads:
+            thread.start()
+        held.wait(5)
+        threads[1].join(0.2)
+        self.assertEqual(order, [])
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, ["holder", "waiter"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑格式导航数据的测试
+nav-data.json 和 nav/ 按月分片展开后都与 nav_json_data 的结果相同，
+标准布局的计划与原先 generate-nav.py 逐个目录扫描得到的条目一致
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from nav_builder import (NAV_JSON_FILE, NAV_SHARD_DIR, NAV_MANIFEST_FILE, NAV_SCHEMA_VERSION,
+                         WEEKDAYS, build_all, build_model, compact_nav_data, expand_nav_data,
+                         nav_json_data, update_nav)
+from plan_cache import PlanCache
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def scan_day_layout(base_dir):
+    """原先 generate-nav.py 的扫描结果：只有 YYYY/MM/DD.md，标题和内容都由日期推导"""
+    plans_data = {}
+    for year in sorted(os.listdir(base_dir), reverse=True):
+        year_path = os.path.join(base_dir, year)
+        if not os.path.isdir(year_path) or not year.isdigit():
+            continue
+        plans_data[year] = {}
+        for month in sorted(os.listdir(year_path)):
+            month_path = os.path.join(year_path, month)
+            if not os.path.isdir(month_path) or not month.isdigit():
+                continue
+            plans_data[year][month] = {}
+            for file_name in os.listdir(month_path):
+                day = file_name[:-3]
+                if not file_name.endswith(".md") or not day.isdigit():
+                    continue
+                full_date = datetime(int(year), int(month), int(day))
+                weekday = WEEKDAYS[full_date.weekday()]
+                formatted_date = f"{year}年{month}月{day}日"
+                plans_data[year][month][day] = {
+                    "title": f"每日计划 - {day}日",
+                    "content": f"点击查看 {formatted_date} {weekday} 的详细计划内容...",
+                    "file_path": f"{base_dir}/{year}/{month}/{file_name}",
+                    "full_path": f"./{base_dir}/{year}/{month}/{file_name}",
+                    "filename": file_name,
+                    "day": day,
+                    "month": month,
+                    "year": year,
+                    "fullDate": full_date.isoformat(),
+                    "weekday": weekday,
+                    "formattedDate": formatted_date,
+                }
+    return plans_data
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_shards(shard_dir=NAV_SHARD_DIR):
+    """按清单读取全部月份分片，重新拼成 nav-data.json 的紧凑格式"""
+    manifest = load_json(os.path.join(shard_dir, NAV_MANIFEST_FILE))
+    data = {"version": manifest["version"], "base": None, "years": {}, "extra": {}}
+    for year, months in manifest["years"].items():
+        for month, count in months.items():
+            shard = load_json(os.path.join(shard_dir, year, f"{month}.json"))
+            assert (shard["year"], shard["month"], len(shard["days"])) == (year, month, count)
+            data["base"] = shard["base"]
+            data["years"].setdefault(year, {})[month] = shard["days"]
+            data["extra"].update(shard["extra"])
+    return data
+
+
+class NavDataRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="nav-data-test-")
+        shutil.copytree(os.path.join(REPO_DIR, "daily-plans"),
+                        os.path.join(self.root, "daily-plans"))
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def expected(self):
+        return nav_json_data(build_model("daily-plans", PlanCache()))
+
+    def assert_round_trip(self):
+        expected = self.expected()
+        nav_data = load_json(NAV_JSON_FILE)
+        self.assertEqual(nav_data["version"], NAV_SCHEMA_VERSION)
+        self.assertEqual(expand_nav_data(nav_data), expected)
+        shards = load_shards()
+        self.assertEqual(expand_nav_data(shards), expected)
+        self.assertEqual(shards["years"], nav_data["years"])
+        self.assertEqual(shards["extra"], nav_data["extra"])
+        return expected
+
+    def test_matches_directory_scan(self):
+        build_all("daily-plans", ["json", "shards"])
+        expected = self.assert_round_trip()
+        self.assertEqual(expected, scan_day_layout("daily-plans"))
+        self.assertEqual(load_json(NAV_JSON_FILE)["extra"], {})
+
+    def test_extra_fields(self):
+        # 自定义标题、只有带日期文件名的一天、两种布局并存的一天
+        write("daily-plans/2025/08/25.md", '---\ntitle: "期中复习"\n---\n\n# 复习\n')
+        write("daily-plans/2025/10-October/2025-10-05.md", "# 国庆\n")
+        write("daily-plans/2025/08-August/2025-08-20.md", '---\ntitle: "另一份"\n---\n')
+        build_all("daily-plans", ["json", "shards"])
+        expected = self.assert_round_trip()
+
+        self.assertEqual(expected["2025"]["08"]["25"]["title"], "期中复习")
+        self.assertEqual(expected["2025"]["10"]["05"]["file_path"],
+                         "daily-plans/2025/10-October/2025-10-05.md")
+        self.assertEqual(expected["2025"]["08"]["20"]["file_path"], "daily-plans/2025/08/20.md")
+        self.assertEqual(load_json(os.path.join(NAV_SHARD_DIR, "2025", "10.json"))["extra"],
+                         {"2025-10-05": {"path": "daily-plans/2025/10-October/2025-10-05.md"}})
+
+    def test_incremental_update(self):
+        shutil.copy(os.path.join(REPO_DIR, "index.html"), self.root)
+        build_all("daily-plans", ["json", "js", "shards"])
+
+        write("daily-plans/2025/11/01.md", '---\ntitle: "新月份"\n---\n')
+        os.remove("daily-plans/2025/09/01.md")
+        os.remove("daily-plans/2025/09/02.md")
+        update_nav(["daily-plans/2025/11/01.md", "daily-plans/2025/09/01.md",
+                    "daily-plans/2025/09/02.md"])
+
+        expected = self.assert_round_trip()
+        self.assertNotIn("09", expected["2025"])
+        self.assertFalse(os.path.exists(os.path.join(NAV_SHARD_DIR, "2025", "09.json")))
+        self.assertEqual(compact_nav_data(build_model("daily-plans", PlanCache()), "daily-plans"),
+                         load_json(NAV_JSON_FILE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+nav_stream 的测试
+流式构建与 build_all 输出一致，扫描出错时不留下临时文件
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import nav_stream
+from nav_builder import NAV_JSON_FILE, NAV_JS_FILE, build_all
+
+
+class StreamBuildTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="stream-test-")
+        os.chdir(self.root)
+        for path in ("daily-plans/2025/08/20.md", "daily-plans/2025/08/21.md",
+                     "daily-plans/2025/09-September/2025-09-01.md"):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# {os.path.basename(path)} 计划\n\n- [ ] 复习\n")
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_matches_build_all(self):
+        build_all(outputs=["json", "js"])
+        expected = self.read(NAV_JSON_FILE), self.read(NAV_JS_FILE)
+        os.remove(NAV_JSON_FILE)
+        os.remove(NAV_JS_FILE)
+
+        nav_stream.stream_build(outputs=["json", "js"])
+        self.assertEqual((self.read(NAV_JSON_FILE), self.read(NAV_JS_FILE)), expected)
+
+    def test_failed_scan_removes_temp_files(self):
+        with mock.patch.object(nav_stream, "iter_plans", self._failing_iter()):
+            with self.assertRaises(ValueError):
+                nav_stream.stream_build()
+
+        leftovers = [name for root, _, files in os.walk(".") for name in files
+                     if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+        self.assertFalse(os.path.exists(NAV_JSON_FILE))
+
+    def _failing_iter(self):
+        original = nav_stream.iter_plans
+
+        def iter_plans(base_dir):
+            for i, entry in enumerate(original(base_dir)):
+                if i == 1:
+                    raise ValueError("计划顺序错误")
+                yield entry
+        return iter_plans
+
+    def test_month_stream_is_abstract(self):
+        with self.assertRaises(TypeError):
+            nav_stream.MonthStream(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
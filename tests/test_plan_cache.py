@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_cache 的测试
+多个线程同时保存缓存时各自使用独立的临时文件，保存后不留下临时文件
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_cache import CACHE_VERSION, PlanCache
+
+
+class PlanCacheSaveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="cache-test-")
+        self.cache_file = os.path.join(self.root, ".plan-cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_concurrent_saves(self):
+        caches = []
+        for i in range(8):
+            cache = PlanCache(self.cache_file)
+            cache.entries = {f"plan-{i}.md": {"size": i}}
+            cache.dirty = True
+            caches.append(cache)
+
+        errors = []
+
+        def save(cache):
+            try:
+                for _ in range(20):
+                    cache.dirty = True
+                    cache.save()
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save, args=(cache,)) for cache in caches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(os.listdir(self.root), [".plan-cache.json"])
+        with open(self.cache_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["version"], CACHE_VERSION)
+        self.assertEqual(len(data["entries"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_catalog 的测试
+增量同步后索引与计划目录一致，全文搜索结果与逐个文件匹配词项的结果相同
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from nav_builder import build_model
+from plan_cache import PlanCache
+from plan_catalog import PlanCatalog
+from plan_parser import tokenize, plan_text
+from plan_scanner import scan_plans
+
+
+def entries(index):
+    return [(entry.path, entry.iso_date, entry.layout, entry.title, entry.preview)
+            for entry in index]
+
+
+class PlanCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="catalog-test-")
+        shutil.copytree(os.path.join(REPO_DIR, "daily-plans"),
+                        os.path.join(self.root, "daily-plans"))
+        os.chdir(self.root)
+        self.catalog = PlanCatalog()
+        self.total = self.catalog.sync()[0]
+
+    def tearDown(self):
+        self.catalog.close()
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def expected_search(self, query):
+        """逐个读取文件，返回包含查询全部词项的计划路径"""
+        terms = set(tokenize(query))
+        found = set()
+        for plan in scan_plans("daily-plans"):
+            with open(plan.path, "r", encoding="utf-8") as f:
+                if terms <= set(tokenize(plan_text(f.read()))):
+                    found.add(plan.path)
+        return found
+
+    def assert_search(self, query):
+        if not self.catalog.has_fts:
+            self.skipTest("当前 SQLite 不支持 FTS5")
+        expected = self.expected_search(query)
+        self.assertTrue(expected or query == "不存在的词语组合")
+        self.assertEqual({row["path"] for row in self.catalog.search(query, limit=100)}, expected)
+
+    def assert_matches_directory(self):
+        self.assertEqual(entries(self.catalog.date_index()),
+                         entries(build_model("daily-plans", PlanCache(), prefix=False)))
+
+    def test_sync(self):
+        self.assertEqual(self.total, 17)
+        self.assertEqual(self.catalog.sync(), (0, 0))
+        self.assertEqual(self.catalog.counts()[0], 17)
+        self.assert_matches_directory()
+
+    def test_search(self):
+        for query in ("微分方程", "雅思口语", "数学建模 阅读", "不存在的词语组合"):
+            with self.subTest(query):
+                self.assert_search(query)
+
+    def test_update_files(self):
+        edited = "daily-plans/2025/08/20.md"
+        removed = "daily-plans/2025/08/21.md"
+        with open(edited, "a", encoding="utf-8") as f:
+            f.write("\n## 📚 阅读\n\n- [x] **阅读拓扑学讲义**\n")
+        os.remove(removed)
+
+        self.assertEqual(self.catalog.update_files([edited, removed]), (1, 1))
+        self.assertEqual(self.catalog.update_files([edited]), (0, 0))
+        self.assertEqual([row["path"] for row in self.catalog.plans("2025-08-20", "2025-08-22")],
+                         [edited, "daily-plans/2025/08/22.md"])
+        self.assertIn(("2025-08-20", edited, "阅读", "x", "**阅读拓扑学讲义**"),
+                      [tuple(row) for row in self.catalog.tasks(states=["x"])])
+        self.assert_matches_directory()
+        self.assert_search("拓扑学")
+        self.assert_search("微分方程")
+
+    def test_sync_after_changes(self):
+        os.remove("daily-plans/2025/09/02.md")
+        os.makedirs("daily-plans/2025/08-August")
+        with open("daily-plans/2025/08-August/2025-08-20.md", "w", encoding="utf-8") as f:
+            f.write("---\ntitle: 补充计划\n---\n\n- [ ] 整理拓扑学笔记\n")
+
+        self.assertEqual(self.catalog.sync(), (1, 1))
+        self.assertEqual(len(self.catalog.plan("2025-08-20")), 2)
+        self.assertEqual([row["date"] for row in self.catalog.latest(1)], ["2025-09-01"])
+        self.assert_matches_directory()
+        self.assert_search("拓扑学")
+
+
+if __name__ == "__main__":
+    unittest.main()
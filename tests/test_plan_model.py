@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_model 的测试
+PlanEntry 的路径推导和字典式访问，DateIndex 的二分查询及其边界情况
+"""
+
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_model import DATED_LAYOUT, DAY_LAYOUT, DateIndex, PlanEntry, date_parts, to_ordinal
+
+
+class PlanEntryTest(unittest.TestCase):
+
+    def test_standard_path_not_stored(self):
+        entry = PlanEntry.from_path("daily-plans/2025/08/20.md", "daily-plans")
+        self.assertTrue(entry.standard)
+        self.assertEqual(entry.path, "daily-plans/2025/08/20.md")
+        self.assertEqual(entry.date, ("2025", "08", "20"))
+        self.assertEqual(entry.iso_date, "2025-08-20")
+        self.assertEqual(entry.layout, DAY_LAYOUT)
+
+    def test_dated_and_unpadded_paths_kept(self):
+        dated = PlanEntry.from_path("daily-plans/2025/08-August/2025-08-20.md", "daily-plans")
+        self.assertFalse(dated.standard)
+        self.assertEqual(dated.layout, DATED_LAYOUT)
+        self.assertEqual(dated.path, "daily-plans/2025/08-August/2025-08-20.md")
+
+        unpadded = PlanEntry.from_path("daily-plans/2025/8/5.md", "daily-plans")
+        self.assertFalse(unpadded.standard)
+        self.assertEqual(unpadded.path, "daily-plans/2025/8/5.md")
+        self.assertEqual(unpadded.iso_date, "2025-08-05")
+
+    def test_invalid_and_non_plan_paths(self):
+        self.assertIsNone(PlanEntry.from_path("daily-plans/2025/02/30.md", "daily-plans"))
+        self.assertIsNone(PlanEntry.from_path("daily-plans/templates/daily-template.md",
+                                              "daily-plans"))
+
+    def test_record_and_dict_access(self):
+        entry = PlanEntry.from_path("daily-plans/2025/08/20.md", "daily-plans")
+        self.assertFalse(entry.loaded)
+        self.assertIsNone(entry["record"])
+
+        entry["record"] = {"title": "", "preview": "", "tasks": []}
+        self.assertTrue(entry.loaded)
+        self.assertEqual(entry.record, {"title": None, "preview": ""})
+        self.assertEqual(entry["path"], "daily-plans/2025/08/20.md")
+        self.assertEqual(entry.get("date"), ("2025", "08", "20"))
+        self.assertIsNone(entry.get("tasks"))
+        with self.assertRaises(KeyError):
+            entry["tasks"]
+        with self.assertRaises(KeyError):
+            entry["path"] = "other.md"
+
+        entry.record = None
+        self.assertFalse(entry.loaded)
+
+    def test_ordinal_helpers(self):
+        self.assertEqual(to_ordinal("2025-08-20"), to_ordinal(("2025", "08", "20")))
+        self.assertEqual(date_parts(to_ordinal("2024-02-29")), ("2024", "02", "29"))
+        with self.assertRaises(ValueError):
+            to_ordinal("2025-13-01")
+
+
+def entries(*paths):
+    return [PlanEntry.from_path(path, "daily-plans") for path in paths]
+
+
+def dates(found):
+    return [entry.iso_date for entry in found]
+
+
+class DateIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        # 乱序传入，两种布局在 2025-08-20 同时存在，跨年和跨月
+        self.index = DateIndex(entries(
+            "daily-plans/2025/01/01.md",
+            "daily-plans/2024/12/31.md",
+            "daily-plans/2025/08/20.md",
+            "daily-plans/2025/08-August/2025-08-20.md",
+            "daily-plans/2025/08/18.md",
+            "daily-plans/2025/08/24.md",
+            "daily-plans/2025/08/25.md",
+            "daily-plans/2025/09/01.md",
+        ))
+
+    def test_sorted_by_date_and_path(self):
+        self.assertEqual([entry.path for entry in self.index.on("2025-08-20")],
+                         ["daily-plans/2025/08-August/2025-08-20.md", "daily-plans/2025/08/20.md"])
+        self.assertEqual(list(self.index.ordinals), [entry.ordinal for entry in self.index])
+
+    def test_empty_index(self):
+        empty = DateIndex()
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.range(), [])
+        self.assertEqual(empty.on("2025-08-20"), [])
+        self.assertEqual(empty.week("2025-08-20"), [])
+        self.assertEqual(empty.month(2025, 8), [])
+        self.assertEqual(empty.latest(3), [])
+        self.assertEqual(list(empty.months()), [])
+        self.assertFalse(empty.remove("daily-plans/2025/08/20.md", to_ordinal("2025-08-20")))
+
+    def test_range_bounds(self):
+        self.assertEqual(len(self.index.range()), 8)
+        self.assertEqual(dates(self.index.range("2025-08-20", "2025-08-24")),
+                         ["2025-08-20", "2025-08-20", "2025-08-24"])
+        self.assertEqual(dates(self.index.range(end="2024-12-31")), ["2024-12-31"])
+        self.assertEqual(dates(self.index.range(start="2025-09-01")), ["2025-09-01"])
+        # 完全在第一个之前、最后一个之后、两个条目之间，以及起止颠倒
+        self.assertEqual(self.index.range("2000-01-01", "2024-12-30"), [])
+        self.assertEqual(self.index.range("2025-09-02", "2030-01-01"), [])
+        self.assertEqual(self.index.range("2025-01-02", "2025-08-17"), [])
+        self.assertEqual(self.index.range("2025-08-25", "2025-08-18"), [])
+
+    def test_week(self):
+        # 2025-08-18 是星期一，2025-08-24 是星期日
+        self.assertEqual(dates(self.index.week("2025-08-20")),
+                         ["2025-08-18", "2025-08-20", "2025-08-20", "2025-08-24"])
+        self.assertEqual(dates(self.index.week("2025-08-25")), ["2025-08-25"])
+        self.assertEqual(dates(self.index.week("2025-01-01")), ["2024-12-31", "2025-01-01"])
+
+    def test_month_and_year(self):
+        self.assertEqual(len(self.index.month("2025", "08")), 5)
+        self.assertEqual(dates(self.index.month(2024, 12)), ["2024-12-31"])
+        self.assertEqual(self.index.month(2025, 2), [])
+        self.assertEqual(dates(self.index.year(2024)), ["2024-12-31"])
+        self.assertEqual(len(self.index.year(2025)), 7)
+        self.assertEqual([key for key, _ in self.index.months()],
+                         [("2024", "12"), ("2025", "01"), ("2025", "08"), ("2025", "09")])
+        self.assertEqual(sum(len(group) for _, group in self.index.months()), len(self.index))
+
+    def test_latest(self):
+        self.assertEqual(dates(self.index.latest(2)), ["2025-09-01", "2025-08-25"])
+        self.assertEqual(dates(self.index.latest(2, "2025-08-24")), ["2025-08-24", "2025-08-20"])
+        self.assertEqual(dates(self.index.latest(3, "2025-01-01")), ["2025-01-01", "2024-12-31"])
+        self.assertEqual(self.index.latest(3, "2024-12-30"), [])
+        self.assertEqual(len(self.index.latest(100)), 8)
+        self.assertEqual(self.index.latest(0), [])
+
+    def test_add_and_remove(self):
+        entry, = entries("daily-plans/2025/08/19.md")
+        self.index.add(entry)
+        self.index.add(entry)   # 同一路径只保留一个
+        self.assertEqual(dates(self.index.week("2025-08-20"))[:2], ["2025-08-18", "2025-08-19"])
+        self.assertEqual(len(self.index), 9)
+
+        self.assertTrue(self.index.remove("daily-plans/2025/08/20.md", to_ordinal("2025-08-20")))
+        self.assertEqual([e.path for e in self.index.on("2025-08-20")],
+                         ["daily-plans/2025/08-August/2025-08-20.md"])
+        self.assertFalse(self.index.remove("daily-plans/2025/08/20.md", to_ordinal("2025-08-20")))
+        self.assertEqual(list(self.index.ordinals), [e.ordinal for e in self.index])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_parser 的测试
+逐行解析得到的预览与对全文做正则处理的结果相同，字段齐全后提前结束不改变结果
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_cache import PREFIX_BYTES, parse_plan_file
+from plan_parser import PREVIEW_LENGTH, PREFIX_FIELDS, parse_text
+
+FRONT_MATTER = '---\nlayout: post\ntitle: "📅 2025年08月20日 - 每日计划"\n---\n'
+
+
+def full_text_preview(content):
+    """读入全文后的预览（原先 generate-nav-data.py 的做法，按通用换行符读取文件）"""
+    content = content.replace("\r\n", "\n")
+    preview = re.sub(r'^---.*?---', '', content, flags=re.DOTALL).strip()
+    preview = re.sub(r'[#*`\-\[\]]', '', preview)
+    return preview[:PREVIEW_LENGTH] + "..." if len(preview) > PREVIEW_LENGTH else preview
+
+
+def body(length, line="学习数学建模"):
+    """长度恰好为 length 的正文（按行拼接，不含 markdown 标记）"""
+    text = ""
+    while len(text) < length:
+        text += line + "\n"
+    return text[:length]
+
+
+CASES = {
+    "lf": FRONT_MATTER + "\n# 今日任务\n\n- [ ] **复习第1章**\n" + body(400),
+    "crlf": (FRONT_MATTER + "\n# 今日任务\n\n- [ ] **复习第1章**\n" + body(400)).replace("\n", "\r\n"),
+    "crlf_short": (FRONT_MATTER + "# 标题\n\n- [x] 完成\n").replace("\n", "\r\n"),
+    "no_front_matter": "# 标题\n\n" + body(300),
+    "unterminated_front_matter": "---\ntitle: 没有结束标记\n\n# 标题\n" + body(50),
+    "unterminated_front_matter_long": "---\ntitle: 没有结束标记\n" + body(500),
+    "text_after_end_marker": "---\ntitle: x\n---正文紧跟在结束标记之后\n" + body(250),
+    "empty_body": FRONT_MATTER,
+    "marks_near_limit": FRONT_MATTER + "**" * 20 + body(PREVIEW_LENGTH - 20) + "\n- [ ] 后续\n",
+    "trailing_marks": FRONT_MATTER + body(PREVIEW_LENGTH - 1) + "\n---\n***\n",
+    "trailing_whitespace": FRONT_MATTER + body(PREVIEW_LENGTH - 1) + "\n   \n\t\n\n  ",
+}
+for length in range(PREVIEW_LENGTH - 2, PREVIEW_LENGTH + 4):
+    CASES[f"body_{length}"] = FRONT_MATTER + "\n" + body(length)
+    CASES[f"body_{length}_crlf"] = CASES[f"body_{length}"].replace("\n", "\r\n")
+
+
+class PreviewTest(unittest.TestCase):
+
+    def test_matches_full_text(self):
+        for name, content in CASES.items():
+            with self.subTest(name):
+                expected = full_text_preview(content)
+                self.assertEqual(parse_text(content, PREFIX_FIELDS)[0]["preview"], expected)
+                self.assertEqual(parse_text(content)[0]["preview"], expected)
+
+    def test_early_termination(self):
+        # 在任意位置截断的前缀上提前结束时，结果与解析全文相同
+        for name, content in CASES.items():
+            with self.subTest(name):
+                full = parse_text(content)[0]
+                expected = {field: full[field] for field in PREFIX_FIELDS}
+                for n in range(len(content) + 1):
+                    record, satisfied = parse_text(content[:n], PREFIX_FIELDS)
+                    if satisfied:
+                        self.assertEqual(record, expected, n)
+
+    def test_front_matter(self):
+        for name in ("lf", "crlf", "body_201_crlf"):
+            with self.subTest(name):
+                record = parse_text(CASES[name])[0]
+                self.assertEqual(record["title"], "📅 2025年08月20日 - 每日计划")
+        record = parse_text(CASES["unterminated_front_matter"])[0]
+        self.assertEqual(record["front_matter"], {})
+        self.assertIsNone(record["title"])
+        self.assertEqual(record["headings"], [[1, "标题"]])
+
+
+class PrefixReadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="parser-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_prefix_read_matches_full_read(self):
+        # 文件大于首次读取的前缀，只读取前缀时的结果与读取整个文件相同
+        padding = body(PREFIX_BYTES * 2, "- [ ] 填充内容用来超过前缀长度")
+        for name, content in CASES.items():
+            with self.subTest(name):
+                path = os.path.join(self.root, f"{name}.md")
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    f.write(content + ("\r\n" if "crlf" in name else "\n") + padding)
+                full = parse_plan_file(path)
+                prefix = parse_plan_file(path, prefix=True)
+                for field in PREFIX_FIELDS:
+                    self.assertEqual(prefix[field], full[field], field)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_scanner 的测试
+布局规则识别两种计划路径，LayoutRule 子类必须实现全部规则方法
+"""
+
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_scanner import LayoutRule, classify_path
+
+
+class LayoutRuleTest(unittest.TestCase):
+
+    def test_classify_path(self):
+        self.assertEqual(classify_path("daily-plans/2025/08/20.md", "daily-plans"),
+                         (("2025", "08", "20"), "day"))
+        self.assertEqual(classify_path("daily-plans/2025/08-August/2025-08-20.md", "daily-plans"),
+                         (("2025", "08", "20"), "dated"))
+        self.assertIsNone(classify_path("daily-plans/templates/daily-template.md", "daily-plans"))
+
+    def test_rule_is_abstract(self):
+        class Partial(LayoutRule):
+            name = "partial"
+
+            def accepts_dir(self, parts):
+                return True
+
+        with self.assertRaises(TypeError):
+            LayoutRule()
+        with self.assertRaises(TypeError):
+            Partial()
+
+
+if __name__ == "__main__":
+    unittest.main()
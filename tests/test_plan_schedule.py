@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_schedule 的测试
+区间索引的重叠查询和冲突检测与逐对比较的结果相同，时间表加载时报告重叠的时间块
+"""
+
+import os
+import sys
+import random
+import unittest
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_schedule import IntervalIndex, DaySchedule, TimeBlock, Timetable, load_timetable
+
+
+def overlaps(a_start, a_end, b_start, b_end):
+    return a_start < b_end and b_start < a_end
+
+
+def random_blocks(rng, n):
+    blocks = []
+    for i in range(n):
+        start = rng.randrange(0, 24 * 60 - 1)
+        end = rng.randint(start + 1, min(24 * 60, start + rng.choice((5, 30, 120, 600))))
+        blocks.append(TimeBlock(f"b{i}", f"块{i}", start, end))
+    return blocks
+
+
+class IntervalIndexTest(unittest.TestCase):
+
+    def test_overlapping_matches_brute_force(self):
+        rng = random.Random(20250820)
+        for n in (0, 1, 2, 10, 60):
+            blocks = random_blocks(rng, n)
+            index = IntervalIndex(blocks)
+            for _ in range(200):
+                start = rng.randrange(0, 24 * 60)
+                end = rng.randint(start + 1, 24 * 60)
+                expected = [block for block in index
+                            if overlaps(block.start, block.end, start, end)]
+                self.assertEqual(index.overlapping(start, end), expected, (n, start, end))
+
+    def test_conflicts_match_brute_force(self):
+        rng = random.Random(42)
+        for n in (0, 1, 5, 40):
+            index = IntervalIndex(random_blocks(rng, n))
+            items = list(index)
+            expected = {(a, b) for i, a in enumerate(items) for b in items[i + 1:]
+                        if overlaps(a.start, a.end, b.start, b.end)}
+            self.assertEqual(set(index.conflicts()), expected, n)
+            self.assertEqual(len(index.conflicts()), len(expected))
+
+    def test_half_open_boundaries(self):
+        # 首尾相接的区间不重叠；被长区间包含的区间也能查到
+        long = TimeBlock("long", "长", 0, 600)
+        a = TimeBlock("a", "甲", 60, 120)
+        b = TimeBlock("b", "乙", 120, 180)
+        c = TimeBlock("c", "丙", 700, 720)
+        index = IntervalIndex([c, b, a, long])
+        self.assertEqual(index.overlapping(120, 121), [long, b])
+        self.assertEqual(index.overlapping(119, 120), [long, a])
+        self.assertEqual(index.overlapping(600, 700), [])
+        self.assertEqual(index.overlapping(650, 701), [c])
+        self.assertEqual(set(index.conflicts()), {(long, a), (long, b)})
+
+
+class TimetableTest(unittest.TestCase):
+
+    def test_overlap_rejected(self):
+        with self.assertRaises(ValueError) as context:
+            DaySchedule("weekday", [TimeBlock("study", "学习", 540, 720),
+                                    TimeBlock("lunch", "午餐", 700, 750),
+                                    TimeBlock("rest", "休息", 750, 780)])
+        self.assertIn("学习（9:00 - 12:00）与 午餐（11:40 - 12:30）", str(context.exception))
+        self.assertNotIn("休息", str(context.exception))
+
+    def test_lookup(self):
+        timetable = load_timetable(os.path.join(REPO_DIR, "timetable.json"))
+        weekday = timetable.for_date(datetime(2025, 8, 20))
+        self.assertEqual(weekday.kind, "weekday")
+        self.assertEqual(weekday.at(12 * 60).id, "lunch")
+        self.assertEqual(weekday.at(11 * 60 + 59).id, "study")
+        self.assertIsNone(weekday.at(13 * 60))
+        self.assertEqual(weekday.span("study"), "10:00 - 12:00")
+        self.assertEqual(timetable.for_date(datetime(2025, 8, 23)).duration("study"), "3小时")
+
+    def test_overrides(self):
+        timetable = Timetable({
+            "weekdays": ["work"] * 5 + ["rest"] * 2,
+            "overrides": {"2025-08-20": "rest"},
+            "schedules": {"work": [{"id": "study", "start": "9:00", "end": "11:00"}],
+                          "rest": [{"id": "study", "start": "10:00", "end": "10:45"}]},
+        })
+        self.assertEqual(timetable.for_date(datetime(2025, 8, 19)).kind, "work")
+        self.assertEqual(timetable.for_date(datetime(2025, 8, 20)).duration("study"), "45分钟")
+
+
+if __name__ == "__main__":
+    unittest.main()
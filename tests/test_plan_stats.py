@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_stats 的测试
+修改、删除或新增计划后，增量更新得到的 stats.json 与完整统计完全相同
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_cache import PlanCache
+from plan_stats import build_stats, update_stats
+
+
+class UpdateStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="stats-test-")
+        shutil.copytree(os.path.join(REPO_DIR, "daily-plans"),
+                        os.path.join(self.root, "daily-plans"))
+        os.chdir(self.root)
+        # 与导航构建一样沿用上次扫描的缓存，files_by_day 从中找出同一天的其他文件
+        self.cache = PlanCache()
+        build_stats(cache=self.cache)
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def assert_matches_full_build(self, paths):
+        update_stats(paths, cache=self.cache)
+        build_stats(cache=PlanCache(), stats_file="full-stats.json")
+        with open("stats.json", "rb") as a, open("full-stats.json", "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_edit(self):
+        path = "daily-plans/2025/08/20.md"
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        content = content.replace("- [ ] **阅读课外书籍**", "- [x] **阅读课外书籍**")
+        content += "\n- [!] **补交作业**\n- [>] **整理错题**\n"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.assert_matches_full_build([path])
+
+    def test_delete(self):
+        paths = ["daily-plans/2025/08/21.md", "daily-plans/2025/09/01.md"]
+        for path in paths:
+            os.remove(path)
+        self.assert_matches_full_build(paths)
+
+    def test_add_second_layout_for_same_day(self):
+        # 同一天新增另一种布局的文件，这一天按两个文件重新统计
+        os.makedirs("daily-plans/2025/08-August")
+        path = "daily-plans/2025/08-August/2025-08-22.md"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# 补充计划\n\n## 📚 阅读\n\n- [x] **阅读论文**\n- [ ] **写笔记**\n")
+        self.assert_matches_full_build([path])
+
+    def test_missing_stats_falls_back(self):
+        os.remove("stats.json")
+        self.assert_matches_full_build(["daily-plans/2025/08/20.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
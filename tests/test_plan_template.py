@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_template 的测试
+编译后的模板与原先按占位符顺序依次 str.replace 的结果完全一致
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from plan_template import TemplateStore, compile_template
+from test_generate_daily_plans import load_script
+
+DAILY_TEMPLATE = """---
+layout: post
+title: "📅 [日期] - 每日计划"
+date: 2024-01-01
+categories: [daily-plan, 2024]
+---
+
+# 📅 [日期] - 每日计划
+
+日期：YYYY年MM月DD日 星期X
+文件：YYYY-MM-DD.md
+
+## 今日任务
+
+- [ ] 回顾 2024 年的目标
+
+---
+创建时间：YYYY-MM-DD HH:mm
+更新时间：YYYY-MM-DD HH:mm
+"""
+
+WEEKLY_TEMPLATE_FILE = os.path.join(REPO_DIR, "_site", "daily-plans", "templates",
+                                    "weekly-template.md")
+
+
+def replace_in_order(content, replacements):
+    """原先的实现：按顺序对整篇文本依次 str.replace，列表值每次只替换第一处"""
+    for placeholder, value in replacements:
+        if isinstance(value, list):
+            for item in value:
+                content = content.replace(placeholder, item, 1)
+        else:
+            content = content.replace(placeholder, value)
+    return content
+
+
+class CompiledTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.script = load_script("generate-daily-plan.py")
+        self.generator = self.script.DailyPlanGenerator()
+
+    def test_daily_matches_sequential_replace(self):
+        template = compile_template(DAILY_TEMPLATE, self.script.DAILY_PLACEHOLDERS)
+        for date in (datetime(2025, 8, 20), datetime(2024, 2, 29), datetime(2025, 12, 31)):
+            values = self.generator.placeholder_values(date, [f"{date:%Y-%m-%d} 08:00"] * 2)
+            expected = replace_in_order(DAILY_TEMPLATE, [
+                (placeholder, values[placeholder][0] if isinstance(values[placeholder], list)
+                 else values[placeholder])
+                for placeholder in self.script.DAILY_PLACEHOLDERS])
+            self.assertEqual(template.render(values), expected, date)
+
+        # "2024" 先于 categories 行替换，categories 行不会再匹配
+        rendered = template.render(self.generator.placeholder_values(datetime(2025, 8, 20)))
+        self.assertIn("categories: [daily-plan, 2025]\n", rendered)
+        self.assertIn("回顾 2025 年的目标", rendered)
+
+    def test_weekly_matches_sequential_replace(self):
+        with open(WEEKLY_TEMPLATE_FILE, "r", encoding="utf-8") as f:
+            text = f.read()
+        template = TemplateStore().get(WEEKLY_TEMPLATE_FILE, self.script.WEEKLY_PLACEHOLDERS)
+
+        monday = datetime(2025, 8, 18)
+        values = {
+            "第X周": "第34周",
+            "YYYY年MM月DD日 - MM月DD日": "2025年08月18日 - 08月24日",
+            "(MM-DD)": [f"({(monday + timedelta(days=i)):%m-%d})" for i in range(7)],
+            "YYYY-MM-DD HH:mm": "2025-08-18 09:30",
+        }
+        expected = replace_in_order(text, [(placeholder, values[placeholder])
+                                           for placeholder in self.script.WEEKLY_PLACEHOLDERS])
+        self.assertNotEqual(expected, text)
+        self.assertEqual(template.render(values), expected)
+
+    def test_longer_placeholder_first_when_listed_first(self):
+        template = compile_template("a YYYY-MM-DD HH:mm b YYYY-MM-DD",
+                                    ("YYYY-MM-DD HH:mm", "YYYY-MM-DD"))
+        self.assertEqual(template.render({"YYYY-MM-DD HH:mm": "T", "YYYY-MM-DD": "D"}), "a T b D")
+        self.assertEqual(template.counts, {"YYYY-MM-DD HH:mm": 1, "YYYY-MM-DD": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plan_writer 的测试
+检查各冲突策略的写入结果，以及按字节判断内容是否变化
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from plan_writer import (write_plan, ASK, SKIP, OVERWRITE, IF_CHANGED,
+                         CREATED, UPDATED, UNCHANGED, SKIPPED)
+
+CONTENT = "---\ntitle: 每日计划\n---\n\n# 今日任务\n"
+
+
+class WritePlanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="writer-test-")
+        self.path = os.path.join(self.root, "01.md")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def read_bytes(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_if_changed(self):
+        self.assertEqual(write_plan(self.path, CONTENT), CREATED)
+        self.assertEqual(write_plan(self.path, CONTENT), UNCHANGED)
+        self.assertEqual(write_plan(self.path, CONTENT + "\n"), UPDATED)
+        self.assertEqual(self.read_bytes(), (CONTENT + "\n").encode("utf-8"))
+
+    def test_crlf_file_is_rewritten(self):
+        with open(self.path, "wb") as f:
+            f.write(CONTENT.replace("\n", "\r\n").encode("utf-8"))
+
+        self.assertEqual(write_plan(self.path, CONTENT), UPDATED)
+        self.assertEqual(self.read_bytes(), CONTENT.encode("utf-8"))
+        self.assertEqual(write_plan(self.path, CONTENT), UNCHANGED)
+
+    def test_skip_and_overwrite(self):
+        write_plan(self.path, CONTENT)
+        self.assertEqual(write_plan(self.path, "其他内容\n", SKIP), SKIPPED)
+        self.assertEqual(self.read_bytes(), CONTENT.encode("utf-8"))
+        self.assertEqual(write_plan(self.path, CONTENT, OVERWRITE), UPDATED)
+
+    def test_ask(self):
+        write_plan(self.path, CONTENT)
+        self.assertEqual(write_plan(self.path, CONTENT, ASK, ask=self.fail), UNCHANGED)
+        self.assertEqual(write_plan(self.path, "其他内容\n", ASK, ask=lambda _: "n"), SKIPPED)
+        self.assertEqual(write_plan(self.path, "其他内容\n", ASK, ask=lambda _: "y"), UPDATED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+preview_server 的测试
+同一天有多个计划文件时与 nav-data.json 选择同一个，按 Accept-Encoding 的 q 值选择预压缩副本
+"""
+
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import http.client
+from http.server import ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from preview_server import (
+    FileCache, PlanIndex, PreviewHandler, accepted_encodings, encoding_weight,
+    etag_matches,
+)
+
+
+class AcceptEncodingTest(unittest.TestCase):
+
+    def test_q_values(self):
+        weights = accepted_encodings("gzip;q=0, br; q=0.5, identity")
+        self.assertEqual(encoding_weight(weights, "gzip"), 0)
+        self.assertEqual(encoding_weight(weights, "br"), 0.5)
+        self.assertEqual(encoding_weight(weights, "deflate"), 0)
+
+    def test_wildcard(self):
+        weights = accepted_encodings("*;q=0.3, br;q=0")
+        self.assertEqual(encoding_weight(weights, "gzip"), 0.3)
+        self.assertEqual(encoding_weight(weights, "br"), 0)
+        self.assertEqual(accepted_encodings(""), {})
+
+
+class EtagMatchTest(unittest.TestCase):
+
+    def test_list_and_weak_tags(self):
+        self.assertTrue(etag_matches('"a-1", "b-2"', '"b-2"'))
+        self.assertTrue(etag_matches(' W/"b-2" ', '"b-2"'))
+        self.assertTrue(etag_matches("*", '"b-2"'))
+
+    def test_no_substring_match(self):
+        self.assertFalse(etag_matches('"b-2-gzip"', '"b-2"'))
+        self.assertFalse(etag_matches('"xb-2"', 'b-2'))
+        self.assertFalse(etag_matches("", '"b-2"'))
+
+
+class PreviewServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="preview-test-")
+        os.chdir(self.root)
+        for path in ("daily-plans/2025/08-August/2025-08-20.md", "daily-plans/2025/08/20.md"):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# {path}\n")
+        with open("nav-data.json", "w", encoding="utf-8") as f:
+            f.write('{"version":2}')
+        with open("nav-data.json.gz", "wb") as f:
+            f.write(gzip.compress(b'{"version":2}'))
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def test_prefers_day_layout(self):
+        plans = PlanIndex().query(date="2025-08-20")
+        self.assertEqual([plan["file_path"] for plan in plans], ["daily-plans/2025/08/20.md"])
+
+    def test_refresh_changed_paths(self):
+        index = PlanIndex()
+        os.makedirs("daily-plans/2025/09")
+        with open("daily-plans/2025/09/01.md", "w", encoding="utf-8") as f:
+            f.write("# 9月1日\n")
+        os.remove("daily-plans/2025/08/20.md")
+
+        with mock.patch("preview_server.build_model") as build_model:
+            index.refresh(["daily-plans/2025/09/01.md", "daily-plans/2025/08/20.md"])
+        build_model.assert_not_called()
+        self.assertEqual([plan["file_path"] for plan in index.query()],
+                         ["daily-plans/2025/08-August/2025-08-20.md", "daily-plans/2025/09/01.md"])
+
+    def request(self, accept_encoding, headers=None):
+        PreviewHandler.index = PlanIndex()
+        PreviewHandler.file_cache = FileCache()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), PreviewHandler)
+        PreviewHandler.log_message = lambda *args: None
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("GET", "/nav-data.json",
+                         headers={"Accept-Encoding": accept_encoding, **(headers or {})})
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if headers is not None:
+                return response
+            return response.getheader("Content-Encoding")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_gzip_refused(self):
+        self.assertIsNone(self.request("gzip;q=0"))
+        self.assertEqual(self.request("gzip, deflate"), "gzip")
+
+    def test_if_none_match(self):
+        etag = self.request("identity", {}).getheader("ETag")
+        self.assertEqual(self.request("identity", {"If-None-Match": f'"x", W/{etag}'}).status, 304)
+        self.assertEqual(self.request("identity", {"If-None-Match": "*"}).status, 304)
+        self.assertEqual(self.request("identity", {"If-None-Match": '"x"'}).status, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+search_index 的测试
+冷构建时每个计划文件只读取一次（词频来自解析缓存），增量更新后搜索结果随之变化
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import plan_cache
+from nav_builder import build_all, update_nav
+from plan_cache import PlanCache
+from search_index import SHARD_COUNT, SearchReader, hash_shard
+
+PLANS = {
+    "daily-plans/2025/08/20.md": "# 8月20日\n\n- [ ] 学习微分方程\n- [x] 英语阅读\n",
+    "daily-plans/2025/08/21.md": "# 8月21日\n\n- [ ] 学习线性规划\n",
+    "daily-plans/2025/09-September/2025-09-01.md": "# 9月1日\n\n- [ ] 复习微分方程\n",
+}
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.root = tempfile.mkdtemp(prefix="search-test-")
+        shutil.copy(os.path.join(REPO_DIR, "index.html"), self.root)
+        os.chdir(self.root)
+        for path, content in PLANS.items():
+            self.write(path, content)
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        shutil.rmtree(self.root)
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def search(self, query):
+        return sorted(path for _, _, path, _ in SearchReader().search(query))
+
+    def test_cold_build_reads_each_file_once(self):
+        with mock.patch.object(plan_cache, "read_plan_file",
+                               wraps=plan_cache.read_plan_file) as read:
+            build_all(outputs=["json", "search", "stats"], cache=PlanCache())
+        self.assertEqual(sorted(call.args[0] for call in read.call_args_list), sorted(PLANS))
+        self.assertEqual(self.search("微分方程"), ["daily-plans/2025/08/20.md",
+                                                "daily-plans/2025/09-September/2025-09-01.md"])
+
+    def test_incremental_update(self):
+        build_all(outputs=["json", "js", "search", "stats"])
+        self.write("daily-plans/2025/08/21.md", "# 8月21日\n\n- [ ] 复习微分方程\n")
+        update_nav(["daily-plans/2025/08/21.md"])
+        self.assertEqual(len(self.search("微分方程")), 3)
+        self.assertEqual(self.search("线性规划"), [])
+
+    def test_hash_shard(self):
+        self.assertEqual(hash_shard("微分"), hash_shard("微积"))
+        self.assertEqual(hash_shard("a"), f"{ord('a') % SHARD_COUNT:02x}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,8 +5,11 @@
 
 echo "🔄 开始更新导航数据..."
 
-# 运行Python脚本生成新的导航数据
-python3 generate-nav.py
+# 一次扫描生成全部导航数据（nav-data.json、nav-data.js、index.html）
+if ! python3 nav_builder.py; then
+    echo "❌ 导航数据生成失败！"
+    exit 1
+fi
 
 # 检查是否成功生成
 if [ -f "nav-data.json" ]; then
@@ -17,16 +20,6 @@ if [ -f "nav-data.json" ]; then
     file_size=$(du -h nav-data.json | cut -f1)
     echo "📊 文件大小: $file_size"
     
-    # 显示找到的计划数量
-    plan_count=$(python3 -c "
-import json
-with open('nav-data.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
-    count = sum(len(days) for months in data.values() for days in months.values())
-    print(count)
-")
-    echo "📅 计划总数: $plan_count"
-    
 else
     echo "❌ 导航数据生成失败！"
     exit 1